@@ -7,6 +7,7 @@ from app.database import db, migrate
 from pathlib import Path
 from dotenv import load_dotenv
 from flask_cors import CORS
+from app.json_provider import FastJSONProvider
 
 
 
@@ -20,6 +21,7 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
     app.url_map.strict_slashes = False
+    app.json = FastJSONProvider(app)
 
     CORS(
         app,
@@ -39,28 +41,31 @@ def create_app():
     # (opsiyonel ama iyi pratik)
     app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
 
+    # Prometheus metrikleri (/api/metrics) — pool ayarı yüzünden db.init_app'ten önce
+    from app.metrics import init_metrics
+    init_metrics(app)
+
     db.init_app(app)
     migrate.init_app(app, db)
 
     # 🔥 Modellerin Alembic tarafından görülmesi için şart
     from app import models  # noqa: F401
 
-    # Blueprint register
-    from app.routes.auth import bp as auth_bp
-    from app.routes.lesson_sessions import bp as lesson_sessions_bp
-    from app.routes.students import bp as students_bp
-    from app.routes.enrollments import bp as enrollments_bp
-    from app.routes.admin_students import bp as admin_students_bp
-    from app.routes.users import bp as users_bp
+    # Blueprint register (main.py ile aynı liste)
+    from app.routes import register_routes
+    register_routes(app)
+
+    from app.instrumentation import init_instrumentation
+    init_instrumentation(app)
 
+    from app.search import init_search
+    init_search(app)
 
-    app.register_blueprint(auth_bp, url_prefix="/api/auth")
-    app.register_blueprint(lesson_sessions_bp, url_prefix="/api/lesson-sessions")
-    app.register_blueprint(students_bp, url_prefix="/api/students")
-    app.register_blueprint(enrollments_bp, url_prefix="/api/enrollments")
-    app.register_blueprint(admin_students_bp, url_prefix="/api/admin/students")
-    app.register_blueprint(users_bp, url_prefix="/api/users")
+    from app.summaries import init_summaries
+    init_summaries(app)
 
+    from app.commands import register_commands
+    register_commands(app)
     
     return app
 
@@ -0,0 +1,182 @@
+# İstek sahibinin kimliği ve erişim kapsamı (principal).
+# "Ben kimim, rolüm ne, öğrenci profilim hangisi, hangi öğrencilere dokunabilirim" sorusunu tek sorguda çözer:
+#   users + roles + (kendi) students + enrollments (öğretmen olarak ya da öğrenci olarak)
+# Sonuç kısa TTL'li (AUTH_CACHE_TTL_SEC) worker içi cache'te tutulur; yetkiyi değiştiren endpoint'ler
+# (kullanıcı silme, enrollment değişikliği, öğrenci hesabı silme...) invalidate_principals() çağırır.
+# gunicorn worker'ları cache'i paylaşmadığı için invalidate_principals() ayrıca auth_versions sayacını artırır;
+# cache'ten dönen her principal bu sayaçla (tek satırlık PK okuması) doğrulanır -> diğer worker'lar da bir
+# sonraki istekte yeniden yükler. Süresi dolan / eski sürümlü kayıtlar ekleme sırasında temizlenir.
+
+import logging
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import insert, or_, select, update
+
+from app.database import db
+from app.models.auth_version import AuthVersion
+from app.models.user import User
+from app.models.role import Role
+from app.models.student import Student
+from app.models.enrollment import Enrollment, EnrollmentStatus
+
+logger = logging.getLogger(__name__)
+
+StudentRef = namedtuple("StudentRef", ["id", "deleted_at"])
+
+AUTH_VERSION_ID = 1
+MAX_CACHE_ENTRIES = 10000
+
+_cache = {}  # user_id -> (expires_at, auth_version, Principal)
+_next_prune = [0.0]
+
+
+class Principal:
+    def __init__(self, user_id, role, is_active, student=None, enrollments=()):
+        self.user_id = user_id
+        self.role = role
+        self.is_active = is_active
+        # STUDENT ise kendi profili (StudentRef), değilse None
+        self.student = student
+        # (teacher_user_id, student_id, EnrollmentStatus) — öğretmenin atamaları veya öğrencinin kendi ataması
+        self.enrollments = tuple(enrollments)
+
+        self.enrolled_student_ids = frozenset(
+            sid for tid, sid, _ in self.enrollments if tid == user_id
+        )
+        self.active_student_ids = frozenset(
+            sid for tid, sid, st in self.enrollments if tid == user_id and st == EnrollmentStatus.ACTIVE
+        )
+
+    @property
+    def student_id(self):
+        return self.student.id if self.student else None
+
+    def teaches(self, student_id: int, active_only: bool = True) -> bool:
+        """TEACHER bu öğrenciye atanmış mı? (active_only=False: PASSIVE atamalar da sayılır)"""
+        ids = self.active_student_ids if active_only else self.enrolled_student_ids
+        return student_id in ids
+
+    def my_enrollment(self):
+        """STUDENT'ın kendi ataması: (teacher_user_id, status) veya None (student başına tek enrollment var)."""
+        if not self.student:
+            return None
+        for tid, sid, st in self.enrollments:
+            if sid == self.student.id:
+                return tid, st
+        return None
+
+    def my_active_teacher_user_id(self):
+        e = self.my_enrollment()
+        if e and e[1] == EnrollmentStatus.ACTIVE:
+            return e[0]
+        return None
+
+
+def query_principal(user_id: int):
+    rows = (
+        db.session.query(
+            User.id,
+            User.is_active,
+            Role.key,
+            Student.id,
+            Student.deleted_at,
+            Enrollment.teacher_user_id,
+            Enrollment.student_id,
+            Enrollment.status,
+        )
+        .select_from(User)
+        .outerjoin(Role, Role.id == User.role_id)
+        .outerjoin(Student, Student.user_id == User.id)
+        .outerjoin(
+            Enrollment,
+            or_(Enrollment.teacher_user_id == User.id, Enrollment.student_id == Student.id),
+        )
+        .filter(User.id == user_id)
+        .all()
+    )
+    if not rows:
+        return None
+
+    first = rows[0]
+    student = StudentRef(first[3], first[4]) if first[3] is not None else None
+    enrollments = {(r[5], r[6], r[7]) for r in rows if r[5] is not None}
+    return Principal(
+        user_id=first[0],
+        role=first[2],
+        is_active=first[1],
+        student=student,
+        enrollments=enrollments,
+    )
+
+
+def current_auth_version() -> int:
+    return db.session.execute(
+        select(AuthVersion.version).where(AuthVersion.id == AUTH_VERSION_ID)
+    ).scalar() or 0
+
+
+def bump_auth_version():
+    """Tüm worker'ların cache'ini geçersiz kılar (kendi küçük transaction'ı; çağıran yazımı commit etmiş olmalı)."""
+    now = datetime.utcnow()
+    try:
+        result = db.session.execute(
+            update(AuthVersion)
+            .where(AuthVersion.id == AUTH_VERSION_ID)
+            .values(version=AuthVersion.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            # create_all ile kurulmuş şema: satır yok
+            db.session.execute(insert(AuthVersion).values(id=AUTH_VERSION_ID, version=1, updated_at=now))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception("auth version bump failed; other workers may serve cached principals until TTL")
+
+
+def _prune(now: float, version: int, ttl: float):
+    """Süresi dolmuş ya da eski sürümlü kayıtları at (en fazla TTL'de bir tam tarama)."""
+    if now < _next_prune[0] and len(_cache) < MAX_CACHE_ENTRIES:
+        return
+    for uid in [uid for uid, (expires_at, v, _) in _cache.items() if expires_at <= now or v != version]:
+        del _cache[uid]
+    if len(_cache) >= MAX_CACHE_ENTRIES:
+        _cache.clear()
+    _next_prune[0] = now + ttl
+
+
+def load_principal(user_id: int):
+    ttl = float(current_app.config.get("AUTH_CACHE_TTL_SEC", 0) or 0)
+    if ttl <= 0:
+        return query_principal(user_id)
+
+    now = time.monotonic()
+    # sürüm principal'dan önce okunur: arada gelen bir değişiklik sonraki istekte sürüm farkıyla yakalanır
+    version = current_auth_version()
+
+    hit = _cache.get(user_id)
+    if hit and hit[0] > now and hit[1] == version:
+        return hit[2]
+
+    p = query_principal(user_id)
+    if p is not None:
+        _prune(now, version, ttl)
+        _cache[user_id] = (now + ttl, version, p)
+    else:
+        _cache.pop(user_id, None)
+    return p
+
+
+def invalidate_principals(*user_ids):
+    """
+    Bu worker'da user_ids (verilmezse tüm cache) hemen düşer; diğer worker'lar auth_versions sayacı ile.
+    Yazım commit edildikten sonra çağrılır.
+    """
+    if not user_ids:
+        _cache.clear()
+    else:
+        for uid in user_ids:
+            _cache.pop(uid, None)
+    bump_auth_version()
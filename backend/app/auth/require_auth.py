@@ -1,7 +1,7 @@
 #“Protected endpoint’lerde require_auth decorator kullanıyoruz. 
 # Authorization header’daki Bearer token’ı alıp decode ediyoruz, expire ve signature kontrolü yapıyoruz. 
-# Token içindeki user_id ile DB’den kullanıcıyı tekrar çekiyoruz; is_active ve rol kontrolü yapıyoruz.
-#  Request context’e g.user_id ve g.role koyarak endpoint içinde yetkilendirme yapabiliyoruz. 
+# Token içindeki user_id ile kullanıcıyı (principal: rol + öğrenci profili + atamalar) tek sorguda / kısa TTL cache'ten alıyoruz; is_active ve rol kontrolü yapıyoruz.
+#  Request context’e g.user_id, g.role ve g.principal koyarak endpoint içinde yetkilendirme yapabiliyoruz. 
 # Sistem stateless çalışıyor.”
 
 
@@ -10,7 +10,13 @@ from flask import request, jsonify, g
 import jwt as pyjwt
 
 from app.auth.jwt import decode_token
-from app.models.user import User
+from app.auth.principal import load_principal
+from app.metrics import record_auth_failure
+
+
+def auth_failed(reason: str, status: int):
+    record_auth_failure(reason)
+    return jsonify({"message": reason}), status
 
 
 def require_auth(fn):
@@ -18,43 +24,44 @@ def require_auth(fn):
     def wrapper(*args, **kwargs):
         auth = request.headers.get("Authorization") or ""
         if not auth.startswith("Bearer "):
-            return jsonify({"message": "missing_token"}), 401
+            return auth_failed("missing_token", 401)
 
         token = auth.split(" ", 1)[1].strip()
         if not token:
-            return jsonify({"message": "missing_token"}), 401
+            return auth_failed("missing_token", 401)
 
         try:
             payload = decode_token(token)
         except pyjwt.ExpiredSignatureError:
-            return jsonify({"message": "token_expired"}), 401
+            return auth_failed("token_expired", 401)
         except pyjwt.InvalidTokenError:
-            return jsonify({"message": "invalid_token"}), 401
+            return auth_failed("invalid_token", 401)
         except Exception:
-            return jsonify({"message": "invalid_token"}), 401
+            return auth_failed("invalid_token", 401)
 
         user_id = payload.get("user_id")
         if not user_id:
-            return jsonify({"message": "invalid_token_payload"}), 401
+            return auth_failed("invalid_token_payload", 401)
 
         try:
             user_id = int(user_id)
         except Exception:
-            return jsonify({"message": "invalid_token_payload"}), 401
+            return auth_failed("invalid_token_payload", 401)
 
-        user = User.query.get(user_id)
-        if not user:
-            return jsonify({"message": "user_not_found"}), 401
+        principal = load_principal(user_id)
+        if not principal:
+            return auth_failed("user_not_found", 401)
 
-        if not user.is_active:
-            return jsonify({"message": "user_inactive"}), 403
+        if not principal.is_active:
+            return auth_failed("user_inactive", 403)
 
-        # ✅ tek kaynak: DB
-        g.user_id = user.id
-        g.role = user.role.key if getattr(user, "role", None) is not None else None
+        # ✅ tek kaynak: DB (kısa TTL cache)
+        g.principal = principal
+        g.user_id = principal.user_id
+        g.role = principal.role
 
         if not g.role:
-            return jsonify({"message": "role_not_found"}), 500
+            return auth_failed("role_not_found", 500)
 
         return fn(*args, **kwargs)
 
@@ -0,0 +1,116 @@
+# Public takvim (ICS) için worker içi cache.
+# - Son başarılı parse cache'ten döner; TTL dolduysa arka planda yenilenir (stale-while-revalidate),
+#   istek upstream'i beklemez. Sadece ilk (soğuk) istek en fazla cold_wait saniye bekler.
+# - Yenileme If-None-Match / If-Modified-Since ile yapılır; 304 gelirse parse tekrar edilmez.
+# - Aynı anda gelen yenileme tetiklemeleri tek fetch'e indirgenir (worker başına tek thread).
+# - Upstream hatasında eski veri korunur, retry_sec sonra tekrar denenir.
+# - Body bellekte tek string'e okunmaz; parse fonksiyonuna satır satır (stream) verilir.
+# Flask'tan bağımsızdır; testte yerel bir http.server'a karşı doğrudan kullanılabilir.
+
+import io
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+
+class CalendarCache:
+    def __init__(self, url: str, parse, ttl_sec: float = 300, timeout_sec: float = 10,
+                 retry_sec: float = 30, cold_wait_sec: float = 2):
+        self.url = url
+        self.parse = parse
+        self.ttl_sec = ttl_sec
+        self.timeout_sec = timeout_sec
+        self.retry_sec = retry_sec
+        self.cold_wait_sec = cold_wait_sec
+
+        self._lock = threading.Lock()
+        self._ready = threading.Event()  # ilk fetch denemesi bitti (başarılı ya da değil)
+        self._thread = None
+
+        self.data = None              # parse(...) sonucu (son başarılı)
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = None        # son başarılı (200/304) fetch, time.time()
+        self.next_refresh_at = 0.0    # time.monotonic()
+        self.last_error = None
+        self.fetch_count = 0          # upstream'e giden istek sayısı (304 dahil)
+
+    # ---------- okuma ----------
+    def get(self):
+        """
+        Dönen: {"data": parse sonucu|None, "age_sec": float|None, "fetched_at": iso|None, "stale": bool, "error": str|None}
+        Asla upstream'i TTL boyunca beklemez; gerekirse arka plan yenilemesini tetikler.
+        """
+        if time.monotonic() >= self.next_refresh_at:
+            self.refresh_async()
+
+        if self.data is None:
+            self._ready.wait(self.cold_wait_sec)
+
+        return self.snapshot()
+
+    def snapshot(self):
+        age = time.time() - self.fetched_at if self.fetched_at else None
+        return {
+            "data": self.data,
+            "age_sec": round(age, 1) if age is not None else None,
+            "fetched_at": datetime.utcfromtimestamp(self.fetched_at).isoformat() if self.fetched_at else None,
+            "stale": age is None or age > self.ttl_sec,
+            "error": self.last_error,
+        }
+
+    # ---------- yenileme ----------
+    def refresh_async(self):
+        """Yenileme zaten sürüyorsa yeni thread açılmaz (coalesce)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+            self._thread = threading.Thread(target=self.refresh, name="calendar-refresh", daemon=True)
+            self._thread.start()
+            return self._thread
+
+    def refresh(self):
+        req = urllib.request.Request(self.url)
+        if self.etag:
+            req.add_header("If-None-Match", self.etag)
+        if self.last_modified:
+            req.add_header("If-Modified-Since", self.last_modified)
+
+        self.fetch_count += 1
+        try:
+            try:
+                with urllib.request.urlopen(req, timeout=self.timeout_sec) as resp:
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+                    data = self.parse(io.TextIOWrapper(resp, encoding="utf-8", errors="ignore"))
+            except urllib.error.HTTPError as ex:
+                if ex.code != 304 or self.data is None:
+                    raise
+                # değişmemiş: eski parse geçerli
+                self.fetched_at = time.time()
+            else:
+                self.data, self.etag, self.last_modified = data, etag, last_modified
+                self.fetched_at = time.time()
+            self.last_error = None
+            self.next_refresh_at = time.monotonic() + self.ttl_sec
+        except Exception as ex:
+            self.last_error = str(ex) or ex.__class__.__name__
+            self.next_refresh_at = time.monotonic() + self.retry_sec
+        finally:
+            self._ready.set()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_calendar_cache(url: str, parse, **options):
+    """Worker başına URL başına tek cache (URL değişirse yenisi kurulur)."""
+    with _caches_lock:
+        cache = _caches.get(url)
+        if cache is None:
+            _caches.clear()
+            cache = _caches[url] = CalendarCache(url, parse, **options)
+        return cache
@@ -0,0 +1,143 @@
+# Kişisel .ics abonelik feed'leri (öğretmen / öğrenci derslerini kendi takvim uygulamasında görsün).
+# - Kimlik: users.calendar_feed_token (URL'de; takvim uygulamaları Authorization header gönderemez)
+# - Kapsam: TEACHER -> kendi dersleri, STUDENT -> kendi profilinin dersleri, ADMIN -> tüm dersler
+# - Pencere: bugünden CALENDAR_FEED_PAST_DAYS geri, CALENDAR_FEED_FUTURE_DAYS ileri (gün bazında sabit)
+# - İptal edilen dersler silinmez, STATUS:CANCELLED ile yayınlanır (takvim uygulaması event'i iptal gösterir)
+# - ETag / Last-Modified tek aggregate sorgudan (count, max(updated_at), max(id)) + feed sahibinin adı/updated_at;
+#   çoğu poll 304 alır.
+# - Gövde satırlar okundukça üretilir (yield_per), tüm feed bellekte birleştirilmez.
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+from app.database import db
+from app.ics import content_line, escape_text, format_utc
+from app.models.lesson_session import LessonSession, SessionStatus
+from app.models.student import Student
+from app.models.user import User
+
+FEED_VERSION = "1"  # feed formatı değişirse artır
+PRODID = "-//Odak Matematik//Ders Takvimi//TR"
+
+Teacher = aliased(User)
+
+
+def new_feed_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def feed_calendar_name(user: User) -> str:
+    return f"Odak Matematik - {user.full_name}"
+
+
+def feed_window(past_days: int, future_days: int, now=None):
+    today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=past_days), today + timedelta(days=future_days)
+
+
+def feed_query(user: User, role: str, window_start: datetime, window_end: datetime):
+    """
+    Feed'in kapsamı: (LessonSession satırları + öğrenci adı + öğretmen adı) için filtrelenmiş query.
+    STUDENT rolünde profil yoksa None.
+    """
+    q = (
+        db.session.query(LessonSession)
+        .join(Student, Student.id == LessonSession.student_id)
+        .join(Teacher, Teacher.id == LessonSession.teacher_user_id)
+        .filter(LessonSession.scheduled_start >= window_start)
+        .filter(LessonSession.scheduled_start < window_end)
+    )
+    if role == "TEACHER":
+        return q.filter(LessonSession.teacher_user_id == user.id)
+    if role == "STUDENT":
+        student = Student.query.filter_by(user_id=user.id, deleted_at=None).first()
+        if not student:
+            return None
+        return q.filter(LessonSession.student_id == student.id)
+    if role == "ADMIN":
+        return q
+    return None
+
+
+def feed_fingerprint(q, user: User, window_start: datetime):
+    """
+    (etag, last_modified) — satırlar yüklenmeden.
+    Feed'i isteyen kullanıcı da girer: adı X-WR-CALNAME'de, rolü SUMMARY biçiminde kullanılıyor.
+    """
+    row = q.with_entities(
+        func.count(LessonSession.id),
+        func.max(LessonSession.updated_at),
+        func.max(LessonSession.id),
+        func.max(Student.updated_at),
+        func.max(Teacher.updated_at),
+    ).one()
+
+    count, max_updated, max_id, student_updated, teacher_updated = row
+    stamps = [v for v in (max_updated, student_updated, teacher_updated, user.updated_at) if v is not None]
+    # pencere her gün kayar: Last-Modified en az pencere başlangıcı kadar yeni olmalı
+    last_modified = max(stamps + [window_start])
+
+    parts = [FEED_VERSION, user.id, feed_calendar_name(user), window_start.date().isoformat(),
+             [v.isoformat() if hasattr(v, "isoformat") else v for v in (count, max_id, *stamps)]]
+    etag = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return etag, last_modified.replace(microsecond=0)
+
+
+def session_summary(role: str, topic, student_name, teacher_name):
+    who = teacher_name if role == "STUDENT" else student_name
+    if role == "ADMIN":
+        who = f"{student_name} / {teacher_name}"
+    text = f"Ders: {who}"
+    return f"{text} - {topic}" if topic else text
+
+
+def generate_feed(q, role: str, calendar_name: str, batch_size: int = 500):
+    """VCALENDAR'ı parça parça üretir (Flask Response'a stream olarak verilir)."""
+    yield content_line("BEGIN", "VCALENDAR")
+    yield content_line("VERSION", "2.0")
+    yield content_line("PRODID", PRODID)
+    yield content_line("CALSCALE", "GREGORIAN")
+    yield content_line("METHOD", "PUBLISH")
+    yield content_line("X-WR-CALNAME", escape_text(calendar_name))
+    yield content_line("X-PUBLISHED-TTL", "PT15M")
+
+    rows = (
+        q.with_entities(
+            LessonSession.id,
+            LessonSession.scheduled_start,
+            LessonSession.duration_min,
+            LessonSession.mode,
+            LessonSession.topic,
+            LessonSession.status,
+            LessonSession.created_at,
+            LessonSession.updated_at,
+            Student.full_name,
+            Teacher.full_name,
+        )
+        .order_by(LessonSession.scheduled_start, LessonSession.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    for sid, start, duration_min, mode, topic, status, created_at, updated_at, student_name, teacher_name in rows:
+        cancelled = status == SessionStatus.CANCELLED
+        lines = [
+            ("BEGIN", "VEVENT"),
+            ("UID", f"lesson-{sid}@odakmat"),
+            ("DTSTAMP", format_utc(updated_at or created_at)),
+            ("CREATED", format_utc(created_at)),
+            ("LAST-MODIFIED", format_utc(updated_at or created_at)),
+            ("DTSTART", format_utc(start)),
+            ("DTEND", format_utc(start + timedelta(minutes=duration_min or 0))),
+            ("SUMMARY", escape_text(session_summary(role, topic, student_name, teacher_name))),
+            ("STATUS", "CANCELLED" if cancelled else "CONFIRMED"),
+            ("CATEGORIES", f"{getattr(mode, 'value', mode)},{status.value}"),
+            ("TRANSP", "TRANSPARENT" if cancelled else "OPAQUE"),
+            ("END", "VEVENT"),
+        ]
+        yield "".join(content_line(name, value) for name, value in lines)
+
+    yield content_line("END", "VCALENDAR")
@@ -0,0 +1,73 @@
+# Flask CLI komutları (FLASK_APP=main.py).
+# Örn: docker exec -it odak_app flask sweep
+#      docker exec -it odak_app flask sweep --interval 300   (her 5 dakikada bir, sürekli)
+#      docker exec -it odak_app flask search-rebuild            (arama index'i: migration sonrası / config değişince)
+#      docker exec -it odak_app flask summaries-rebuild         (admin özet tabloları; --interval ile periyodik)
+
+import json
+import time
+
+import click
+
+from app.database import db
+from app.maintenance import run_sweep
+from app.search import DOCUMENTS, rebuild
+from app.summaries import rebuild_session_stats
+
+
+def register_commands(app):
+    @app.cli.command("sweep")
+    @click.option("--batch-size", type=int, default=None, help="Batch başına satır (varsayılan: SWEEP_BATCH_SIZE)")
+    @click.option("--overdue-status", type=str, default=None, help="MISSED veya CANCELLED (varsayılan: SWEEP_OVERDUE_STATUS)")
+    @click.option("--grace-hours", type=float, default=None, help="Ders saatinden kaç saat sonra işaretlenmemiş sayılır")
+    @click.option("--interval", type=int, default=0, help="Saniye; > 0 ise komut bu aralıkla sürekli çalışır")
+    def sweep(batch_size, overdue_status, grace_hours, interval):
+        """Süresi geçmiş paketleri ve işaretlenmemiş eski dersleri günceller."""
+        while True:
+            try:
+                metrics = run_sweep(batch_size=batch_size, overdue_status=overdue_status, grace_hours=grace_hours)
+            except ValueError as ex:
+                raise click.BadParameter(str(ex))
+            click.echo(json.dumps(metrics))
+            if interval <= 0:
+                return
+            time.sleep(interval)
+
+    @app.cli.command("search-rebuild")
+    @click.option("--table", "tables", multiple=True,
+                  type=click.Choice([m.__tablename__ for m in DOCUMENTS]),
+                  help="Sadece bu tablo(lar) (varsayılan: hepsi)")
+    @click.option("--batch-size", type=int, default=1000, help="Batch başına satır (id aralığı)")
+    def search_rebuild(tables, batch_size):
+        """search_vector kolonlarını mevcut veriden yeniden hesaplar."""
+        if batch_size <= 0:
+            raise click.BadParameter("batch-size must be > 0")
+        for model in DOCUMENTS:
+            if tables and model.__tablename__ not in tables:
+                continue
+            started = time.perf_counter()
+            try:
+                updated = rebuild(db.session, model, batch_size=batch_size)
+            except RuntimeError as ex:
+                raise click.ClickException(str(ex))
+            click.echo(json.dumps({
+                "table": model.__tablename__,
+                "updated": updated,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            }))
+
+    @app.cli.command("summaries-rebuild")
+    @click.option("--interval", type=int, default=0, help="Saniye; > 0 ise komut bu aralıkla sürekli çalışır")
+    def summaries_rebuild(interval):
+        """Özet tablolarını (session_monthly_stats) tüm geçmişten yeniden hesaplar."""
+        while True:
+            started = time.perf_counter()
+            months = rebuild_session_stats(db.session)
+            click.echo(json.dumps({
+                "table": "session_monthly_stats",
+                "months": months,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            }))
+            if interval <= 0:
+                return
+            time.sleep(interval)
@@ -0,0 +1,65 @@
+# Sık poll edilen liste endpoint'leri için weak ETag / conditional GET.
+# ETag satırları serialize etmeden, filtrelenmiş query'nin ucuz bir parmak izinden üretilir:
+#   count(id), max(updated_at), max(id)  (+ endpoint'in eklediği join'li aggregate'ler, örn: users.updated_at)
+# ve kapsam: rol, kullanıcı, query string. If-None-Match eşleşirse 304 döner, satırlar hiç yüklenmez.
+# updated_at ORM ve Core update()'lerinde onupdate ile güncellenir; silme count / max(id) ile yakalanır.
+
+import hashlib
+
+from flask import current_app, request, g
+from sqlalchemy import func
+
+ETAG_VERSION = "1"  # cevap formatı değişirse artır -> eski ETag'ler geçersiz olur
+
+
+def list_etag(q, model, extra=(), scope=()):
+    """
+    q: filtreleri uygulanmış query (load_only/order_by öncesi)
+    extra: fingerprint'e eklenecek ek aggregate ifadeleri (gerekli join q'ya önceden eklenmiş olmalı)
+    scope: query'ye yansımayan ama cevabı etkileyen değerler
+    """
+    row = (
+        q.order_by(None)
+        .with_entities(func.count(model.id), func.max(model.updated_at), func.max(model.id), *extra)
+        .one()
+    )
+    parts = [
+        ETAG_VERSION,
+        request.path,
+        getattr(g, "role", None),
+        getattr(g, "user_id", None),
+        sorted(request.args.items(multi=True)),
+        list(scope),
+        [v.isoformat() if hasattr(v, "isoformat") else v for v in row],
+    ]
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def not_modified(etag: str):
+    resp = current_app.response_class(status=304)
+    set_etag(resp, etag)
+    return resp
+
+
+def set_etag(resp, etag: str):
+    resp.set_etag(etag, weak=True)
+    # tarayıcı cevabı saklasın ama her seferinde ETag ile doğrulasın; cevap token'a göre değişir
+    resp.headers["Cache-Control"] = "private, no-cache"
+    resp.vary.add("Authorization")
+    return resp
+
+
+def conditional(q, model, build, extra=(), scope=()):
+    """
+    build(): asıl cevabı üreten fonksiyon ((jsonify, status) tuple'ı veya response).
+    If-None-Match eşleşirse build hiç çağrılmaz.
+    """
+    etag = list_etag(q, model, extra=extra, scope=scope)
+    if request.if_none_match.contains_weak(etag):
+        return not_modified(etag)
+
+    result = build()
+    resp, status = result if isinstance(result, tuple) else (result, 200)
+    if status == 200:
+        set_etag(resp, etag)
+    return resp, status
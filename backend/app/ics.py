@@ -0,0 +1,434 @@
+# RFC 5545 (iCalendar) okuyucu — public takvim akışı için (en altta .ics abonelik feed'leri için yazma yardımcıları).
+# - Satırlar stream olarak okunur (dosya/HTTP response satır satır), katlanmış (folded) satırlar birleştirilir;
+#   her VEVENT END:VEVENT geldiğinde kompakt event tanımına çevrilir: bellekte sadece o an okunan VEVENT'in
+#   ham satırları ve kompakt event tanımları tutulur.
+# - DTSTART/DTEND: UTC (Z), TZID=... (zoneinfo), floating ve tüm gün (VALUE=DATE) desteklenir.
+# - RRULE/RDATE/EXDATE ve RECURRENCE-ID override'ları: tekrarlar parse sırasında değil,
+#   expand_events(window) çağrısında ve sadece istenen pencere için (lazy) üretilir.
+
+import heapq
+import re
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+
+from app.recurrence import RecurrenceError, iter_rrule, parse_rrule
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # py < 3.9
+    ZoneInfo = None
+
+MAX_ITEMS = 5000  # tek pencerede üretilecek en fazla occurrence (bozuk/çok yoğun akışlara karşı)
+
+# Outlook/Exchange akışlarında görülen Windows saat dilimi adları
+WINDOWS_TZ = {
+    "Turkey Standard Time": "Europe/Istanbul",
+    "GTB Standard Time": "Europe/Bucharest",
+    "W. Europe Standard Time": "Europe/Berlin",
+    "GMT Standard Time": "Europe/London",
+    "UTC": "UTC",
+}
+
+EventDef = namedtuple("EventDef", [
+    "uid", "summary", "location",
+    "start",          # naive wall-clock datetime (tüm gün ise gece yarısı)
+    "duration",       # timedelta
+    "tz",             # tzinfo | None (floating / tüm gün -> takvimin varsayılan dilimi)
+    "all_day",
+    "rrule",          # parse_rrule dict | None
+    "rdates",         # [naive wall-clock datetime]
+    "exdates",        # ((naive wall-clock, tzinfo | None), ...)
+    "recurrence_id",  # (naive wall-clock, tzinfo | None) | None (override event'i)
+])
+
+ParsedCalendar = namedtuple("ParsedCalendar", ["events", "default_tz"])
+
+_DURATION_RE = re.compile(
+    r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+
+
+# ---------- satır seviyesi ----------
+def unfold(lines):
+    """Katlanmış satırları birleştirir: boşluk/tab ile başlayan satır bir öncekinin devamıdır."""
+    current = None
+    for raw in lines:
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="ignore")
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _split_unquoted(text, sep):
+    parts, buf, quoted = [], [], False
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        if ch == sep and not quoted:
+            parts.append("".join(buf))
+            buf = []
+        else:
+            buf.append(ch)
+    parts.append("".join(buf))
+    return parts
+
+
+def parse_line(line):
+    """'DTSTART;TZID=Europe/Istanbul:20260110T100000' -> ("DTSTART", {"TZID": "Europe/Istanbul"}, "20260110T100000")"""
+    quoted = False
+    for i, ch in enumerate(line):
+        if ch == '"':
+            quoted = not quoted
+        elif ch == ":" and not quoted:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return None
+
+    parts = _split_unquoted(head, ";")
+    params = {}
+    for p in parts[1:]:
+        if "=" in p:
+            k, v = p.split("=", 1)
+            params[k.strip().upper()] = v.strip().strip('"')
+    return parts[0].strip().upper(), params, value
+
+
+def unescape_text(value: str) -> str:
+    out, i = [], 0
+    while i < len(value):
+        ch = value[i]
+        if ch == "\\" and i + 1 < len(value):
+            nxt = value[i + 1]
+            out.append("\n" if nxt in "nN" else nxt)
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+# ---------- zaman ----------
+@lru_cache(maxsize=64)
+def resolve_tz(tzid):
+    if not tzid or ZoneInfo is None:
+        return None
+    tzid = WINDOWS_TZ.get(tzid, tzid)
+    candidates = [tzid]
+    if "/" in tzid:
+        # "/mozilla.org/20050126_1/Europe/Berlin" gibi önekli id'ler
+        segs = [s for s in tzid.split("/") if s]
+        candidates += ["/".join(segs[-2:]), segs[-1]]
+    for name in candidates:
+        try:
+            return ZoneInfo(name)
+        except Exception:
+            continue
+    return None
+
+
+def parse_ics_datetime(raw: str):
+    """
+    Supports formats like:
+    - 20250115T120000Z
+    - 20250115T120000
+    - 20250115
+    Dönen: (naive datetime, is_utc, is_date) veya None
+    """
+    if not raw:
+        return None
+    raw = raw.strip()
+    try:
+        if "T" in raw:
+            is_utc = raw.endswith("Z")
+            return datetime.strptime(raw.rstrip("Z"), "%Y%m%dT%H%M%S"), is_utc, False
+        return datetime.strptime(raw, "%Y%m%d"), False, True
+    except ValueError:
+        return None
+
+
+def parse_duration(raw: str):
+    m = _DURATION_RE.match((raw or "").strip())
+    if not m:
+        return None
+    sign, w, d, h, mi, s = m.groups()
+    td = timedelta(weeks=int(w or 0), days=int(d or 0), hours=int(h or 0), minutes=int(mi or 0), seconds=int(s or 0))
+    return -td if sign == "-" else td
+
+
+def _prop_datetime(prop):
+    """(params, value) -> (naive wall datetime, tz, is_date) ; tz: UTC | ZoneInfo | None (floating)"""
+    params, value = prop
+    parsed = parse_ics_datetime(value)
+    if parsed is None:
+        return None
+    dt, is_utc, is_date = parsed
+    is_date = is_date or params.get("VALUE", "").upper() == "DATE"
+    if is_date:
+        return datetime(dt.year, dt.month, dt.day), None, True
+    if is_utc:
+        return dt, timezone.utc, False
+    return dt, resolve_tz(params.get("TZID")), False
+
+
+def _to_utc(wall: datetime, tz, default_tz):
+    zone = tz or default_tz or timezone.utc
+    return wall.replace(tzinfo=zone).astimezone(timezone.utc)
+
+
+# ---------- parse ----------
+def _build_event(props):
+    """
+    Ham VEVENT satırları -> EventDef. Takvimin varsayılan dilimine bağlı değildir (X-WR-TIMEZONE event'lerden
+    sonra da gelebilir): floating EXDATE / RECURRENCE-ID wall-clock tutulur, UTC'ye expand_events'te çevrilir.
+    """
+    start = props.get("DTSTART")
+    if not start:
+        return None
+    parsed = _prop_datetime(start[0])
+    if parsed is None:
+        return None
+    start_wall, tz, all_day = parsed
+
+    duration = None
+    if props.get("DTEND"):
+        end = _prop_datetime(props["DTEND"][0])
+        if end is not None:
+            end_wall, end_tz, _ = end
+            if end_tz is not None and end_tz != tz and tz is not None:
+                # DTEND farklı dilimde olabilir: UTC üzerinden fark
+                duration = _to_utc(end_wall, end_tz, None) - _to_utc(start_wall, tz, None)
+            else:
+                duration = end_wall - start_wall
+    elif props.get("DURATION"):
+        duration = parse_duration(props["DURATION"][0][1])
+    if duration is None or duration < timedelta(0):
+        duration = timedelta(days=1) if all_day else timedelta(0)
+
+    rrule = None
+    if props.get("RRULE"):
+        try:
+            rrule = parse_rrule(props["RRULE"][0][1])
+        except RecurrenceError:
+            rrule = None  # desteklenmeyen kural: sadece ilk occurrence
+
+    def date_list(name):
+        out = []
+        for params, value in props.get(name, []):
+            for part in value.split(","):
+                p = _prop_datetime((params, part))
+                if p is not None:
+                    out.append(p)
+        return out
+
+    rdates = [wall for wall, _, _ in date_list("RDATE")]
+    exdates = tuple((wall, ex_tz or tz) for wall, ex_tz, _ in date_list("EXDATE"))
+
+    recurrence_id = None
+    if props.get("RECURRENCE-ID"):
+        rid = _prop_datetime(props["RECURRENCE-ID"][0])
+        if rid is not None:
+            recurrence_id = (rid[0], rid[1] or tz)
+
+    def text(name):
+        return unescape_text(props[name][0][1]) if props.get(name) else None
+
+    return EventDef(
+        uid=text("UID"),
+        summary=text("SUMMARY"),
+        location=text("LOCATION"),
+        start=start_wall,
+        duration=duration,
+        tz=tz,
+        all_day=all_day,
+        rrule=rrule,
+        rdates=rdates,
+        exdates=exdates,
+        recurrence_id=recurrence_id,
+    )
+
+
+def parse_calendar(source, default_tz=None):
+    """
+    source: ICS metni (str) ya da satır iterable'ı (dosya, HTTP response...).
+    default_tz: floating/tüm gün event'ler için dilim (takvimde X-WR-TIMEZONE varsa o kullanılır).
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    tz_hint = default_tz if not isinstance(default_tz, str) else resolve_tz(default_tz)
+
+    events = []
+    props = None
+    nested = 0  # VEVENT içindeki VALARM vb.
+    for line in unfold(lines):
+        parsed = parse_line(line)
+        if parsed is None:
+            continue
+        name, params, value = parsed
+
+        if name == "BEGIN":
+            if value.upper() == "VEVENT" and props is None:
+                props = {}
+            elif props is not None:
+                nested += 1
+            continue
+        if name == "END":
+            if props is not None:
+                if nested:
+                    nested -= 1
+                elif value.upper() == "VEVENT":
+                    ev = _build_event(props)
+                    if ev is not None:
+                        events.append(ev)
+                    props = None
+            continue
+
+        if props is None:
+            if name == "X-WR-TIMEZONE":
+                tz_hint = resolve_tz(value.strip()) or tz_hint
+            continue
+        if not nested:
+            props.setdefault(name, []).append((params, value))
+
+    return ParsedCalendar(events=events, default_tz=tz_hint)
+
+
+# ---------- açılım ----------
+def _format(wall: datetime, tz, all_day: bool):
+    # tüm gün / floating: naive (tarayıcı yerel saat olarak gösterir); dilimli: offset'li ISO
+    if all_day or tz is None:
+        return wall.isoformat()
+    return wall.replace(tzinfo=tz).isoformat()
+
+
+def _rrule_starts(ev: EventDef, window_end_utc, default_tz):
+    until = None
+    raw_until = ev.rrule.get("until")
+    if raw_until and str(raw_until).strip().upper().endswith("Z") and ev.tz is not None:
+        # UNTIL UTC, kural ise event'in yerel saatinde açılıyor
+        parsed = parse_ics_datetime(raw_until)
+        if parsed is not None:
+            until = parsed[0].replace(tzinfo=timezone.utc).astimezone(ev.tz).replace(tzinfo=None)
+    try:
+        for occ in iter_rrule(ev.rrule, ev.start, until=until):
+            if _to_utc(occ, ev.tz, default_tz) >= window_end_utc:
+                return
+            yield occ
+    except RecurrenceError:
+        yield ev.start
+
+
+def _occurrence_starts(ev: EventDef, window_end_utc, default_tz):
+    """ev'in başlangıçlarını (wall-clock) sıralı ve lazy üretir; pencere sonunu geçince durur."""
+    if not ev.rdates:
+        if ev.rrule:
+            yield from _rrule_starts(ev, window_end_utc, default_tz)
+        else:
+            yield ev.start
+        return
+
+    # RDATE'ler kurala eklenir (tekrarsız sıralı birleşim; RDATE'li akışlar nadir, liste yeterli)
+    starts = set(_rrule_starts(ev, window_end_utc, default_tz)) if ev.rrule else {ev.start}
+    yield from sorted(starts.union(ev.rdates))
+
+
+def _event_items(ev: EventDef, ws, we, default_tz, overridden):
+    """ev'in pencereyle kesişen occurrence'ları: (start_utc, öğe), başlangıca göre sıralı ve lazy."""
+    exdates = {_to_utc(wall, tz, default_tz) for wall, tz in ev.exdates}
+    for start in _occurrence_starts(ev, we, default_tz):
+        start_utc = _to_utc(start, ev.tz, default_tz)
+        if start_utc >= we:
+            return
+        end = start + ev.duration
+        end_utc = start_utc + ev.duration
+        # sıfır süreli event'ler başladıkları anda pencere içinde sayılır
+        if end_utc <= ws and not (ev.duration == timedelta(0) and start_utc >= ws):
+            continue
+        if ev.recurrence_id is None and (start_utc in exdates or (ev.uid, start_utc) in overridden):
+            continue
+        yield start_utc, {
+            "uid": ev.uid,
+            "summary": ev.summary,
+            "start": _format(start, ev.tz, ev.all_day),
+            "end": _format(end, ev.tz, ev.all_day),
+            "location": ev.location,
+            "all_day": ev.all_day,
+        }
+
+
+def expand_events(cal: ParsedCalendar, window_start: datetime, window_end: datetime, max_items=MAX_ITEMS):
+    """
+    window_start/window_end: aware datetime. Pencereyle kesişen occurrence'lar, başlangıca göre sıralı.
+    max_items aşılırsa tüm event'ler içinden en erken max_items occurrence döner (event akışları
+    heapq.merge ile birleşir; tek bir event'in RRULE'u listeyi doldurup diğerlerini dışarıda bırakmaz).
+    Dönen her öğe: {"uid", "summary", "start", "end", "location", "all_day"}
+    """
+    ws = window_start.astimezone(timezone.utc)
+    we = window_end.astimezone(timezone.utc)
+    default_tz = cal.default_tz
+
+    overridden = {
+        (ev.uid, _to_utc(*ev.recurrence_id, default_tz)) for ev in cal.events if ev.recurrence_id is not None
+    }
+
+    streams = [_event_items(ev, ws, we, default_tz, overridden) for ev in cal.events]
+    merged = heapq.merge(*streams, key=lambda x: x[0])
+    return [item for _, item in islice(merged, max_items)]
+
+
+def as_window_bound(value, default_tz):
+    """date/naive datetime -> default_tz'de aware datetime (route'tan gelen ?from=&to= için)."""
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=default_tz or timezone.utc)
+    return value
+
+
+# ---------- yazma (abonelik feed'leri) ----------
+def escape_text(value) -> str:
+    text = "" if value is None else str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """75 octet'ten uzun satırları katlar (devam satırları tek boşlukla başlar), CRLF ile biter."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, limit = [], 75
+    while raw:
+        cut = min(limit, len(raw))
+        # UTF-8 karakterini ortadan bölme
+        while cut < len(raw) and (raw[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(raw[:cut].decode("utf-8"))
+        raw = raw[cut:]
+        limit = 74  # devam satırlarında baştaki boşluk da sayılır
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_utc(dt: datetime) -> str:
+    """naive (UTC kabul edilir) / aware datetime -> 20260110T100000Z"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y%m%dT%H%M%SZ")
+
+
+def content_line(name: str, value: str) -> str:
+    return fold(f"{name}:{value}")
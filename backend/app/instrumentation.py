@@ -0,0 +1,98 @@
+# İstek başına SQL sorgu sayısı ve DB süresi.
+# SQLAlchemy cursor event'leri her statement'ı sayar/süresini ölçer (request context yoksa -CLI, sweep- yok sayılır).
+# Sonuç:
+#   - Server-Timing header: db;dur=12.3;desc="7 queries", app;dur=40.1  (tarayıcı devtools > Timing'de görünür)
+#   - "app.requests" logger'ına tek satır JSON: method, path, endpoint, status, duration_ms, db_ms, queries
+#   - SQL_QUERY_BUDGET aşılırsa: warn -> WARNING log, raise -> (sadece debug/testing'de) 500 ile isteği düşür
+# N+1 kalıpları (satır başına User.query.get gibi) sorgu sayısında hemen görünür.
+
+import json
+import logging
+import time
+
+from flask import g, has_request_context, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.requests")
+
+BUDGET_MODES = ("off", "warn", "raise")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context() or "sql_queries" not in g:
+        return
+    started = getattr(context, "_query_started", None)
+    g.sql_queries += 1
+    if started is not None:
+        g.sql_time += time.perf_counter() - started
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_time = 0.0
+
+
+def request_stats():
+    """(sorgu sayısı, db ms, toplam ms) — mevcut istek için."""
+    total = (time.perf_counter() - g.request_started) * 1000 if "request_started" in g else 0.0
+    return g.get("sql_queries", 0), g.get("sql_time", 0.0) * 1000, total
+
+
+def _finish_request(app, response):
+    if "request_started" not in g:
+        return response
+
+    queries, db_ms, total_ms = request_stats()
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={db_ms:.1f};desc="{queries} queries", app;dur={total_ms:.1f}',
+    )
+
+    logger.info(json.dumps({
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "status": response.status_code,
+        "duration_ms": round(total_ms, 1),
+        "db_ms": round(db_ms, 1),
+        "queries": queries,
+    }))
+
+    budget = int(app.config.get("SQL_QUERY_BUDGET", 0) or 0)
+    mode = app.config.get("SQL_QUERY_BUDGET_MODE", "warn")
+    if budget <= 0 or mode == "off" or queries <= budget:
+        return response
+
+    logger.warning("query budget exceeded: %s %s -> %d queries (budget %d)",
+                   request.method, request.path, queries, budget)
+    if mode == "raise" and (app.debug or app.testing):
+        resp = jsonify({
+            "message": "query budget exceeded",
+            "endpoint": request.endpoint,
+            "queries": queries,
+            "budget": budget,
+        })
+        resp.status_code = 500
+        return resp
+    return response
+
+
+def init_instrumentation(app):
+    mode = app.config.get("SQL_QUERY_BUDGET_MODE", "warn")
+    if mode not in BUDGET_MODES:
+        raise ValueError(f"SQL_QUERY_BUDGET_MODE must be one of {list(BUDGET_MODES)}")
+
+    # Engine sınıfına bağlanır: app'teki tüm engine'ler (bind'lar dahil) sayılır, app context gerekmez
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    app.before_request(_start_request)
+    app.after_request(lambda response: _finish_request(app, response))
@@ -0,0 +1,131 @@
+# Periyodik bakım işleri (sweeper).
+# - Süresi (end_date) geçmiş ACTIVE paketleri EXPIRED yapar.
+# - Zamanı çoktan geçmiş ama hiç işaretlenmemiş (PLANNED) dersleri ayarlanabilir bir statüye (varsayılan MISSED) çeker.
+# Her iş küçük batch'ler halinde set-based UPDATE + commit ile yapılır; kilitler kısa tutulur.
+# Ders statüsü ORM dışında değiştiği için özet farkları (session_monthly_stats) her batch'in kendi transaction'ında
+# UPDATE ... RETURNING ile dönen satırlardan uygulanır.
+
+import logging
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from app.database import db
+from app.models.lesson_session import LessonSession, SessionStatus
+from app.models.package import StudentPackage, PackageStatus
+from app.summaries import add_session_delta, apply_session_deltas
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_OVERDUE_STATUSES = {SessionStatus.MISSED, SessionStatus.CANCELLED}
+
+
+def _batched_update(model, where, values, batch_size: int, returning=(), on_batch=None):
+    """
+    UPDATE model SET values WHERE id IN (SELECT id ... WHERE where LIMIT batch FOR UPDATE SKIP LOCKED)
+    Her batch ayrı commit; etkilenen satır sayısı batch'ten azsa biter.
+    returning verilirse güncellenen satırlar commit'ten önce on_batch(rows) ile aynı transaction'da işlenir.
+    Dönen: (toplam satır, batch sayısı)
+    """
+    total = 0
+    batches = 0
+    while True:
+        ids = (
+            select(model.id)
+            .where(*where)
+            .order_by(model.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(model)
+            .where(model.id.in_(ids.scalar_subquery()))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if returning:
+            rows = db.session.execute(stmt.returning(*returning)).all()
+            on_batch(rows)
+            count = len(rows)
+        else:
+            count = db.session.execute(stmt).rowcount or 0
+        db.session.commit()
+        batches += 1
+        total += count
+        if count < batch_size:
+            return total, batches
+
+
+def expire_packages(now: datetime, batch_size: int):
+    return _batched_update(
+        StudentPackage,
+        [
+            StudentPackage.status == PackageStatus.ACTIVE,
+            StudentPackage.end_date.isnot(None),
+            StudentPackage.end_date < now,
+        ],
+        {"status": PackageStatus.EXPIRED, "updated_at": now},
+        batch_size,
+    )
+
+
+def sweep_overdue_sessions(now: datetime, grace: timedelta, target: SessionStatus, batch_size: int):
+    where = [
+        LessonSession.status == SessionStatus.PLANNED,
+        LessonSession.scheduled_start < now - grace,
+    ]
+
+    def apply_deltas(rows):
+        deltas = {}
+        for scheduled_start, duration_min in rows:
+            add_session_delta(deltas, scheduled_start, SessionStatus.PLANNED, duration_min, -1)
+            add_session_delta(deltas, scheduled_start, target, duration_min, +1)
+        apply_session_deltas(db.session.connection(), deltas, now=now)
+
+    return _batched_update(
+        LessonSession, where, {"status": target, "updated_at": now}, batch_size,
+        returning=(LessonSession.scheduled_start, LessonSession.duration_min), on_batch=apply_deltas,
+    )
+
+
+def run_sweep(batch_size=None, overdue_status=None, grace_hours=None):
+    """
+    Tüm sweep işlerini çalıştırır ve metrikleri döner.
+    Parametre verilmezse config: SWEEP_BATCH_SIZE, SWEEP_OVERDUE_STATUS, SWEEP_OVERDUE_GRACE_HOURS
+    """
+    cfg = current_app.config
+    batch_size = int(batch_size or cfg.get("SWEEP_BATCH_SIZE", 500))
+    if batch_size <= 0:
+        raise ValueError("batch_size must be > 0")
+
+    target = SessionStatus(str(overdue_status or cfg.get("SWEEP_OVERDUE_STATUS", "MISSED")).strip().upper())
+    if target not in ALLOWED_OVERDUE_STATUSES:
+        raise ValueError(f"overdue status must be one of {sorted(s.value for s in ALLOWED_OVERDUE_STATUSES)}")
+
+    grace = timedelta(hours=float(grace_hours if grace_hours is not None else cfg.get("SWEEP_OVERDUE_GRACE_HOURS", 24)))
+
+    now = datetime.utcnow()
+    started = time.perf_counter()
+
+    expired, expire_batches = expire_packages(now, batch_size)
+    t_packages = time.perf_counter()
+
+    overdue, overdue_batches = sweep_overdue_sessions(now, grace, target, batch_size)
+    t_sessions = time.perf_counter()
+
+    metrics = {
+        "ran_at": now.isoformat(),
+        "batch_size": batch_size,
+        "packages_expired": expired,
+        "package_batches": expire_batches,
+        "package_ms": round((t_packages - started) * 1000, 1),
+        "sessions_swept": overdue,
+        "session_target_status": target.value,
+        "session_batches": overdue_batches,
+        "session_ms": round((t_sessions - t_packages) * 1000, 1),
+        "total_ms": round((t_sessions - started) * 1000, 1),
+    }
+    logger.info("sweep finished %s", metrics)
+    return metrics
@@ -0,0 +1,138 @@
+# Prometheus metrikleri: GET /api/metrics (text exposition format).
+#   http_request_duration_seconds{endpoint,method,status}  histogram (_count = istek sayısı)
+#   db_pool_checkout_wait_seconds                           bağlantı havuzundan connection alma bekleme süresi
+#   db_pool_checkout_timeouts_total                         havuz doluyken pool_timeout aşımı
+#   db_pool_connections_in_use                              şu an checkout edilmiş connection sayısı (worker'lar toplamı)
+#   auth_failures_total{reason}                             require_auth reddetmeleri (missing_token, token_expired...)
+# gunicorn -w N: PROMETHEUS_MULTIPROC_DIR set ise (gunicorn.conf.py set eder) her worker mmap dosyasına yazar,
+# /api/metrics hangi worker'a düşerse düşsün tüm worker'ların toplamını döner.
+# prometheus_client kurulu değilse kayıtlar no-op, endpoint 503 döner.
+
+import hmac
+import os
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # opsiyonel bağımlılık
+    prometheus_client = None
+
+bp = Blueprint("metrics", __name__)
+
+# ms seviyesindeki JSON endpoint'leri ile birkaç saniyelik bulk/ICS isteklerini birlikte kapsar
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds", "HTTP request latency",
+        ["endpoint", "method", "status"], buckets=LATENCY_BUCKETS,
+    )
+    POOL_CHECKOUT_WAIT = Histogram(
+        "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection",
+        buckets=POOL_WAIT_BUCKETS,
+    )
+    POOL_CHECKOUT_TIMEOUTS = Counter(
+        "db_pool_checkout_timeouts_total", "DB pool checkouts that hit pool_timeout",
+    )
+    POOL_IN_USE = Gauge(
+        "db_pool_connections_in_use", "Checked-out DB connections", multiprocess_mode="livesum",
+    )
+    AUTH_FAILURES = Counter(
+        "auth_failures_total", "Requests rejected by require_auth", ["reason"],
+    )
+
+
+def record_auth_failure(reason: str):
+    if prometheus_client is not None:
+        AUTH_FAILURES.labels(reason=reason).inc()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool + checkout bekleme süresi. Sadece havuzdan alma (ve gerekirse yeni bağlantı açma) ölçülür."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def _on_checkout(dbapi_conn, record, proxy):
+    POOL_IN_USE.inc()
+
+
+def _on_checkin(dbapi_conn, record):
+    POOL_IN_USE.dec()
+
+
+def engine_options(app):
+    # QueuePool kullanan (postgres) engine'ler TimedQueuePool ile kurulur; sqlite kendi pool'unu kullanır
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI") or ""
+    if uri.startswith("sqlite"):
+        return
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    options.setdefault("poolclass", TimedQueuePool)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+    if not event.contains(TimedQueuePool, "checkout", _on_checkout):
+        event.listen(TimedQueuePool, "checkout", _on_checkout)
+        event.listen(TimedQueuePool, "checkin", _on_checkin)
+
+
+def _start_timer():
+    request._metrics_started = time.perf_counter()
+
+
+def _observe(response):
+    started = getattr(request, "_metrics_started", None)
+    if started is not None:
+        REQUEST_LATENCY.labels(
+            endpoint=request.endpoint or "unmatched",
+            method=request.method,
+            status=str(response.status_code),
+        ).observe(time.perf_counter() - started)
+    return response
+
+
+def init_metrics(app):
+    """db.init_app'ten ÖNCE çağrılmalı (engine pool sınıfı burada ayarlanır)."""
+    if prometheus_client is None:
+        return
+    engine_options(app)
+    app.before_request(_start_timer)
+    app.after_request(_observe)
+
+
+def collect():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry)
+
+
+@bp.get("")
+def metrics():
+    if prometheus_client is None:
+        return jsonify({"message": "prometheus_client not installed"}), 503
+
+    # fail closed: token tanımlı değilse endpoint kapalı
+    token = current_app.config.get("METRICS_TOKEN")
+    if not token:
+        return jsonify({"message": "metrics disabled (METRICS_TOKEN not set)"}), 403
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return jsonify({"message": "forbidden"}), 403
+
+    return Response(collect(), content_type=prometheus_client.CONTENT_TYPE_LATEST)
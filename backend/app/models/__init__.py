@@ -6,6 +6,8 @@ from .lesson_report import LessonReport
 from .homework import Homework, HomeworkStatus
 from .package import Package, StudentPackage, PackageStatus
 from app.models.role import Role
+from .summary import SessionMonthlyStat
+from .auth_version import AuthVersion
 
 __all__ = [
     "User",
@@ -22,5 +24,7 @@ __all__ = [
     "Package",
     "StudentPackage",
     "PackageStatus",
+    "SessionMonthlyStat",
+    "AuthVersion",
 ]
 
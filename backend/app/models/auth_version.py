@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from app.database import db
+
+
+class AuthVersion(db.Model):
+    """
+    Yetki durumunun sürüm sayacı (tek satır, id=1). Kullanıcı / öğrenci / enrollment yetkisini değiştiren yazımlar
+    invalidate_principals() ile artırır; her worker cache'teki principal'ı bu sürümle doğrular (app/auth/principal.py).
+    """
+    __tablename__ = "auth_versions"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
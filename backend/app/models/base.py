@@ -1,5 +1,21 @@
 from datetime import datetime
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.database import db
+from app.serialization import serialize
+
+
+def search_vector_column():
+    """
+    Tam metin arama kolonu (app/search.py yazar, migration e3b8d2f6a1c7).
+    deferred: normal SELECT'e girmez; info["internal"]: to_dict / ?fields= / projeksiyonlarda yok.
+    sqlite'ta (yerel deneme) düz TEXT olarak oluşur.
+    """
+    return deferred(db.Column(TSVECTOR().with_variant(db.Text(), "sqlite"), nullable=True, info={"internal": True}))
+
+
+def search_vector_index(tablename: str):
+    return db.Index(f"ix_{tablename}_search_vector", "search_vector", postgresql_using="gin")
 
 class BaseModel(db.Model):     #Abstract Base Model denir. Normalde SQL Alch ile classlar db de tablo olarak gösterilir fakat burada bu durum yok. 
     __abstract__ = True
@@ -8,6 +24,13 @@ class BaseModel(db.Model):     #Abstract Base Model denir. Normalde SQL Alch ile
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # İsimli projeksiyonlar (?view=summary). "detail" = tüm kolonlar, burada tanımlanmaz.
+    __projections__ = {}
+
+    @classmethod
+    def column_names(cls):
+        return [c.name for c in cls.__table__.columns if not c.info.get("internal")]
+
     def save(self):
         db.session.add(self)
         db.session.commit()
@@ -17,14 +40,7 @@ class BaseModel(db.Model):     #Abstract Base Model denir. Normalde SQL Alch ile
         db.session.delete(self)
         db.session.commit()
 
-    def to_dict(self):    #Model objelerini JSON response’a dönüştürmek için generic bir to_dict yazdık.
-        out = {}
-        for c in self.__table__.columns:
-            v = getattr(self, c.name)
-
-            # Enum -> string
-            if hasattr(v, "value"):
-                v = v.value
-
-            out[c.name] = v
-        return out
+    def to_dict(self, fields=None):    #Model objelerini JSON response’a dönüştürmek için generic bir to_dict yazdık.
+        # fields verilirse sadece o kolonlar (load_only ile yüklenmemiş kolona dokunup lazy load tetiklemeyelim)
+        # Enum/Numeric/DateTime dönüşümleri model başına bir kez hazırlanan plana göre yapılır (app/serialization.py)
+        return serialize(self, fields)
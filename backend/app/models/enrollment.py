@@ -16,6 +16,10 @@ class Enrollment(BaseModel):
 
     status = db.Column(db.Enum(EnrollmentStatus), nullable=False, default=EnrollmentStatus.ACTIVE)
 
+    __projections__ = {
+        "summary": ["id", "teacher_user_id", "student_id", "status"],
+    }
+
     __table_args__ = (
     db.UniqueConstraint("student_id", name="uq_enrollment_student"),
 )
\ No newline at end of file
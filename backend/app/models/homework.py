@@ -1,6 +1,6 @@
 import enum
 from app.database import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, search_vector_column, search_vector_index
 
 
 class HomeworkStatus(enum.Enum):
@@ -23,3 +23,20 @@ class Homework(BaseModel):
     grade = db.Column(db.Integer, nullable=True)  # 1-100
     teacher_note = db.Column(db.Text, nullable=True)
     student_note = db.Column(db.Text, nullable=True)
+
+    search_vector = search_vector_column()
+
+    __projections__ = {
+        "summary": ["id", "student_id", "teacher_user_id", "title", "due_date", "status", "grade", "created_at"],
+    }
+
+    __table_args__ = (
+        # keyset pagination: ORDER BY created_at DESC, id DESC
+        db.Index("ix_homeworks_created_at_id", "created_at", "id"),
+        # öğrencinin açık / gecikmiş ödevleri: student_id = ? AND status = ? AND due_date < ?
+        db.Index("ix_homeworks_student_status_due", "student_id", "status", "due_date"),
+        # öğretmenin değerlendirme kuyruğu: teacher_user_id = ? AND status = SUBMITTED ORDER BY created_at
+        db.Index("ix_homeworks_teacher_status_created", "teacher_user_id", "status", "created_at"),
+        # /api/search: search_vector @@ tsquery
+        search_vector_index("homeworks"),
+    )
@@ -1,5 +1,5 @@
 from app.database import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, search_vector_column, search_vector_index
 
 
 class LessonReport(BaseModel):
@@ -13,3 +13,18 @@ class LessonReport(BaseModel):
     performance_rating = db.Column(db.Integer, nullable=True)  # 1-5
     teacher_note = db.Column(db.Text, nullable=True)
     next_note = db.Column(db.Text, nullable=True)
+
+    search_vector = search_vector_column()
+
+    __projections__ = {
+        "summary": ["id", "lesson_session_id", "student_id", "teacher_user_id", "topic", "performance_rating", "created_at"],
+    }
+
+    __table_args__ = (
+        # keyset pagination: ORDER BY created_at DESC, id DESC
+        db.Index("ix_lesson_reports_created_at_id", "created_at", "id"),
+        # öğrenci ilerleme sayfası: student_id = ? ORDER BY created_at DESC
+        db.Index("ix_lesson_reports_student_created", "student_id", "created_at"),
+        # /api/search: search_vector @@ tsquery
+        search_vector_index("lesson_reports"),
+    )
@@ -1,9 +1,13 @@
 import enum
 from app.database import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, search_vector_column, search_vector_index
 from sqlalchemy.schema import CheckConstraint
 
 
+# Çakışma kontrolü (bounded overlap range scan) bu üst sınıra dayanır; DB'de CHECK ile zorunlu.
+MAX_DURATION_MIN = 600
+
+
 class SessionMode(enum.Enum):
     ONLINE = "ONLINE"
     IN_PERSON = "IN_PERSON"
@@ -51,7 +55,27 @@ class LessonSession(BaseModel):
 
     admin_note = db.Column(db.Text, nullable=True)
 
+    search_vector = search_vector_column()
+
+    __projections__ = {
+        # takvim / liste görünümü: uzun not alanları yok
+        "summary": [
+            "id", "student_id", "teacher_user_id", "scheduled_start", "duration_min",
+            "mode", "topic", "status", "consumed",
+        ],
+    }
+
     __table_args__ = (
         CheckConstraint("student_rating_to_teacher BETWEEN 1 AND 5", name="ck_student_rating_1_5"),
         CheckConstraint("teacher_rating_to_student BETWEEN 1 AND 5", name="ck_teacher_rating_1_5"),
+        CheckConstraint(f"duration_min BETWEEN 1 AND {MAX_DURATION_MIN}", name="ck_lesson_sessions_duration_min"),
+        # keyset pagination: ORDER BY scheduled_start DESC, id DESC
+        db.Index("ix_lesson_sessions_scheduled_start_id", "scheduled_start", "id"),
+        # çakışma kontrolü: bounded overlap range scan
+        db.Index("ix_lesson_sessions_teacher_start", "teacher_user_id", "scheduled_start"),
+        db.Index("ix_lesson_sessions_student_start", "student_id", "scheduled_start"),
+        # sweeper: status = PLANNED AND scheduled_start < ...
+        db.Index("ix_lesson_sessions_status_start", "status", "scheduled_start"),
+        # /api/search: search_vector @@ tsquery
+        search_vector_index("lesson_sessions"),
     )
@@ -18,6 +18,10 @@ class Package(BaseModel):
     price = db.Column(db.Numeric(12, 2), nullable=True)
     expires_in_days = db.Column(db.Integer, nullable=True)  # ör: 60 gün
 
+    __projections__ = {
+        "summary": ["id", "name", "lesson_count", "price", "expires_in_days"],
+    }
+
 
 class StudentPackage(BaseModel):
     __tablename__ = "student_packages"
@@ -30,6 +34,15 @@ class StudentPackage(BaseModel):
     end_date = db.Column(db.DateTime, nullable=True)
     status = db.Column(db.Enum(PackageStatus), nullable=False, default=PackageStatus.ACTIVE)
 
+    __projections__ = {
+        "summary": ["id", "student_id", "package_id", "remaining_lessons", "end_date", "status"],
+    }
+
+    __table_args__ = (
+        # sweeper: status = ACTIVE AND end_date < now
+        db.Index("ix_student_packages_status_end_date", "status", "end_date"),
+    )
+
     @staticmethod
     def compute_end_date(start_date, expires_in_days):
         if not expires_in_days:
@@ -1,5 +1,7 @@
+from sqlalchemy import DDL, event
+
 from app.database import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, search_vector_column, search_vector_index
 
 class Student(BaseModel):
     __tablename__ = "students"
@@ -20,3 +22,26 @@ class Student(BaseModel):
         unique=True,
         index=True
     )
+
+    search_vector = search_vector_column()
+
+    __projections__ = {
+        # strengths / weaknesses (Text) yok
+        "summary": ["id", "user_id", "full_name", "grade", "level", "target_exam", "deleted_at"],
+    }
+
+    __table_args__ = (
+        # /api/search: search_vector @@ tsquery
+        search_vector_index("students"),
+        # yazım hatalı isim araması (pg_trgm similarity / %)
+        db.Index("ix_students_full_name_trgm", "full_name",
+                 postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+    )
+
+
+# create_all ile kurulan şemalar için (migration'da da aynı extension açılır)
+event.listen(
+    Student.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
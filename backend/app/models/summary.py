@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from app.database import db
+
+
+class SessionMonthlyStat(db.Model):
+    """
+    lesson_sessions özeti: ay x statü başına ders sayısı ve toplam dakika (/api/admin/overview okur).
+    Ders yazılırken (ay, statü) farkları upsert edilir (app/summaries.py); tam yeniden hesap: flask summaries-rebuild
+    """
+    __tablename__ = "session_monthly_stats"
+
+    month = db.Column(db.DateTime, primary_key=True)  # ayın ilk günü 00:00 (UTC)
+    status = db.Column(db.String(32), primary_key=True)  # SessionStatus.value
+    session_count = db.Column(db.Integer, nullable=False, default=0)
+    total_minutes = db.Column(db.Integer, nullable=False, default=0)
+    refreshed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
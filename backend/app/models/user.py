@@ -23,6 +23,8 @@ class User(BaseModel):
     teacher_rate = db.Column(db.Numeric(12, 2), nullable=True)
     deleted_at = db.Column(db.DateTime, nullable=True)
     phones = db.Column(db.Text, nullable=True)
+    # .ics abonelik linki için gizli token (takvim uygulamaları header gönderemez); yenilenince eski link ölür
+    calendar_feed_token = db.Column(db.String(64), unique=True, index=True, nullable=True)
 
     def set_password(self, raw_password: str):
         self.password_hash = generate_password_hash(raw_password)
@@ -0,0 +1,113 @@
+# Liste endpoint'leri için ortak keyset (cursor) pagination.
+# ?limit=&cursor= verilirse {"items": [...], "next_cursor": "..."} döner; verilmezse eski davranış (düz liste).
+# Cursor, son satırın sıralama anahtarlarının (örn: scheduled_start, id) base64 JSON halidir.
+# OFFSET yerine "(k1, k2) < (v1, v2)" filtresi kullanıldığı için her sayfa, ne kadar derinde olursa olsun aynı maliyette.
+
+import base64
+import json
+from datetime import datetime
+
+from flask import request, jsonify
+from sqlalchemy import tuple_, DateTime, Integer
+from sqlalchemy.engine import Row
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def is_paginated_request() -> bool:
+    return "limit" in request.args or "cursor" in request.args
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(raw: str, keys):
+    padded = raw + "=" * (-len(raw) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("cursor shape mismatch")
+
+    out = []
+    for col, v in zip(keys, values):
+        if isinstance(col.type, DateTime):
+            v = datetime.fromisoformat(v)
+        elif isinstance(col.type, Integer):
+            v = int(v)
+        out.append(v)
+    return out
+
+
+def parse_page_args():
+    """
+    limit: 1..MAX_LIMIT (varsayılan DEFAULT_LIMIT)
+    cursor: opak string (bir önceki cevabın next_cursor'ı)
+    """
+    limit_raw = request.args.get("limit")
+    if limit_raw in (None, ""):
+        limit = DEFAULT_LIMIT
+    else:
+        try:
+            limit = int(limit_raw)
+        except Exception:
+            return jsonify({"message": "limit must be integer"}), 400
+        if limit <= 0:
+            return jsonify({"message": "limit must be > 0"}), 400
+        limit = min(limit, MAX_LIMIT)
+
+    cursor = request.args.get("cursor") or None
+    return limit, cursor
+
+
+def keyset_after(q, keys, values):
+    # Sıralama her zaman DESC, o yüzden "sonraki sayfa" = anahtarı daha küçük olanlar
+    if len(keys) == 1:
+        return q.filter(keys[0] < values[0])
+    return q.filter(tuple_(*keys) < tuple_(*values))
+
+
+def paginate(q, keys, serialize):
+    """
+    q: filtreleri uygulanmış (sıralanmamış) query
+    keys: sıralama anahtarları, en sonda tekil olan (id) olmalı -> örn: [LessonSession.scheduled_start, LessonSession.id]
+    serialize: satır -> dict
+    Query birden fazla entity/kolon seçiyorsa (Row) sıralama anahtarları ilk entity'den okunur.
+
+    Hata durumunda (jsonify, status) tuple döner; başarılıysa da (jsonify, 200).
+    """
+    order = [k.desc() for k in keys]
+
+    if not is_paginated_request():
+        rows = q.order_by(*order).all()
+        return jsonify([serialize(r) for r in rows]), 200
+
+    parsed = parse_page_args()
+    if not isinstance(parsed[0], int):
+        return parsed
+    limit, cursor = parsed
+
+    if cursor:
+        try:
+            values = decode_cursor(cursor, keys)
+        except Exception:
+            return jsonify({"message": "invalid cursor"}), 400
+        q = keyset_after(q, keys, values)
+
+    rows = q.order_by(*order).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        if isinstance(last, Row):
+            last = last[0]
+        next_cursor = encode_cursor([getattr(last, k.key) for k in keys])
+
+    return jsonify({
+        "items": [serialize(r) for r in rows],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    }), 200
@@ -0,0 +1,55 @@
+# Liste endpoint'leri için sparse fieldset / isimli projeksiyon desteği.
+# ?fields=id,scheduled_start,status  -> sadece bu kolonlar
+# ?view=summary                      -> modelin __projections__["summary"] kolonları
+# ?view=detail (varsayılan)          -> tüm kolonlar (eski davranış)
+# Seçilen kolonlar load_only ile SELECT'e de yansır; uzun Text alanları DB'den hiç okunmaz.
+
+from flask import request, jsonify
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(model, virtual=()):
+    """
+    Dönen: kolon adları listesi, None (tüm kolonlar) ya da (jsonify, 400).
+    virtual: modelde kolon olmayan ama endpoint'in eklediği alanlar (örn: students için email/phones).
+    """
+    columns = model.column_names()
+    allowed = columns + [v for v in virtual if v not in columns]
+
+    raw = request.args.get("fields")
+    if raw:
+        fields = [f.strip() for f in raw.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in allowed]
+        if unknown:
+            return jsonify({"message": "invalid fields", "unknown": unknown, "allowed": allowed}), 400
+    else:
+        view = (request.args.get("view") or "detail").strip().lower()
+        if view == "detail":
+            return None
+        projections = getattr(model, "__projections__", {}) or {}
+        if view not in projections:
+            return jsonify({"message": "invalid view", "allowed": ["detail", *sorted(projections)]}), 400
+        fields = list(projections[view])
+
+    if "id" not in fields:
+        fields.insert(0, "id")
+    return list(dict.fromkeys(fields))
+
+
+def column_fields(model, fields):
+    """fields içinden modelin gerçek kolonları (virtual alanlar hariç)."""
+    if fields is None:
+        return None
+    columns = set(model.column_names())
+    return [f for f in fields if f in columns]
+
+
+def apply_fields(q, model, fields, extra=()):
+    """
+    load_only ile SELECT'i daralt. extra: cevapta olmasa da yüklenmesi gereken kolonlar
+    (örn: cursor için sıralama anahtarı).
+    """
+    if fields is None:
+        return q
+    names = list(dict.fromkeys([*column_fields(model, fields), *extra]))
+    return q.options(load_only(*[getattr(model, n) for n in names]))
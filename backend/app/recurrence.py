@@ -0,0 +1,300 @@
+# RRULE benzeri tekrar kurallarını tarihlere açan yardımcılar.
+# Toplu ders oluşturma bu modülü kullanıyor: "her hafta Pzt/Çar 15:00, 8 ders" gibi (sadece WEEKLY).
+# ICS takvim akışı da iter_rrule ile DAILY/WEEKLY/MONTHLY/YEARLY kuralları lazy (generator) açar;
+# COUNT/UNTIL olmayan sonsuz kurallar çağıranın penceresinde kesilir.
+
+import calendar
+import re
+from datetime import datetime, timedelta
+
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+FREQS = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+# ICS'te görülen ama açılımı değiştirmeyen parçalar (WKST: sadece INTERVAL>1 + BYDAY'de fark eder, yok sayıyoruz)
+IGNORED_PARTS = {"WKST"}
+
+_BYDAY_RE = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+
+
+class RecurrenceError(ValueError):
+    pass
+
+
+def parse_rrule(raw: str) -> dict:
+    """
+    "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=8" -> {"freq": "WEEKLY", "byday": ["MO", "WE"], "count": 8}
+    """
+    out = {}
+    text = str(raw or "").strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+    for part in text.split(";"):
+        if not part.strip():
+            continue
+        if "=" not in part:
+            raise RecurrenceError(f"invalid rrule part: {part}")
+        key, value = part.split("=", 1)
+        key = key.strip().upper()
+        value = value.strip()
+        if key == "FREQ":
+            out["freq"] = value.upper()
+        elif key == "BYDAY":
+            out["byday"] = [d.strip().upper() for d in value.split(",") if d.strip()]
+        elif key == "COUNT":
+            out["count"] = value
+        elif key == "INTERVAL":
+            out["interval"] = value
+        elif key == "UNTIL":
+            out["until"] = value
+        elif key == "BYMONTHDAY":
+            out["bymonthday"] = [v.strip() for v in value.split(",") if v.strip()]
+        elif key == "BYMONTH":
+            out["bymonth"] = [v.strip() for v in value.split(",") if v.strip()]
+        elif key in IGNORED_PARTS:
+            continue
+        else:
+            raise RecurrenceError(f"unsupported rrule part: {key}")
+    return out
+
+
+def parse_until(raw):
+    if raw is None or isinstance(raw, datetime):
+        return raw
+    text = str(raw).strip()
+    # sadece tarih verilmişse o günün tamamı dahil
+    date_only = len(text) in (8, 10) and "T" not in text
+    # ICS formatı (20260301T000000Z / 20260301) veya ISO
+    parsed = None
+    for fmt in ("%Y%m%dT%H%M%SZ", "%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            parsed = datetime.strptime(text, fmt)
+            break
+        except ValueError:
+            pass
+    if parsed is None:
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            raise RecurrenceError("until must be ISO format")
+    if date_only:
+        parsed = parsed.replace(hour=23, minute=59, second=59)
+    return parsed
+
+
+def expand_weekly(dtstart: datetime, byday=None, until=None, count=None, interval=1, limit=None):
+    """
+    dtstart'tan itibaren haftalık tekrarları üretir (generator).
+    byday yoksa dtstart'ın günü kullanılır. until dahildir. count/until'den en az biri zorunlu.
+    limit: güvenlik sınırı, aşılırsa RecurrenceError.
+    """
+    if until is None and count is None:
+        raise RecurrenceError("until or count required")
+
+    try:
+        interval = int(interval or 1)
+    except Exception:
+        raise RecurrenceError("interval must be integer")
+    if interval <= 0:
+        raise RecurrenceError("interval must be > 0")
+
+    if count is not None:
+        try:
+            count = int(count)
+        except Exception:
+            raise RecurrenceError("count must be integer")
+        if count <= 0:
+            raise RecurrenceError("count must be > 0")
+
+    if byday:
+        try:
+            days = sorted({WEEKDAYS[d] for d in byday})
+        except KeyError:
+            raise RecurrenceError("byday must be in MO,TU,WE,TH,FR,SA,SU")
+    else:
+        days = [dtstart.weekday()]
+
+    week_start = dtstart - timedelta(days=dtstart.weekday())
+    produced = 0
+    while True:
+        for wd in days:
+            occ = week_start + timedelta(days=wd)
+            if occ < dtstart:
+                continue
+            if until is not None and occ > until:
+                return
+            if count is not None and produced >= count:
+                return
+            if limit is not None and produced >= limit:
+                raise RecurrenceError(f"too many occurrences (max {limit})")
+            produced += 1
+            yield occ
+        week_start += timedelta(weeks=interval)
+
+
+def expand_recurrence(spec: dict, dtstart: datetime, limit=None):
+    """
+    spec: {"freq": "WEEKLY", "byday": [...], "until": ..., "count": ..., "interval": ...}
+    veya {"rrule": "FREQ=WEEKLY;BYDAY=MO;COUNT=4"}
+    """
+    if spec.get("rrule"):
+        spec = {**parse_rrule(spec["rrule"]), **{k: v for k, v in spec.items() if k != "rrule"}}
+
+    freq = str(spec.get("freq") or "WEEKLY").upper()
+    if freq != "WEEKLY" or spec.get("bymonthday") or spec.get("bymonth"):
+        raise RecurrenceError("only WEEKLY recurrence is supported")
+
+    byday = spec.get("byday")
+    if isinstance(byday, str):
+        byday = [d.strip().upper() for d in byday.split(",") if d.strip()]
+    elif byday:
+        byday = [str(d).strip().upper() for d in byday]
+
+    return list(expand_weekly(
+        dtstart,
+        byday=byday,
+        until=parse_until(spec.get("until")),
+        count=spec.get("count"),
+        interval=spec.get("interval") or 1,
+        limit=limit,
+    ))
+
+
+# ---------- genel (ICS) açılım ----------
+def _int_list(values, name, lo, hi):
+    out = []
+    for v in values or []:
+        try:
+            n = int(v)
+        except Exception:
+            raise RecurrenceError(f"{name} must be integer")
+        if n == 0 or not (lo <= abs(n) <= hi):
+            raise RecurrenceError(f"{name} out of range")
+        out.append(n)
+    return out
+
+
+def _parse_byday(values):
+    """["MO", "2TU", "-1FR"] -> [(None, 0), (2, 1), (-1, 4)]"""
+    out = []
+    for v in values or []:
+        m = _BYDAY_RE.match(v)
+        if not m:
+            raise RecurrenceError("byday must be in MO,TU,WE,TH,FR,SA,SU (optional ordinal, e.g. 2MO, -1FR)")
+        out.append((int(m.group(1)) if m.group(1) else None, WEEKDAYS[m.group(2)]))
+    return out
+
+
+def _month_days(year, month, monthdays, byday, default_day):
+    """Ay içindeki gün numaraları (sıralı). BYMONTHDAY negatifse sondan sayılır, BYDAY ordinal'li olabilir."""
+    last = calendar.monthrange(year, month)[1]
+    days = set()
+    for d in monthdays:
+        day = d if d > 0 else last + d + 1
+        if 1 <= day <= last:
+            days.add(day)
+    for ordinal, wd in byday:
+        matching = [d for d in range(1, last + 1) if calendar.weekday(year, month, d) == wd]
+        if ordinal is None:
+            days.update(matching)
+        elif 1 <= abs(ordinal) <= len(matching):
+            days.add(matching[ordinal - 1] if ordinal > 0 else matching[ordinal])
+    if not monthdays and not byday and default_day <= last:
+        days.add(default_day)
+    return sorted(days)
+
+
+def _candidates(freq, dtstart, interval, byday, monthdays, months):
+    """Kuralın (COUNT/UNTIL uygulanmamış) sonsuz aday üreteci, dtstart'tan önceki adaylar dahil olabilir."""
+    at = (dtstart.hour, dtstart.minute, dtstart.second)
+
+    if freq == "DAILY":
+        occ = dtstart
+        weekdays = {wd for _, wd in byday}
+        while True:
+            if (not weekdays or occ.weekday() in weekdays) and (not months or occ.month in months):
+                yield occ
+            occ += timedelta(days=interval)
+
+    elif freq == "WEEKLY":
+        days = sorted({wd for _, wd in byday}) or [dtstart.weekday()]
+        week_start = dtstart - timedelta(days=dtstart.weekday())
+        while True:
+            for wd in days:
+                occ = week_start + timedelta(days=wd)
+                if not months or occ.month in months:
+                    yield occ
+            week_start += timedelta(weeks=interval)
+
+    elif freq == "MONTHLY":
+        year, month = dtstart.year, dtstart.month
+        while True:
+            if not months or month in months:
+                for day in _month_days(year, month, monthdays, byday, dtstart.day):
+                    yield datetime(year, month, day, *at)
+            month += interval
+            year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+
+    else:  # YEARLY
+        year = dtstart.year
+        if months:
+            for_months = sorted(months)
+        elif byday or monthdays:
+            # BYMONTH'suz BYDAY/BYMONTHDAY: yılın tüm ayları (ordinal'li BYDAY ay bazında yorumlanır)
+            for_months = list(range(1, 13))
+        else:
+            for_months = [dtstart.month]
+        while True:
+            for month in for_months:
+                for day in _month_days(year, month, monthdays, byday, dtstart.day):
+                    yield datetime(year, month, day, *at)
+            year += interval
+
+
+def iter_rrule(rule: dict, dtstart: datetime, until=None, max_scan=100000):
+    """
+    rule: parse_rrule çıktısı (freq, interval, count, until, byday, bymonthday, bymonth).
+    dtstart'tan itibaren tekrarları sırayla üretir (ilk eleman dtstart'ın kendisi, RFC 5545'teki gibi).
+    until: kuralın UNTIL'i yerine kullanılacak (örn. saat dilimine çevrilmiş) naive datetime.
+    COUNT/UNTIL yoksa sonsuzdur; çağıran pencerenin sonunda bırakmalı.
+    max_scan: bozuk kurallara karşı üst sınır (aday sayısı).
+    """
+    freq = str(rule.get("freq") or "").upper()
+    if freq not in FREQS:
+        raise RecurrenceError(f"unsupported freq: {freq or '-'}")
+
+    try:
+        interval = int(rule.get("interval") or 1)
+    except Exception:
+        raise RecurrenceError("interval must be integer")
+    if interval <= 0:
+        raise RecurrenceError("interval must be > 0")
+
+    count = rule.get("count")
+    if count is not None:
+        try:
+            count = int(count)
+        except Exception:
+            raise RecurrenceError("count must be integer")
+    if until is None:
+        until = parse_until(rule.get("until"))
+
+    byday = _parse_byday(rule.get("byday"))
+    monthdays = _int_list(rule.get("bymonthday"), "bymonthday", 1, 31)
+    months = set(_int_list(rule.get("bymonth"), "bymonth", 1, 12))
+
+    produced = 0
+    yield dtstart
+    produced += 1
+
+    scanned = 0
+    for occ in _candidates(freq, dtstart, interval, byday, monthdays, months):
+        scanned += 1
+        if scanned > max_scan:
+            return
+        if occ <= dtstart:
+            continue
+        if until is not None and occ > until:
+            return
+        if count is not None and produced >= count:
+            return
+        produced += 1
+        yield occ
@@ -8,6 +8,11 @@ from app.routes.homeworks import bp as homeworks_bp
 from app.routes.lesson_reports import bp as lesson_reports_bp
 from app.routes.packages import bp as packages_bp
 from app.routes.calendar import bp as calendar_bp
+from app.routes.reports import bp as reports_bp
+from app.routes.search import bp as search_bp
+from app.routes.me import bp as me_bp
+from app.routes.admin_overview import bp as admin_overview_bp
+from app.metrics import bp as metrics_bp
 
 
 def register_routes(app):
@@ -21,3 +26,8 @@ def register_routes(app):
     app.register_blueprint(lesson_reports_bp, url_prefix="/api/lesson-reports")
     app.register_blueprint(packages_bp, url_prefix="/api/packages")
     app.register_blueprint(calendar_bp, url_prefix="/api/calendar")
+    app.register_blueprint(reports_bp, url_prefix="/api/reports")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(me_bp, url_prefix="/api/me")
+    app.register_blueprint(admin_overview_bp, url_prefix="/api/admin/overview")
+    app.register_blueprint(metrics_bp, url_prefix="/api/metrics")
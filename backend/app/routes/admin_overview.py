@@ -0,0 +1,146 @@
+# GET /api/admin/overview?months=6&expiring_days=7 (ADMIN)
+# Yönetim paneli açılış sayıları; SPA'nın tüm listeleri indirip saymasına gerek kalmaz.
+# - Ders sayıları session_monthly_stats özet tablosundan (ay x statü; birkaç satır, ders geçmişi taranmaz)
+# - Paket / öğrenci sayıları güncel durumdur: ACTIVE paketler (status, end_date) index'i ile, öğrenciler tek aggregate
+# Toplam 3 sorgu (+ auth).
+
+from datetime import datetime, timedelta
+
+from flask import Blueprint, g, jsonify, request
+from sqlalchemy import and_, case, exists, func
+
+from app.auth.require_auth import require_auth
+from app.database import db
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.lesson_session import SessionStatus
+from app.models.package import PackageStatus, StudentPackage
+from app.models.student import Student
+from app.models.summary import SessionMonthlyStat
+from app.summaries import month_start, next_month
+
+bp = Blueprint("admin_overview", __name__)
+
+DEFAULT_MONTHS = 6
+MAX_MONTHS = 24
+DEFAULT_EXPIRING_DAYS = 7
+
+
+def bounded_int_arg(name: str, default: int, low: int, high: int):
+    raw = request.args.get(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except Exception:
+        return jsonify({"message": f"{name} must be integer"}), 400
+    if value < low or value > high:
+        return jsonify({"message": f"{name} must be between {low} and {high}"}), 400
+    return value
+
+
+def empty_counts():
+    return {**{s.value: 0 for s in SessionStatus}, "total": 0, "minutes": 0}
+
+
+def session_months(first_month: datetime, last_month: datetime):
+    """[{month, counts: {PLANNED: n, ..., total, minutes}}, ...] eskiden yeniye, boş aylar sıfırla."""
+    rows = (
+        db.session.query(
+            SessionMonthlyStat.month,
+            SessionMonthlyStat.status,
+            SessionMonthlyStat.session_count,
+            SessionMonthlyStat.total_minutes,
+            SessionMonthlyStat.refreshed_at,
+        )
+        .filter(SessionMonthlyStat.month >= first_month, SessionMonthlyStat.month <= last_month)
+        .all()
+    )
+
+    series = {}
+    month = first_month
+    while month <= last_month:
+        series[month] = empty_counts()
+        month = next_month(month)
+
+    refreshed_at = None
+    for month, status, count, minutes, refreshed in rows:
+        counts = series.get(month)
+        if counts is None:
+            continue
+        counts[status] = counts.get(status, 0) + count
+        counts["total"] += count
+        counts["minutes"] += minutes
+        if refreshed_at is None or refreshed > refreshed_at:
+            refreshed_at = refreshed
+
+    return [{"month": m, "counts": c} for m, c in series.items()], refreshed_at
+
+
+def package_overview(now: datetime, expiring_days: int):
+    active, credits, expiring = (
+        db.session.query(
+            func.count(StudentPackage.id),
+            func.coalesce(func.sum(StudentPackage.remaining_lessons), 0),
+            func.coalesce(func.sum(case(
+                (and_(StudentPackage.end_date >= now,
+                      StudentPackage.end_date < now + timedelta(days=expiring_days)), 1),
+                else_=0,
+            )), 0),
+        )
+        .filter(StudentPackage.status == PackageStatus.ACTIVE)
+        .one()
+    )
+    return {
+        "active": active,
+        "remaining_credits": int(credits),
+        "expiring_soon": int(expiring),
+        "expiring_days": expiring_days,
+    }
+
+
+def student_overview():
+    has_teacher = exists().where(
+        Enrollment.student_id == Student.id,
+        Enrollment.status == EnrollmentStatus.ACTIVE,
+    )
+    total, without_teacher = (
+        db.session.query(
+            func.count(Student.id),
+            func.coalesce(func.sum(case((~has_teacher, 1), else_=0)), 0),
+        )
+        .filter(Student.deleted_at.is_(None))
+        .one()
+    )
+    return {"total": total, "without_teacher": int(without_teacher)}
+
+
+@bp.get("")
+@require_auth
+def overview():
+    if g.role != "ADMIN":
+        return jsonify({"message": "forbidden"}), 403
+
+    months = bounded_int_arg("months", DEFAULT_MONTHS, 1, MAX_MONTHS)
+    if isinstance(months, tuple):
+        return months
+    expiring_days = bounded_int_arg("expiring_days", DEFAULT_EXPIRING_DAYS, 1, 365)
+    if isinstance(expiring_days, tuple):
+        return expiring_days
+
+    now = datetime.utcnow()
+    this_month = month_start(now)
+    first_month = this_month
+    for _ in range(months - 1):
+        first_month = month_start(first_month - timedelta(days=1))
+
+    series, refreshed_at = session_months(first_month, this_month)
+
+    return jsonify({
+        "month": this_month,
+        "sessions_this_month": series[-1]["counts"],
+        "sessions_by_month": series,
+        "packages": package_overview(now, expiring_days),
+        "students": student_overview(),
+        "stats_refreshed_at": refreshed_at,
+        "generated_at": now,
+    }), 200
@@ -14,6 +14,7 @@ from app.models.lesson_session import LessonSession
 from datetime import datetime
 from app.models.role import Role
 from app.auth.require_auth import require_auth
+from app.auth.principal import invalidate_principals
 
 bp = Blueprint("admin_students", __name__)
 
@@ -122,4 +123,6 @@ def delete_student_account(student_id: int):
         db.session.rollback()
         return jsonify({"message": "DB error", "error": str(ex)}), 400
 
+    invalidate_principals()
+
     return jsonify({"message": "student_account_deleted", "student_id": student_id}), 200
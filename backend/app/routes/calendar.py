@@ -1,57 +1,33 @@
 import os
-import urllib.request
-from datetime import datetime
-from flask import Blueprint, jsonify
+from datetime import datetime, timedelta
+from functools import partial
+from flask import Blueprint, Response, jsonify, current_app, request, g, stream_with_context
+
+from app.database import db
+from app.models.user import User
+from app.auth.require_auth import require_auth
+from app.calendar_cache import get_calendar_cache
+from app.calendar_feed import (
+    new_feed_token, feed_window, feed_query, feed_fingerprint, feed_calendar_name, generate_feed,
+)
+from app.ics import parse_calendar, expand_events, as_window_bound, resolve_tz
 
 bp = Blueprint("calendar", __name__)
 
+# ?from=&to= verilmezse: bugünden 6 ay geri, 12 ay ileri
+DEFAULT_WINDOW_BACK = timedelta(days=183)
+DEFAULT_WINDOW_AHEAD = timedelta(days=366)
+MAX_WINDOW = timedelta(days=3 * 366)
+
 
-def parse_ics_datetime(raw: str):
-    """
-    Supports formats like:
-    - 20250115T120000Z
-    - 20250115T120000
-    - 20250115
-    """
+def parse_window_arg(name: str):
+    raw = request.args.get(name)
     if not raw:
         return None
-    raw = raw.strip()
     try:
-        if "T" in raw:
-            fmt = "%Y%m%dT%H%M%S"
-            if raw.endswith("Z"):
-                raw = raw[:-1]
-            return datetime.strptime(raw, fmt)
-        return datetime.strptime(raw, "%Y%m%d")
-    except Exception:
-        return None
-
-
-def parse_ics(content: str):
-    events = []
-    current = None
-    for line in content.splitlines():
-        line = line.strip()
-        if line == "BEGIN:VEVENT":
-            current = {}
-        elif line == "END:VEVENT":
-            if current:
-                events.append(current)
-            current = None
-        elif current is not None:
-            if line.startswith("SUMMARY:"):
-                current["summary"] = line.split(":", 1)[1]
-            elif line.startswith("DTSTART"):
-                raw = line.split(":", 1)[1] if ":" in line else ""
-                dt = parse_ics_datetime(raw)
-                current["start"] = dt.isoformat() if dt else None
-            elif line.startswith("DTEND"):
-                raw = line.split(":", 1)[1] if ":" in line else ""
-                dt = parse_ics_datetime(raw)
-                current["end"] = dt.isoformat() if dt else None
-            elif line.startswith("LOCATION:"):
-                current["location"] = line.split(":", 1)[1]
-    return events
+        return datetime.fromisoformat(raw.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return jsonify({"message": f"invalid {name}", "expected": "ISO date or datetime"}), 400
 
 
 @bp.get("/public-calendar")
@@ -60,10 +36,144 @@ def public_calendar():
     if not url:
         return jsonify({"message": "CALENDAR_ICS_URL is not set", "items": []}), 200
 
+    cfg = current_app.config
+    default_tz = resolve_tz(cfg.get("CALENDAR_TZ"))
+
+    start = parse_window_arg("from")
+    if isinstance(start, tuple):
+        return start
+    end = parse_window_arg("to")
+    if isinstance(end, tuple):
+        return end
+
+    now = datetime.now(default_tz) if default_tz else datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    span = DEFAULT_WINDOW_BACK + DEFAULT_WINDOW_AHEAD
+    if start is None and end is None:
+        start, end = today - DEFAULT_WINDOW_BACK, today + DEFAULT_WINDOW_AHEAD
+    elif start is None:
+        start = end - span
+    elif end is None:
+        end = start + span
+
+    # upstream'e her istekte gitmiyoruz: son başarılı parse cache'ten, yenileme arka planda (app/calendar_cache.py)
+    cache = get_calendar_cache(
+        url,
+        partial(parse_calendar, default_tz=default_tz),
+        ttl_sec=cfg.get("CALENDAR_CACHE_TTL_SEC", 300),
+        timeout_sec=cfg.get("CALENDAR_FETCH_TIMEOUT_SEC", 10),
+        retry_sec=cfg.get("CALENDAR_RETRY_SEC", 30),
+        cold_wait_sec=cfg.get("CALENDAR_COLD_WAIT_SEC", 2),
+    )
+    snap = cache.get()
+    cal = snap["data"]
+
+    # naive from/to: takvimin varsayılan diliminde
+    window_tz = cal.default_tz if cal is not None and cal.default_tz else default_tz
+    start = as_window_bound(start, window_tz)
+    end = as_window_bound(end, window_tz)
+    if end <= start:
+        return jsonify({"message": "to must be after from"}), 400
+    if end - start > MAX_WINDOW:
+        return jsonify({"message": "window too large", "max_days": MAX_WINDOW.days}), 400
+
+    body = {
+        "items": expand_events(cal, start, end) if cal is not None else [],
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "cache": {
+            "age_sec": snap["age_sec"],
+            "fetched_at": snap["fetched_at"],
+            "stale": snap["stale"],
+        },
+    }
+    if snap["error"]:
+        body["message"] = "calendar_fetch_failed"
+        body["error"] = snap["error"]
+
+    resp = jsonify(body)
+    if snap["age_sec"] is not None:
+        resp.headers["Age"] = str(int(snap["age_sec"]))
+    return resp, 200
+
+
+# ---------- kişisel .ics abonelik feed'i ----------
+def feed_url(token: str) -> str:
+    return f"{request.host_url.rstrip('/')}/api/calendar/feeds/{token}.ics"
+
+
+def feed_token_response(user: User):
+    token = user.calendar_feed_token
+    return jsonify({"token": token, "url": feed_url(token) if token else None}), 200
+
+
+@bp.get("/feed")
+@require_auth
+def get_feed_token():
+    user = User.query.get(g.user_id)
+    return feed_token_response(user)
+
+
+@bp.post("/feed")
+@require_auth
+def rotate_feed_token():
+    """Yeni token üretir; varsa eski abonelik linki geçersiz olur."""
+    user = User.query.get(g.user_id)
+    user.calendar_feed_token = new_feed_token()
+    try:
+        db.session.commit()
+    except Exception as ex:
+        db.session.rollback()
+        return jsonify({"message": "DB error", "error": str(ex)}), 400
+    return feed_token_response(user)
+
+
+@bp.delete("/feed")
+@require_auth
+def revoke_feed_token():
+    user = User.query.get(g.user_id)
+    user.calendar_feed_token = None
     try:
-        with urllib.request.urlopen(url, timeout=10) as resp:
-            data = resp.read().decode("utf-8", errors="ignore")
-        items = parse_ics(data)
-        return jsonify({"items": items}), 200
+        db.session.commit()
     except Exception as ex:
-        return jsonify({"message": "calendar_fetch_failed", "error": str(ex), "items": []}), 200
+        db.session.rollback()
+        return jsonify({"message": "DB error", "error": str(ex)}), 400
+    return feed_token_response(user)
+
+
+@bp.get("/feeds/<token>.ics")
+def lesson_feed(token: str):
+    user = User.query.filter_by(calendar_feed_token=token).first() if token else None
+    if not user or not user.is_active or user.deleted_at is not None:
+        return jsonify({"message": "feed not found"}), 404
+
+    role = user.role.key if user.role else None
+    cfg = current_app.config
+    window_start, window_end = feed_window(
+        int(cfg.get("CALENDAR_FEED_PAST_DAYS", 30)),
+        int(cfg.get("CALENDAR_FEED_FUTURE_DAYS", 180)),
+    )
+    q = feed_query(user, role, window_start, window_end)
+    if q is None:
+        return jsonify({"message": "feed not found"}), 404
+
+    etag, last_modified = feed_fingerprint(q, user, window_start)
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        ims = request.if_modified_since
+        not_modified = ims is not None and ims.replace(tzinfo=None) >= last_modified
+
+    headers = {"Cache-Control": "private, max-age=300"}
+    if not_modified:
+        resp = Response(status=304, headers=headers)
+    else:
+        resp = Response(
+            stream_with_context(generate_feed(q, role, feed_calendar_name(user))),
+            content_type="text/calendar; charset=utf-8",
+            headers={**headers, "Content-Disposition": 'inline; filename="odak-dersler.ics"'},
+        )
+    resp.set_etag(etag, weak=True)
+    resp.last_modified = last_modified
+    return resp
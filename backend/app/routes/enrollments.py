@@ -1,11 +1,17 @@
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 
 from app.database import db
 from app.models.enrollment import Enrollment, EnrollmentStatus
-from app.models.student import Student
 from app.models.user import User
+from app.models.student import Student
 from app.auth.require_auth import require_auth
+from app.auth.principal import invalidate_principals
+from app.pagination import paginate
+from app.projection import parse_fields, apply_fields
+from app.etag import conditional
 
 bp = Blueprint("enrollments", __name__)
 
@@ -13,28 +19,65 @@ ALLOWED_STATUS = {s.value for s in EnrollmentStatus}  # {"ACTIVE","PASSIVE"}
 
 
 def get_my_student_profile():
-    # Student.user_id = users.id (öğrenci login)
-    return Student.query.filter_by(user_id=g.user_id).first()
+    # Student.user_id = users.id (öğrenci login) -> require_auth'un principal'ından, ekstra sorgu yok
+    return g.principal.student
+
+
+# ?expand=teacher,student -> gömülü özetler; tek JOIN'li sorgudan gelir (satır başına User.query.get yok)
+Teacher = aliased(User)
+EXPANDABLE = {
+    "teacher": (Teacher, ("id", "full_name", "email")),
+    "student": (Student, ("id", "full_name", "grade")),
+}
+
+
+def parse_expand(default=()):
+    """?expand=teacher,student -> ["teacher", "student"] (EXPANDABLE sırasıyla) ya da (jsonify, 400)."""
+    raw = request.args.get("expand")
+    if raw is None:
+        wanted = list(default)
+    else:
+        wanted = [x.strip().lower() for x in raw.split(",") if x.strip()]
+        unknown = [x for x in wanted if x not in EXPANDABLE]
+        if unknown:
+            return jsonify({"message": "invalid expand", "unknown": unknown, "allowed": list(EXPANDABLE)}), 400
+    return [name for name in EXPANDABLE if name in wanted]
+
 
+def expand_joins(q, expand):
+    """Özet tablolarını LEFT JOIN'le (kolon eklemeden; ETag sorgusu da bunu kullanır)."""
+    if "teacher" in expand:
+        q = q.outerjoin(Teacher, Teacher.id == Enrollment.teacher_user_id)
+    if "student" in expand:
+        q = q.outerjoin(Student, Student.id == Enrollment.student_id)
+    return q
 
-def teacher_summary(user_id: int):
-    if not user_id:
-        return None
-    u = User.query.get(user_id)
-    if not u:
-        return None
-    return {
-        "id": u.id,
-        "full_name": u.full_name,
-        "email": u.email,
-    }
 
+def expand_columns(expand):
+    cols = []
+    for name in expand:
+        entity, names = EXPANDABLE[name]
+        cols.extend(getattr(entity, n) for n in names)
+    return cols
 
-def enrollment_to_dict(e: Enrollment, include_teacher: bool = False):
-    data = e.to_dict()
-    if include_teacher:
-        data["teacher"] = teacher_summary(e.teacher_user_id)
-    return data
+
+def enrollment_row_serializer(expand, fields=None):
+    """expand yoksa satır Enrollment, varsa (Enrollment, özet kolonları...) Row."""
+    if not expand:
+        return lambda e: e.to_dict(fields)
+
+    layout = [(name, EXPANDABLE[name][1]) for name in expand]
+
+    def serialize(row):
+        data = row[0].to_dict(fields)
+        i = 1
+        for name, names in layout:
+            values = row[i:i + len(names)]
+            i += len(names)
+            # LEFT JOIN eşleşmediyse (silinmiş kayıt) None
+            data[name] = dict(zip(names, values)) if values[0] is not None else None
+        return data
+    return serialize
 
 
 @bp.get("/")
@@ -62,11 +105,7 @@ def list_enrollments():
 
         if student_id:
             # teacher kendi öğrencisi değilse açıkça forbidden dönelim
-            ok = Enrollment.query.filter_by(
-                teacher_user_id=g.user_id,
-                student_id=student_id
-            ).first()
-            if not ok:
+            if not g.principal.teaches(student_id, active_only=False):
                 return jsonify({"message": "forbidden_student"}), 403
             q = q.filter(Enrollment.student_id == student_id)
 
@@ -81,10 +120,10 @@ def list_enrollments():
             return jsonify({"message": "forbidden_student"}), 403
 
         if teacher_user_id:
-            my = Enrollment.query.filter_by(student_id=me.id).first()
+            my = g.principal.my_enrollment()
             if not my:
                 return jsonify({"message": "teacher_not_assigned"}), 409
-            if teacher_user_id != my.teacher_user_id:
+            if teacher_user_id != my[0]:
                 return jsonify({"message": "forbidden_teacher"}), 403
             q = q.filter(Enrollment.teacher_user_id == teacher_user_id)
 
@@ -101,9 +140,28 @@ def list_enrollments():
     else:
         q = q.filter(Enrollment.status == EnrollmentStatus.ACTIVE)
 
-    enrollments = q.order_by(Enrollment.id.desc()).all()
-    include_teacher = g.role == "STUDENT"
-    return jsonify([enrollment_to_dict(e, include_teacher=include_teacher) for e in enrollments]), 200
+    fields = parse_fields(Enrollment)
+    if isinstance(fields, tuple):
+        return fields
+
+    # STUDENT'a teacher özeti eskiden beri hep dönüyor (geriye uyum); diğer roller ?expand= ile ister
+    expand = parse_expand(default=["teacher"] if g.role == "STUDENT" else ())
+    if isinstance(expand, tuple):
+        return expand
+
+    joined = expand_joins(q, expand)
+    # özetler users / students tablosundan -> ad/email değişince ETag de değişsin
+    extra = [func.max(EXPANDABLE[name][0].updated_at) for name in expand]
+
+    return conditional(
+        joined, Enrollment,
+        lambda: paginate(
+            apply_fields(joined.add_columns(*expand_columns(expand)), Enrollment, fields),
+            [Enrollment.id],
+            enrollment_row_serializer(expand, fields),
+        ),
+        extra=extra,
+    )
 
 
 @bp.get("/<int:enrollment_id>")
@@ -127,8 +185,19 @@ def get_enrollment(enrollment_id: int):
     else:
         return jsonify({"message": "forbidden"}), 403
 
-    include_teacher = g.role == "STUDENT"
-    return jsonify(enrollment_to_dict(e, include_teacher=include_teacher)), 200
+    expand = parse_expand(default=["teacher"] if g.role == "STUDENT" else ())
+    if isinstance(expand, tuple):
+        return expand
+    if not expand:
+        return jsonify(e.to_dict()), 200
+
+    row = (
+        expand_joins(db.session.query(Enrollment), expand)
+        .add_columns(*expand_columns(expand))
+        .filter(Enrollment.id == e.id)
+        .one()
+    )
+    return jsonify(enrollment_row_serializer(expand)(row)), 200
 
 
 @bp.post("/")
@@ -169,6 +238,7 @@ def create_enrollment():
         except Exception as ex:
             db.session.rollback()
             return jsonify({"message": "DB error", "error": str(ex)}), 400
+        invalidate_principals()
         return jsonify(existing.to_dict()), 200
 
     e = Enrollment(student_id=student_id, teacher_user_id=teacher_user_id, status=status_enum)
@@ -183,6 +253,7 @@ def create_enrollment():
         db.session.rollback()
         return jsonify({"message": "DB error", "error": str(ex)}), 400
 
+    invalidate_principals()
     return jsonify(e.to_dict()), 201
 
 
@@ -216,6 +287,7 @@ def update_enrollment(enrollment_id: int):
         db.session.rollback()
         return jsonify({"message": "DB error", "error": str(ex)}), 400
 
+    invalidate_principals()
     return jsonify(e.to_dict()), 200
 
 
@@ -237,4 +309,5 @@ def delete_enrollment(enrollment_id: int):
         db.session.rollback()
         return jsonify({"message": "DB error", "error": str(ex)}), 400
 
+    invalidate_principals()
     return jsonify({"message": "Enrollment soft-deleted (PASSIVE)", "enrollment": e.to_dict()}), 200
@@ -1,21 +1,28 @@
 from datetime import datetime
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import and_, case, func, insert
+
 from app.database import db
 from app.models.homework import Homework, HomeworkStatus
-from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.models.student import Student
+from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.auth.require_auth import require_auth
+from app.pagination import paginate
+from app.projection import parse_fields, apply_fields
+from app.routes.lesson_sessions import parse_enum, parse_iso_datetime
+from app.search import reindex
 
 bp = Blueprint("homeworks", __name__)
 
+MAX_BULK_STUDENTS = 200
+
 
 def get_my_student_profile():
-    return Student.query.filter_by(user_id=g.user_id).first()
+    return g.principal.student
 
 
-@bp.get("/")
-@require_auth
-def list_homeworks():
+def scoped_homeworks():
+    """Role göre kapsanmış query (+ ?student_id=) ya da (jsonify, 4xx)."""
     student_id = request.args.get("student_id", type=int)
     q = Homework.query
 
@@ -25,12 +32,7 @@ def list_homeworks():
     elif g.role == "TEACHER":
         q = q.filter(Homework.teacher_user_id == g.user_id)
         if student_id:
-            ok = Enrollment.query.filter_by(
-                teacher_user_id=g.user_id,
-                student_id=student_id,
-                status=EnrollmentStatus.ACTIVE
-            ).first()
-            if not ok:
+            if not g.principal.teaches(student_id):
                 return jsonify({"message": "forbidden_student"}), 403
             q = q.filter(Homework.student_id == student_id)
     elif g.role == "STUDENT":
@@ -40,9 +42,125 @@ def list_homeworks():
         q = q.filter(Homework.student_id == me.id)
     else:
         return jsonify({"message": "forbidden"}), 403
+    return q
+
+
+def parse_statuses(raw):
+    """?status=ASSIGNED,SUBMITTED -> [HomeworkStatus, ...] ya da (jsonify, 400)."""
+    statuses = []
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        parsed = parse_enum(HomeworkStatus, part, "status")
+        if isinstance(parsed, tuple):
+            return parsed
+        statuses.append(parsed)
+    return statuses
+
+
+def overdue_filter(now: datetime):
+    # teslim tarihi geçmiş ve hâlâ teslim edilmemiş
+    return and_(Homework.status == HomeworkStatus.ASSIGNED, Homework.due_date < now)
+
+
+def apply_homework_filters(q, now: datetime, with_status: bool = True):
+    """
+    ?status= (virgülle birden fazla), ?due_after= / ?due_before= ([after, before)), ?overdue=1
+    (student_id, status, due_date) ve (teacher_user_id, status, created_at) index'leri ile range scan.
+    """
+    if with_status and request.args.get("status"):
+        statuses = parse_statuses(request.args["status"])
+        if isinstance(statuses, tuple):
+            return statuses
+        if statuses:
+            q = q.filter(Homework.status.in_(statuses))
+
+    due_after = parse_iso_datetime(request.args.get("due_after"), "due_after")
+    if isinstance(due_after, tuple):
+        return due_after
+    due_before = parse_iso_datetime(request.args.get("due_before"), "due_before")
+    if isinstance(due_before, tuple):
+        return due_before
+    if due_after and due_before and due_after >= due_before:
+        return jsonify({"message": "due_after must be before due_before"}), 400
+    if due_after:
+        q = q.filter(Homework.due_date >= due_after)
+    if due_before:
+        q = q.filter(Homework.due_date < due_before)
+
+    overdue = (request.args.get("overdue") or "").strip().lower()
+    if overdue in {"1", "true", "yes"}:
+        q = q.filter(overdue_filter(now))
+    elif overdue not in {"", "0", "false", "no"}:
+        return jsonify({"message": "overdue must be 0 or 1"}), 400
+    return q
+
+
+@bp.get("/")
+@require_auth
+def list_homeworks():
+    q = scoped_homeworks()
+    if isinstance(q, tuple):
+        return q
+    q = apply_homework_filters(q, datetime.utcnow())
+    if isinstance(q, tuple):
+        return q
+
+    fields = parse_fields(Homework)
+    if isinstance(fields, tuple):
+        return fields
+    q = apply_fields(q, Homework, fields, extra=["created_at"])
+
+    return paginate(q, [Homework.created_at, Homework.id], lambda h: h.to_dict(fields))
+
+
+@bp.get("/summary")
+@require_auth
+def homework_summary():
+    """
+    Statü başına sayı + gecikmiş ödev sayısı (tek GROUP BY). Liste ile aynı kapsam ve filtreler (?status= hariç).
+    {"ASSIGNED": n, "SUBMITTED": n, "GRADED": n, "total": n, "overdue": n}
+    """
+    q = scoped_homeworks()
+    if isinstance(q, tuple):
+        return q
+    now = datetime.utcnow()
+    q = apply_homework_filters(q, now, with_status=False)
+    if isinstance(q, tuple):
+        return q
+
+    rows = (
+        q.with_entities(
+            Homework.status,
+            func.count(Homework.id),
+            func.coalesce(func.sum(case((overdue_filter(now), 1), else_=0)), 0),
+        )
+        .group_by(Homework.status)
+        .order_by(None)
+        .all()
+    )
+    out = {s.value: 0 for s in HomeworkStatus}
+    for status, count, _ in rows:
+        out[status.value] = count
+    out["total"] = sum(count for _, count, _ in rows)
+    out["overdue"] = sum(int(overdue) for _, _, overdue in rows)
+    return jsonify(out), 200
+
+
+def parse_homework_fields(data):
+    """title / description / due_date -> dict ya da (jsonify, 400). Tekli ve toplu oluşturma ortak."""
+    title = (data.get("title") or "").strip()
+    if not title:
+        return jsonify({"message": "title zorunlu"}), 400
+
+    parsed_due = None
+    if data.get("due_date"):
+        try:
+            parsed_due = datetime.fromisoformat(str(data.get("due_date")))
+        except Exception:
+            return jsonify({"message": "due_date must be ISO format"}), 400
 
-    items = q.order_by(Homework.created_at.desc()).all()
-    return jsonify([h.to_dict() for h in items]), 200
+    return {"title": title, "description": data.get("description"), "due_date": parsed_due}
 
 
 @bp.post("/")
@@ -53,14 +171,12 @@ def create_homework():
 
     data = request.get_json(silent=True) or {}
     student_id = data.get("student_id")
-    title = (data.get("title") or "").strip()
-    description = data.get("description")
-    due_date = data.get("due_date")
 
     if not student_id:
         return jsonify({"message": "student_id zorunlu"}), 400
-    if not title:
-        return jsonify({"message": "title zorunlu"}), 400
+    fields = parse_homework_fields(data)
+    if isinstance(fields, tuple):
+        return fields
 
     try:
         student_id = int(student_id)
@@ -69,28 +185,14 @@ def create_homework():
 
     # teacher sadece kendi öğrencisine ödev verir
     if g.role == "TEACHER":
-        ok = Enrollment.query.filter_by(
-            teacher_user_id=g.user_id,
-            student_id=student_id,
-            status=EnrollmentStatus.ACTIVE
-        ).first()
-        if not ok:
+        if not g.principal.teaches(student_id):
             return jsonify({"message": "forbidden_student"}), 403
 
-    parsed_due = None
-    if due_date:
-        try:
-            parsed_due = datetime.fromisoformat(str(due_date))
-        except Exception:
-            return jsonify({"message": "due_date must be ISO format"}), 400
-
     h = Homework(
         student_id=student_id,
         teacher_user_id=g.user_id,
-        title=title,
-        description=description,
-        due_date=parsed_due,
         status=HomeworkStatus.ASSIGNED,
+        **fields,
     )
 
     try:
@@ -103,6 +205,96 @@ def create_homework():
     return jsonify(h.to_dict()), 201
 
 
+def assignable_student_ids(student_ids=None):
+    """
+    İstek sahibinin ödev verebileceği (silinmemiş) öğrenciler — tek sorgu.
+    TEACHER: ACTIVE enrollment'ı olanlar, ADMIN: tümü. student_ids verilirse IN ile o küme içinde.
+    """
+    q = db.session.query(Student.id).filter(Student.deleted_at.is_(None))
+    if g.role == "TEACHER":
+        q = q.join(Enrollment, Enrollment.student_id == Student.id).filter(
+            Enrollment.teacher_user_id == g.user_id,
+            Enrollment.status == EnrollmentStatus.ACTIVE,
+        )
+    if student_ids is not None:
+        q = q.filter(Student.id.in_(student_ids))
+    return {sid for (sid,) in q}
+
+
+@bp.post("/bulk")
+@require_auth
+def bulk_create_homeworks():
+    """
+    Aynı ödevi birden fazla öğrenciye ver.
+    Body: {"title", "description"?, "due_date"?, "student_ids": [..]}  ya da  {"all_active_students": true} (TEACHER)
+    Tüm küme tek IN sorgusuyla doğrulanır; yetkisiz / bulunamayan öğrenci varsa hiçbir ödev oluşturulmaz (403).
+    Tek multi-row INSERT ... RETURNING, tek commit.
+    """
+    if g.role not in {"ADMIN", "TEACHER"}:
+        return jsonify({"message": "forbidden"}), 403
+
+    data = request.get_json(silent=True) or {}
+    fields = parse_homework_fields(data)
+    if isinstance(fields, tuple):
+        return fields
+
+    all_active = data.get("all_active_students") is True
+    raw_ids = data.get("student_ids")
+
+    if all_active:
+        if g.role != "TEACHER":
+            return jsonify({"message": "all_active_students is only for TEACHER"}), 400
+        if raw_ids:
+            return jsonify({"message": "student_ids and all_active_students cannot be used together"}), 400
+        student_ids = sorted(assignable_student_ids())
+        if not student_ids:
+            return jsonify({"message": "no active students"}), 400
+    else:
+        if not isinstance(raw_ids, list) or not raw_ids:
+            return jsonify({"message": "student_ids zorunlu (liste)"}), 400
+        try:
+            student_ids = sorted({int(x) for x in raw_ids})
+        except Exception:
+            return jsonify({"message": "student_ids must be integers"}), 400
+
+    if len(student_ids) > MAX_BULK_STUDENTS:
+        return jsonify({"message": f"en fazla {MAX_BULK_STUDENTS} öğrenci"}), 400
+
+    if not all_active:
+        allowed = assignable_student_ids(student_ids)
+        denied = [sid for sid in student_ids if sid not in allowed]
+        if denied:
+            return jsonify({"message": "forbidden_student", "student_ids": denied}), 403
+
+    rows = [
+        {
+            "student_id": sid,
+            "teacher_user_id": g.user_id,
+            "status": HomeworkStatus.ASSIGNED,
+            **fields,
+        }
+        for sid in student_ids
+    ]
+
+    try:
+        created = db.session.scalars(
+            insert(Homework).returning(Homework, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        # ORM bulk insert flush'tan geçmez: arama index'i aynı transaction'da
+        reindex(Homework, [h.id for h in created], db.session.connection())
+        db.session.commit()
+    except Exception as ex:
+        db.session.rollback()
+        return jsonify({"message": "DB error", "error": str(ex)}), 400
+
+    return jsonify({
+        "created": len(created),
+        "student_ids": student_ids,
+        "items": [h.to_dict() for h in created],
+    }), 201
+
+
 @bp.patch("/<int:homework_id>")
 @require_auth
 def update_homework(homework_id: int):
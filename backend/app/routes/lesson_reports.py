@@ -2,9 +2,11 @@ from flask import Blueprint, request, jsonify, g
 from app.database import db
 from app.models.lesson_report import LessonReport
 from app.models.lesson_session import LessonSession
-from app.models.enrollment import Enrollment, EnrollmentStatus
-from app.models.student import Student
 from app.auth.require_auth import require_auth
+from app.pagination import paginate
+from app.projection import parse_fields, apply_fields
+from app.routes.lesson_sessions import parse_iso_datetime
+from app.serialization import enum_value, http_datetime
 
 bp = Blueprint("lesson_reports", __name__)
 
@@ -13,22 +15,100 @@ def can_access_student(student_id: int):
     if g.role == "ADMIN":
         return True
     if g.role == "TEACHER":
-        ok = Enrollment.query.filter_by(
-            teacher_user_id=g.user_id,
-            student_id=student_id,
-            status=EnrollmentStatus.ACTIVE
-        ).first()
-        return bool(ok)
+        return g.principal.teaches(student_id)
     if g.role == "STUDENT":
         return False
     return False
 
 
+# ?expand=session -> dersin tarih / konu / statüsü aynı SELECT'te (JOIN), ayrıca ders isteği gerekmez
+SESSION_SUMMARY = (
+    ("id", None),
+    ("scheduled_start", http_datetime),
+    ("duration_min", None),
+    ("topic", None),
+    ("mode", enum_value),
+    ("status", enum_value),
+)
+EXPANDABLE = ("session",)
+
+
+def parse_expand():
+    raw = request.args.get("expand") or ""
+    wanted = [x.strip().lower() for x in raw.split(",") if x.strip()]
+    unknown = [x for x in wanted if x not in EXPANDABLE]
+    if unknown:
+        return jsonify({"message": "invalid expand", "unknown": unknown, "allowed": list(EXPANDABLE)}), 400
+    return wanted
+
+
+def parse_rating(name: str):
+    raw = request.args.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        value = int(raw)
+    except Exception:
+        return jsonify({"message": f"{name} must be integer"}), 400
+    if value < 1 or value > 5:
+        return jsonify({"message": f"{name} 1-5 olmalı"}), 400
+    return value
+
+
+def parse_session_range():
+    """?from= / ?to= dersin scheduled_start'ı için [from, to) -> {"from", "to"} ya da (jsonify, 400)."""
+    date_from = parse_iso_datetime(request.args.get("from"), "from")
+    if isinstance(date_from, tuple):
+        return date_from
+    date_to = parse_iso_datetime(request.args.get("to"), "to")
+    if isinstance(date_to, tuple):
+        return date_to
+    if date_from and date_to and date_from >= date_to:
+        return jsonify({"message": "from must be before to"}), 400
+    return {"from": date_from, "to": date_to}
+
+
+def apply_report_filters(q, date_from=None, date_to=None):
+    """?performance_rating= / ?min_rating= / ?max_rating= ve ders tarih aralığı (lesson_sessions JOIN'li query)."""
+    rating = LessonReport.performance_rating
+    for name, cond in (
+        ("performance_rating", lambda v: rating == v),
+        ("min_rating", lambda v: rating >= v),
+        ("max_rating", lambda v: rating <= v),
+    ):
+        value = parse_rating(name)
+        if isinstance(value, tuple):
+            return value
+        if value is not None:
+            q = q.filter(cond(value))
+
+    if date_from:
+        q = q.filter(LessonSession.scheduled_start >= date_from)
+    if date_to:
+        q = q.filter(LessonSession.scheduled_start < date_to)
+    return q
+
+
+def report_row_serializer(expand, fields):
+    if "session" not in expand:
+        return lambda r: r.to_dict(fields)
+
+    def serialize(row):
+        data = row[0].to_dict(fields)
+        data["session"] = {
+            name: (conv(v) if conv is not None and v is not None else v)
+            for (name, conv), v in zip(SESSION_SUMMARY, row[1:])
+        }
+        return data
+    return serialize
+
+
 @bp.get("/")
 @require_auth
 def list_reports():
     student_id = request.args.get("student_id", type=int)
     session_id = request.args.get("lesson_session_id", type=int)
+    teacher_user_id = request.args.get("teacher_user_id", type=int)
 
     q = LessonReport.query
 
@@ -37,22 +117,56 @@ def list_reports():
             q = q.filter(LessonReport.student_id == student_id)
         if session_id:
             q = q.filter(LessonReport.lesson_session_id == session_id)
+        if teacher_user_id:
+            q = q.filter(LessonReport.teacher_user_id == teacher_user_id)
     elif g.role == "TEACHER":
         q = q.filter(LessonReport.teacher_user_id == g.user_id)
+        if teacher_user_id and teacher_user_id != g.user_id:
+            return jsonify({"message": "forbidden_filter"}), 403
         if student_id:
             if not can_access_student(student_id):
                 return jsonify({"message": "forbidden_student"}), 403
             q = q.filter(LessonReport.student_id == student_id)
+        if session_id:
+            q = q.filter(LessonReport.lesson_session_id == session_id)
     elif g.role == "STUDENT":
-        me = Student.query.filter_by(user_id=g.user_id).first()
+        me = g.principal.student
         if not me:
             return jsonify({"message": "student_profile_not_found"}), 404
         q = q.filter(LessonReport.student_id == me.id)
+        if student_id and student_id != me.id:
+            return jsonify({"message": "forbidden_student"}), 403
+        # kendi raporları içinde daraltma (öğretmen değişmiş olabilir)
+        if teacher_user_id:
+            q = q.filter(LessonReport.teacher_user_id == teacher_user_id)
+        if session_id:
+            q = q.filter(LessonReport.lesson_session_id == session_id)
     else:
         return jsonify({"message": "forbidden"}), 403
 
-    reports = q.order_by(LessonReport.created_at.desc()).all()
-    return jsonify([r.to_dict() for r in reports]), 200
+    expand = parse_expand()
+    if isinstance(expand, tuple):
+        return expand
+    session_range = parse_session_range()
+    if isinstance(session_range, tuple):
+        return session_range
+
+    # ders tarihi filtresi ya da ?expand=session: lesson_sessions tek JOIN (rapor her zaman bir derse bağlı)
+    if "session" in expand or session_range["from"] or session_range["to"]:
+        q = q.join(LessonSession, LessonSession.id == LessonReport.lesson_session_id)
+    q = apply_report_filters(q, session_range["from"], session_range["to"])
+    if isinstance(q, tuple):
+        return q
+
+    fields = parse_fields(LessonReport)
+    if isinstance(fields, tuple):
+        return fields
+    q = apply_fields(q, LessonReport, fields, extra=["created_at"])
+
+    if "session" in expand:
+        q = q.add_columns(*[getattr(LessonSession, name) for name, _ in SESSION_SUMMARY])
+
+    return paginate(q, [LessonReport.created_at, LessonReport.id], report_row_serializer(expand, fields))
 
 
 @bp.post("/")
@@ -4,22 +4,40 @@
 # Teacher-mark ve student-mark ile iki taraflı doğrulama var; ikisi de onaylayınca ders COMPLETED oluyor ve ders hakkı düşürülüyor.
 # Cancel endpoint’inde öğrenci 2 saat kala iptal ederse hak düşüyor, öğretmen iptal ederse düşmüyor. 
 # Status geçişleri de state-machine gibi allowed transitions ile kontrol ediliyor.
+# Aynı öğretmen veya öğrenci için zamanı çakışan dersler (oluşturma, erteleme, toplu oluşturma) 409 schedule_conflict ile reddediliyor.
 
 
-from datetime import datetime, timedelta
+from bisect import bisect_right, insort
+from datetime import datetime, timedelta, timezone
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import insert, update, select, case, cast, func, literal, or_
 from sqlalchemy.exc import IntegrityError
 
 from app.database import db
-from app.models.lesson_session import LessonSession, SessionMode, SessionStatus
+from app.models.lesson_session import MAX_DURATION_MIN, LessonSession, SessionMode, SessionStatus
 from app.models.lesson_report import LessonReport
 from app.models.package import StudentPackage, PackageStatus
 from app.models.student import Student
+from app.models.user import User
 from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.auth.require_auth import require_auth
+from app.pagination import paginate
+from app.projection import parse_fields, apply_fields
+from app.etag import conditional
+from app.recurrence import expand_recurrence, RecurrenceError
+from app.search import reindex
+from app.summaries import add_session_delta, apply_session_deltas
 
 bp = Blueprint("lesson_sessions", __name__)
 
+MAX_BULK_OCCURRENCES = 100
+
+# Çakışma sorgusunun alt sınırı bu değere dayanıyor; daha uzun ders kabul edilmez (DB'de CHECK constraint).
+MAX_SESSION_DURATION_MIN = MAX_DURATION_MIN
+
+# Takvimde yer tutan statüler (CANCELLED / MISSED yer tutmaz)
+BLOCKING_STATUSES = (SessionStatus.PLANNED, SessionStatus.PENDING_CONFIRMATION, SessionStatus.COMPLETED)
+
 
 # ---------- helpers ----------
 def parse_enum(enum_cls, raw, field_name: str):
@@ -50,22 +68,29 @@ def parse_iso_datetime(raw, field_name: str, required: bool = False):
             return jsonify({"message": f"{field_name} zorunlu"}), 400
         return None
     try:
-        return datetime.fromisoformat(str(raw))
+        parsed = datetime.fromisoformat(str(raw))
     except Exception:
         return jsonify({
             "message": f"{field_name} must be ISO format (örn: 2026-01-29T15:00:00)"
         }), 400
+    # DB'deki tarihler naive UTC; offset'li girdi (2026-03-01T15:00:00+03:00) UTC'ye çevrilip naive yapılır
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
 
 
 def get_my_student_profile():
     """
-    STUDENT kullanıcısının Student kaydı.
-    Senin schema: students.client_user_id -> users.id
+    STUDENT kullanıcısının Student kaydı (id, deleted_at).
+    require_auth'un principal'ından gelir, ekstra sorgu yok.
     """
-    return Student.query.filter_by(user_id=g.user_id).first()
+    return g.principal.student
 
 
 def enrollment_teacher_for_student(student_id: int):
+    # sadece istek sahibi öğrencinin kendi ataması principal'da hazır
+    if student_id == g.principal.student_id:
+        return g.principal.my_active_teacher_user_id()
     e = Enrollment.query.filter_by(student_id=student_id, status=EnrollmentStatus.ACTIVE).first()
     return e.teacher_user_id if e else None
 
@@ -85,29 +110,186 @@ def recalc_status(s: LessonSession) -> SessionStatus:
     return SessionStatus.PLANNED
 
 
+def package_status_literal(status: PackageStatus):
+    return literal(status, type_=StudentPackage.__table__.c.status.type)
+
+
+def remaining_credits(student_id: int) -> int:
+    """consume_lesson_credit'in düşebileceği paketlerdeki (ACTIVE, süresi geçmemiş) toplam kalan ders: tek SUM."""
+    now = datetime.utcnow()
+    return db.session.execute(
+        select(func.coalesce(func.sum(StudentPackage.remaining_lessons), 0)).where(
+            StudentPackage.student_id == student_id,
+            StudentPackage.status == PackageStatus.ACTIVE,
+            StudentPackage.remaining_lessons > 0,
+            or_(StudentPackage.end_date.is_(None), StudentPackage.end_date >= now),
+        )
+    ).scalar()
+
+
 def consume_lesson_credit(student_id: int) -> bool:
-    sp = StudentPackage.query.filter_by(student_id=student_id, status=PackageStatus.ACTIVE).order_by(StudentPackage.id.desc()).first()
-    if not sp:
-        return False
-    if sp.end_date and sp.end_date < datetime.utcnow():
-        sp.status = PackageStatus.EXPIRED
-        db.session.commit()
-        return False
-    if sp.remaining_lessons <= 0:
-        sp.status = PackageStatus.USED_UP
-        db.session.commit()
-        return False
-    sp.remaining_lessons -= 1
-    if sp.remaining_lessons <= 0:
-        sp.status = PackageStatus.USED_UP
-    db.session.commit()
-    return True
+    """
+    Öğrencinin en yeni, süresi geçmemiş ve hakkı kalan ACTIVE paketinden 1 ders düşer.
+    Tek koşullu UPDATE ... RETURNING: decrement + (son hak ise) USED_UP aynı statement'ta,
+    hedef satır FOR UPDATE ile kilitlenir -> eşzamanlı istekler hak kaybettirmez / fazla düşmez.
+    Commit etmez; çağıran request tek commit atar.
+    """
+    now = datetime.utcnow()
+    target_id = (
+        select(StudentPackage.id)
+        .where(
+            StudentPackage.student_id == student_id,
+            StudentPackage.status == PackageStatus.ACTIVE,
+            StudentPackage.remaining_lessons > 0,
+            or_(StudentPackage.end_date.is_(None), StudentPackage.end_date >= now),
+        )
+        .order_by(StudentPackage.id.desc())
+        .limit(1)
+        .with_for_update()
+        .scalar_subquery()
+    )
+    stmt = (
+        update(StudentPackage)
+        .where(
+            StudentPackage.id == target_id,
+            StudentPackage.status == PackageStatus.ACTIVE,
+            StudentPackage.remaining_lessons > 0,
+        )
+        .values(
+            remaining_lessons=StudentPackage.remaining_lessons - 1,
+            status=case(
+                (StudentPackage.remaining_lessons <= 1, package_status_literal(PackageStatus.USED_UP)),
+                else_=StudentPackage.status,
+            ),
+            updated_at=now,
+        )
+        .returning(StudentPackage.id)
+        .execution_options(synchronize_session="fetch")
+    )
+
+    # Kilit beklerken hedef paket bitmişse (LIMIT 1 boş döner) bir kez daha dene
+    for _ in range(2):
+        if db.session.execute(stmt).first():
+            return True
+
+    # Hak düşülemedi: süresi geçmiş / hakkı bitmiş ama hâlâ ACTIVE görünen paketleri işaretle
+    db.session.execute(
+        update(StudentPackage)
+        .where(
+            StudentPackage.student_id == student_id,
+            StudentPackage.status == PackageStatus.ACTIVE,
+            or_(StudentPackage.end_date < now, StudentPackage.remaining_lessons <= 0),
+        )
+        .values(
+            # iki dal da bind parametresi: CASE'in tipi text çıkar, enum kolona açık cast gerekir (PG)
+            status=cast(
+                case(
+                    (StudentPackage.end_date < now, package_status_literal(PackageStatus.EXPIRED)),
+                    else_=package_status_literal(PackageStatus.USED_UP),
+                ),
+                StudentPackage.__table__.c.status.type,
+            ),
+            updated_at=now,
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+    return False
 
 
-def consume_lesson_credit_or_409(student_id: int):
-    if consume_lesson_credit(student_id):
-        return None
-    return jsonify({"message": "no_active_package_or_no_remaining_lessons"}), 409
+def ensure_credit_consumed(s: LessonSession) -> bool:
+    """
+    Dersin hakkı düşülmüş mü? Düşülmemişse önce lesson_sessions.consumed koşullu UPDATE ile claim edilir,
+    sonra paketten düşülür. Aynı ders için eşzamanlı teacher_mark/student_mark/cancel yalnızca bir kez hak düşer.
+    True: hak bu istekte ya da daha önce düşülmüş. False: düşülecek aktif paket/hak yok.
+    """
+    claimed = db.session.execute(
+        update(LessonSession)
+        .where(LessonSession.id == s.id, LessonSession.consumed.is_(False))
+        .values(consumed=True)
+        .returning(LessonSession.id)
+        .execution_options(synchronize_session="fetch")
+    ).first()
+    if not claimed:
+        return True
+
+    if consume_lesson_credit(s.student_id):
+        return True
+
+    s.consumed = False
+    return False
+
+
+def lock_schedule(teacher_user_id: int, student_id: int):
+    """
+    Aynı öğretmen/öğrenci için eşzamanlı oluşturma/erteleme isteklerini sıraya sokar
+    (users + students satırlarında FOR UPDATE, commit'e kadar tutulur).
+    """
+    db.session.query(User.id).filter(User.id == teacher_user_id).with_for_update().all()
+    db.session.query(Student.id).filter(Student.id == student_id).with_for_update().all()
+
+
+def load_busy_intervals(teacher_user_id: int, student_id: int, window_start: datetime, window_end: datetime, exclude_id=None):
+    """
+    [window_start, window_end) ile çakışabilecek öğretmen/öğrenci dersleri, scheduled_start'a göre sıralı.
+    duration_min <= MAX_SESSION_DURATION_MIN (DB CHECK constraint) olduğu için alt sınır bounded:
+    (teacher_user_id, scheduled_start) ve (student_id, scheduled_start) index'lerinde range scan.
+    Dönen: [(start, end, id, teacher_user_id, student_id), ...]
+    """
+    lower = window_start - timedelta(minutes=MAX_SESSION_DURATION_MIN)
+    q = db.session.query(
+        LessonSession.id,
+        LessonSession.teacher_user_id,
+        LessonSession.student_id,
+        LessonSession.scheduled_start,
+        LessonSession.duration_min,
+    ).filter(
+        or_(LessonSession.teacher_user_id == teacher_user_id, LessonSession.student_id == student_id),
+        LessonSession.scheduled_start > lower,
+        LessonSession.scheduled_start < window_end,
+        LessonSession.status.in_(BLOCKING_STATUSES),
+    )
+    if exclude_id is not None:
+        q = q.filter(LessonSession.id != exclude_id)
+
+    rows = q.order_by(LessonSession.scheduled_start, LessonSession.id).all()
+    return [
+        (r.scheduled_start, r.scheduled_start + timedelta(minutes=r.duration_min), r.id, r.teacher_user_id, r.student_id)
+        for r in rows
+    ]
+
+
+def find_conflicts(busy, start: datetime, duration_min: int, teacher_user_id: int, student_id: int):
+    """
+    busy (sıralı) içinde [start, start + duration_min) ile çakışanlar. bisect ile O(log n) + çakışan sayısı.
+    """
+    end = start + timedelta(minutes=duration_min)
+    lower = start - timedelta(minutes=MAX_SESSION_DURATION_MIN)
+    out = []
+    i = bisect_right(busy, (lower,))
+    while i < len(busy) and busy[i][0] < end:
+        b_start, b_end, b_id, b_teacher, b_student = busy[i]
+        i += 1
+        if b_end <= start:
+            continue
+        if b_teacher != teacher_user_id and b_student != student_id:
+            continue
+        out.append({
+            "id": b_id,
+            "scheduled_start": b_start.isoformat(),
+            "end": b_end.isoformat(),
+            "teacher_conflict": b_teacher == teacher_user_id,
+            "student_conflict": b_student == student_id,
+        })
+    return out
+
+
+def check_schedule_conflict_or_409(teacher_user_id: int, student_id: int, start: datetime, duration_min: int, exclude_id=None):
+    end = start + timedelta(minutes=duration_min)
+    busy = load_busy_intervals(teacher_user_id, student_id, start, end, exclude_id=exclude_id)
+    conflicts = find_conflicts(busy, start, duration_min, teacher_user_id, student_id)
+    if conflicts:
+        return jsonify({"message": "schedule_conflict", "conflicts": conflicts}), 409
+    return None
 
 
 ALLOWED_TRANSITIONS = {
@@ -180,12 +362,7 @@ def list_lesson_sessions():
             return jsonify({"message": "forbidden_filter"}), 403
 
         if student_id:
-            ok = Enrollment.query.filter_by(
-                teacher_user_id=g.user_id,
-                student_id=student_id,
-                status=EnrollmentStatus.ACTIVE
-            ).first()
-            if not ok:
+            if not g.principal.teaches(student_id):
                 return jsonify({"message": "forbidden_student"}), 403
             q = q.filter(LessonSession.student_id == student_id)
 
@@ -217,8 +394,18 @@ def list_lesson_sessions():
         status_enum = parsed
         q = q.filter(LessonSession.status == status_enum)
 
-    sessions = q.order_by(LessonSession.scheduled_start.desc()).all()
-    return jsonify([s.to_dict() for s in sessions]), 200
+    fields = parse_fields(LessonSession)
+    if isinstance(fields, tuple):
+        return fields
+
+    return conditional(
+        q, LessonSession,
+        lambda: paginate(
+            apply_fields(q, LessonSession, fields, extra=["scheduled_start"]),
+            [LessonSession.scheduled_start, LessonSession.id],
+            lambda s: s.to_dict(fields),
+        ),
+    )
 
 
 @bp.get("/<int:session_id>")
@@ -260,8 +447,8 @@ def create_lesson_session():
     duration_min = parse_int(duration_min_raw, "duration_min", required=True)
     if isinstance(duration_min, tuple):
         return duration_min
-    if duration_min <= 0:
-        return jsonify({"message": "duration_min must be > 0"}), 400
+    if duration_min <= 0 or duration_min > MAX_SESSION_DURATION_MIN:
+        return jsonify({"message": f"duration_min must be between 1 and {MAX_SESSION_DURATION_MIN}"}), 400
 
     if mode_raw:
         parsed = parse_enum(SessionMode, mode_raw, "mode")
@@ -304,12 +491,7 @@ def create_lesson_session():
         if isinstance(student_id_parsed, tuple):
             return student_id_parsed
 
-        ok = Enrollment.query.filter_by(
-            teacher_user_id=g.user_id,
-            student_id=student_id_parsed,
-            status=EnrollmentStatus.ACTIVE
-        ).first()
-        if not ok:
+        if not g.principal.teaches(student_id_parsed):
             return jsonify({"message": "forbidden_student"}), 403
 
         # package check: remaining lessons must be > 0
@@ -322,6 +504,15 @@ def create_lesson_session():
 
         status_enum = SessionStatus.PLANNED
 
+    if status_enum in BLOCKING_STATUSES:
+        lock_schedule(teacher_user_id_parsed, student_id_parsed)
+        conflict_err = check_schedule_conflict_or_409(
+            teacher_user_id_parsed, student_id_parsed, scheduled_start, duration_min
+        )
+        if conflict_err:
+            db.session.rollback()
+            return conflict_err
+
     s = LessonSession(
         student_id=student_id_parsed,
         teacher_user_id=teacher_user_id_parsed,
@@ -345,6 +536,194 @@ def create_lesson_session():
     return jsonify(s.to_dict()), 201
 
 
+@bp.post("/bulk")
+@require_auth
+def bulk_create_lesson_sessions():
+    """
+    Toplu / tekrarlı ders oluşturma (TEACHER, ADMIN).
+    Body:
+      student_id, (ADMIN ise) teacher_user_id, duration_min, mode, topic
+      + recurrence: {dtstart, byday: ["MO","WE"], until | count, interval} veya {dtstart, rrule: "FREQ=WEEKLY;BYDAY=MO;COUNT=8"}
+      + veya occurrences: ["2026-02-02T15:00:00", {"scheduled_start": ..., "duration_min": ..., "topic": ...}]
+    Enrollment ve paket kontrolü bir kez yapılır; geçerli tüm dersler tek INSERT + tek commit ile yazılır.
+    TEACHER: geçerli ders sayısı öğrencinin kalan toplam hakkını aşarsa hiçbiri oluşturulmaz (409 insufficient_credits).
+    Her occurrence için sonuç döner (created / rejected).
+    """
+    if g.role not in {"TEACHER", "ADMIN"}:
+        return jsonify({"message": "forbidden"}), 403
+
+    data = request.get_json(silent=True) or {}
+
+    duration_min = parse_int(data.get("duration_min"), "duration_min", required=True)
+    if isinstance(duration_min, tuple):
+        return duration_min
+    if duration_min <= 0 or duration_min > MAX_SESSION_DURATION_MIN:
+        return jsonify({"message": f"duration_min must be between 1 and {MAX_SESSION_DURATION_MIN}"}), 400
+
+    if data.get("mode"):
+        parsed = parse_enum(SessionMode, data.get("mode"), "mode")
+        if isinstance(parsed, tuple):
+            return parsed
+        mode_enum = parsed
+    else:
+        mode_enum = SessionMode.ONLINE
+
+    topic = data.get("topic")
+
+    student_id = parse_int(data.get("student_id"), "student_id", required=True)
+    if isinstance(student_id, tuple):
+        return student_id
+
+    if g.role == "ADMIN":
+        teacher_user_id = parse_int(data.get("teacher_user_id"), "teacher_user_id", required=True)
+        if isinstance(teacher_user_id, tuple):
+            return teacher_user_id
+    else:
+        teacher_user_id = g.user_id
+
+        if not g.principal.teaches(student_id):
+            return jsonify({"message": "forbidden_student"}), 403
+
+        # serinin tamamı için hak olmalı (aşağıda geçerli occurrence sayısıyla karşılaştırılır)
+        available_credits = remaining_credits(student_id)
+        if available_credits <= 0:
+            return jsonify({"message": "no_remaining_lessons"}), 409
+
+    # occurrence listesi: [(scheduled_start_raw, duration_min, topic), ...]
+    recurrence = data.get("recurrence")
+    explicit = data.get("occurrences")
+    if bool(recurrence) == bool(explicit):
+        return jsonify({"message": "recurrence veya occurrences (sadece biri) zorunlu"}), 400
+
+    candidates = []
+    if recurrence:
+        if not isinstance(recurrence, dict):
+            return jsonify({"message": "recurrence must be object"}), 400
+        dtstart = parse_iso_datetime(recurrence.get("dtstart"), "recurrence.dtstart", required=True)
+        if isinstance(dtstart, tuple):
+            return dtstart
+        try:
+            starts = expand_recurrence(recurrence, dtstart, limit=MAX_BULK_OCCURRENCES)
+        except RecurrenceError as ex:
+            return jsonify({"message": "invalid recurrence", "error": str(ex)}), 400
+        candidates = [(dt.isoformat(), duration_min, topic) for dt in starts]
+    else:
+        if not isinstance(explicit, list):
+            return jsonify({"message": "occurrences must be list"}), 400
+        if len(explicit) > MAX_BULK_OCCURRENCES:
+            return jsonify({"message": f"too many occurrences (max {MAX_BULK_OCCURRENCES})"}), 400
+        for item in explicit:
+            if isinstance(item, dict):
+                candidates.append((
+                    item.get("scheduled_start"),
+                    item.get("duration_min", duration_min),
+                    item.get("topic", topic),
+                ))
+            else:
+                candidates.append((item, duration_min, topic))
+
+    # çakışma kontrolü: tüm aralık için tek sorgu, her occurrence için bisect
+    valid_starts = []
+    for start_raw, _, _ in candidates:
+        parsed = parse_iso_datetime(start_raw, "scheduled_start", required=True)
+        if not isinstance(parsed, tuple):
+            valid_starts.append(parsed)
+    busy = []
+    if valid_starts:
+        lock_schedule(teacher_user_id, student_id)
+        busy = load_busy_intervals(
+            teacher_user_id,
+            student_id,
+            min(valid_starts),
+            max(valid_starts) + timedelta(minutes=MAX_SESSION_DURATION_MIN),
+        )
+
+    results = []
+    rows = []
+    row_result_idx = []
+    seen = set()
+    for idx, (start_raw, dur_raw, occ_topic) in enumerate(candidates):
+        result = {"index": idx, "scheduled_start": start_raw}
+        results.append(result)
+
+        start = parse_iso_datetime(start_raw, "scheduled_start", required=True)
+        if isinstance(start, tuple):
+            result.update({"status": "rejected", "message": "invalid scheduled_start"})
+            continue
+        dur = parse_int(dur_raw, "duration_min", required=True)
+        if isinstance(dur, tuple) or dur <= 0 or dur > MAX_SESSION_DURATION_MIN:
+            result.update({"status": "rejected", "message": "invalid duration_min"})
+            continue
+        if start in seen:
+            result.update({"status": "rejected", "message": "duplicate_occurrence"})
+            continue
+        seen.add(start)
+
+        result["scheduled_start"] = start.isoformat()
+        conflicts = find_conflicts(busy, start, dur, teacher_user_id, student_id)
+        if conflicts:
+            result.update({"status": "rejected", "message": "schedule_conflict", "conflicts": conflicts})
+            continue
+        # aynı istekteki diğer occurrence'larla da çakışmasın (id yerine -(index+1))
+        insort(busy, (start, start + timedelta(minutes=dur), -(idx + 1), teacher_user_id, student_id))
+
+        rows.append({
+            "student_id": student_id,
+            "teacher_user_id": teacher_user_id,
+            "created_by_user_id": g.user_id,
+            "scheduled_start": start,
+            "duration_min": dur,
+            "mode": mode_enum,
+            "topic": occ_topic,
+            "status": SessionStatus.PLANNED,
+            "consumed": False,
+        })
+        row_result_idx.append(idx)
+
+    if not rows:
+        db.session.rollback()
+        return jsonify({"message": "no valid occurrences", "created": 0, "results": results}), 400
+
+    if g.role == "TEACHER" and len(rows) > available_credits:
+        db.session.rollback()
+        return jsonify({
+            "message": "insufficient_credits",
+            "remaining_lessons": available_credits,
+            "requested": len(rows),
+            "results": results,
+        }), 409
+
+    try:
+        # tek multi-row INSERT ... RETURNING, tek commit
+        created = db.session.scalars(
+            insert(LessonSession).returning(LessonSession, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        # ORM bulk insert flush'tan geçmez: arama index'i ve aylık özet aynı transaction'da
+        reindex(LessonSession, [s.id for s in created], db.session.connection())
+        deltas = {}
+        for s in created:
+            add_session_delta(deltas, s.scheduled_start, s.status, s.duration_min, +1)
+        apply_session_deltas(db.session.connection(), deltas)
+        db.session.commit()
+    except IntegrityError as ex:
+        db.session.rollback()
+        return jsonify({"message": "DB integrity error", "error": str(ex)}), 400
+    except Exception as ex:
+        db.session.rollback()
+        return jsonify({"message": "DB error", "error": str(ex)}), 400
+
+    for idx, s in zip(row_result_idx, created):
+        results[idx].update({"status": "created", "id": s.id})
+
+    return jsonify({
+        "created": len(created),
+        "rejected": len(results) - len(created),
+        "results": results,
+        "items": [s.to_dict() for s in created],
+    }), 201
+
+
 @bp.patch("/<int:session_id>")
 @require_auth
 def update_lesson_session(session_id: int):
@@ -402,8 +781,8 @@ def update_lesson_session(session_id: int):
         if isinstance(parsed, tuple):
             return parsed
         if parsed is not None:
-            if parsed <= 0:
-                return jsonify({"message": "duration_min must be > 0"}), 400
+            if parsed <= 0 or parsed > MAX_SESSION_DURATION_MIN:
+                return jsonify({"message": f"duration_min must be between 1 and {MAX_SESSION_DURATION_MIN}"}), 400
             s.duration_min = parsed
 
     if "mode" in data:
@@ -412,10 +791,19 @@ def update_lesson_session(session_id: int):
             return parsed
         s.mode = parsed
 
+    rescheduled = "scheduled_start" in data or "duration_min" in data
+    if rescheduled and s.status in BLOCKING_STATUSES:
+        lock_schedule(s.teacher_user_id, s.student_id)
+        conflict_err = check_schedule_conflict_or_409(
+            s.teacher_user_id, s.student_id, s.scheduled_start, s.duration_min, exclude_id=s.id
+        )
+        if conflict_err:
+            db.session.rollback()
+            return conflict_err
+
     try:
-        if s.status == SessionStatus.COMPLETED and not s.consumed:
-            if consume_lesson_credit(s.student_id):
-                s.consumed = True
+        if s.status == SessionStatus.COMPLETED:
+            ensure_credit_consumed(s)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
@@ -485,9 +873,8 @@ def teacher_mark(session_id: int):
     s.status = recalc_status(s)
 
     try:
-        if s.status == SessionStatus.COMPLETED and not s.consumed:
-            if consume_lesson_credit(s.student_id):
-                s.consumed = True
+        if s.status == SessionStatus.COMPLETED:
+            ensure_credit_consumed(s)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
@@ -544,9 +931,8 @@ def student_mark(session_id: int):
     s.status = recalc_status(s)
 
     try:
-        if s.status == SessionStatus.COMPLETED and not s.consumed:
-            if consume_lesson_credit(s.student_id):
-                s.consumed = True
+        if s.status == SessionStatus.COMPLETED:
+            ensure_credit_consumed(s)
         db.session.commit()
     except Exception as ex:
         db.session.rollback()
@@ -595,11 +981,9 @@ def cancel_lesson_session(session_id: int):
         two_hours = timedelta(hours=2)
         if s.scheduled_start - now <= two_hours:
             # ders hakkı düşer
-            if not s.consumed:
-                err = consume_lesson_credit_or_409(s.student_id)
-                if err:
-                    return err
-                s.consumed = True
+            if not ensure_credit_consumed(s):
+                db.session.rollback()
+                return jsonify({"message": "no_active_package_or_no_remaining_lessons"}), 409
 
         s.status = SessionStatus.CANCELLED
         s.cancelled_by_role = "STUDENT"
@@ -0,0 +1,329 @@
+# Giriş yapan kullanıcının sayfa açılışı için tek istekte toplu veri ("bootstrap").
+# GET /api/me/dashboard (STUDENT): profil, öğretmen, aktif paket + kalan ders hakkı, yaklaşan / son dersler,
+#   açık ödevler, son raporlar, ders sayıları. Kimlik principal'dan (require_auth), sorgu sayısı sabit (7).
+# GET /api/me/teacher-workspace (TEACHER): aktif öğrenciler + kalan ders hakları + ödev sayıları, haftanın dersleri,
+#   öğretmenin işaretlemesi gereken dersler (needs_mark) ve öğrenci onayı bekleyenler (awaiting_student).
+#   Öğrenci sayısından bağımsız 4 sorgu (öğrenci başına paket isteği yok).
+# Tam listeler (sekme içerikleri) yine kendi endpoint'lerinden sayfalı alınır.
+
+from datetime import datetime, timedelta
+
+from flask import Blueprint, g, jsonify, request
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import aliased
+
+from app.auth.require_auth import require_auth
+from app.database import db
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.homework import Homework, HomeworkStatus
+from app.models.lesson_report import LessonReport
+from app.models.lesson_session import LessonSession, SessionStatus
+from app.models.package import Package, PackageStatus, StudentPackage
+from app.models.student import Student
+from app.models.user import User
+
+bp = Blueprint("me", __name__)
+
+DEFAULT_SECTION_LIMIT = 5
+MAX_SECTION_LIMIT = 20
+
+UPCOMING_STATUSES = (SessionStatus.PLANNED, SessionStatus.PENDING_CONFIRMATION)
+MAX_NEEDS_MARK = 50
+
+Teacher = aliased(User)
+
+
+def parse_section_limit():
+    """?limit= her liste bölümü için satır sayısı (1..MAX_SECTION_LIMIT) ya da (jsonify, 400)."""
+    raw = request.args.get("limit")
+    if raw in (None, ""):
+        return DEFAULT_SECTION_LIMIT
+    try:
+        limit = int(raw)
+    except Exception:
+        return jsonify({"message": "limit must be integer"}), 400
+    if limit <= 0:
+        return jsonify({"message": "limit must be > 0"}), 400
+    return min(limit, MAX_SECTION_LIMIT)
+
+
+def student_profile_with_teacher(student_id: int):
+    """students + kendi users satırı + enrollment + öğretmen: tek sorgu."""
+    row = (
+        db.session.query(
+            Student, User.email, User.phones,
+            Enrollment.status, Teacher.id, Teacher.full_name, Teacher.email,
+        )
+        .join(User, User.id == Student.user_id)
+        .outerjoin(Enrollment, Enrollment.student_id == Student.id)
+        .outerjoin(Teacher, Teacher.id == Enrollment.teacher_user_id)
+        .filter(Student.id == student_id)
+        .first()
+    )
+    if row is None:
+        return None, None
+
+    student, email, phones, enrollment_status, teacher_id, teacher_name, teacher_email = row
+    profile = student.to_dict()
+    profile["email"] = email
+    profile["phones"] = phones
+
+    teacher = None
+    if teacher_id is not None:
+        teacher = {
+            "id": teacher_id,
+            "full_name": teacher_name,
+            "email": teacher_email,
+            "enrollment_status": enrollment_status.value,
+        }
+    return profile, teacher
+
+
+def valid_package_filter(now: datetime):
+    # consume_lesson_credit'in ders düşebileceği paketler
+    return (
+        StudentPackage.status == PackageStatus.ACTIVE,
+        StudentPackage.remaining_lessons > 0,
+        or_(StudentPackage.end_date.is_(None), StudentPackage.end_date >= now),
+    )
+
+
+def package_summary(student_id: int, now: datetime):
+    """
+    Aktif paket = ders düşülecek paket (consume_lesson_credit ile aynı seçim: en yeni, süresi geçmemiş, hakkı olan).
+    credits = geçerli tüm ACTIVE paketlerdeki toplam kalan ders.
+    """
+    rows = (
+        db.session.query(StudentPackage, Package.name, Package.lesson_count)
+        .join(Package, Package.id == StudentPackage.package_id)
+        .filter(
+            StudentPackage.student_id == student_id,
+            *valid_package_filter(now),
+        )
+        .order_by(StudentPackage.id.desc())
+        .all()
+    )
+    active = None
+    if rows:
+        sp, name, lesson_count = rows[0]
+        active = sp.to_dict()
+        active["package_name"] = name
+        active["lesson_count"] = lesson_count
+    return active, sum(sp.remaining_lessons for sp, _, _ in rows)
+
+
+def session_counts(student_id: int):
+    rows = (
+        db.session.query(LessonSession.status, func.count(LessonSession.id))
+        .filter(LessonSession.student_id == student_id)
+        .group_by(LessonSession.status)
+        .all()
+    )
+    counts = {s.value: 0 for s in SessionStatus}
+    for status, n in rows:
+        counts[status.value] = n
+    counts["total"] = sum(n for _, n in rows)
+    return counts
+
+
+@bp.get("/dashboard")
+@require_auth
+def student_dashboard():
+    if g.role != "STUDENT":
+        return jsonify({"message": "forbidden"}), 403
+
+    me = g.principal.student
+    if not me or me.deleted_at is not None:
+        return jsonify({"message": "student_profile_not_found"}), 404
+
+    limit = parse_section_limit()
+    if isinstance(limit, tuple):
+        return limit
+
+    now = datetime.utcnow()
+    profile, teacher = student_profile_with_teacher(me.id)
+    if profile is None:
+        return jsonify({"message": "student_profile_not_found"}), 404
+
+    active_package, credits = package_summary(me.id, now)
+
+    upcoming = (
+        LessonSession.query
+        .filter(
+            LessonSession.student_id == me.id,
+            LessonSession.scheduled_start >= now,
+            LessonSession.status.in_(UPCOMING_STATUSES),
+        )
+        .order_by(LessonSession.scheduled_start.asc(), LessonSession.id.asc())
+        .limit(limit)
+        .all()
+    )
+    recent = (
+        LessonSession.query
+        .filter(LessonSession.student_id == me.id, LessonSession.scheduled_start < now)
+        .order_by(LessonSession.scheduled_start.desc(), LessonSession.id.desc())
+        .limit(limit)
+        .all()
+    )
+    open_homeworks = (
+        Homework.query
+        .filter(Homework.student_id == me.id, Homework.status == HomeworkStatus.ASSIGNED)
+        # teslim tarihi yakın olan önce, tarihsizler sonda
+        .order_by(Homework.due_date.is_(None), Homework.due_date.asc(), Homework.id.desc())
+        .limit(limit)
+        .all()
+    )
+    reports = (
+        LessonReport.query
+        .filter(LessonReport.student_id == me.id)
+        .order_by(LessonReport.created_at.desc(), LessonReport.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+    return jsonify({
+        "student": profile,
+        "teacher": teacher,
+        "active_package": active_package,
+        "remaining_credits": credits,
+        "session_counts": session_counts(me.id),
+        "upcoming_sessions": [s.to_dict() for s in upcoming],
+        "recent_sessions": [s.to_dict() for s in recent],
+        "open_homeworks": [h.to_dict() for h in open_homeworks],
+        "latest_reports": [r.to_dict() for r in reports],
+        "generated_at": now,
+    }), 200
+
+
+def parse_week_start(now: datetime):
+    """?week_start=YYYY-MM-DD (o günü içeren haftanın pazartesisi) — verilmezse bu hafta."""
+    raw = request.args.get("week_start")
+    if raw:
+        try:
+            day = datetime.fromisoformat(raw)
+        except Exception:
+            return jsonify({"message": "week_start must be ISO date"}), 400
+    else:
+        day = now
+    day = day.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    return day - timedelta(days=day.weekday())
+
+
+def teacher_students(teacher_user_id: int, now: datetime):
+    """Aktif öğrenciler + kalan ders hakkı + ödev sayıları: gruplanmış alt sorgularla tek SELECT."""
+    credits = (
+        db.session.query(
+            StudentPackage.student_id.label("student_id"),
+            func.sum(StudentPackage.remaining_lessons).label("remaining"),
+        )
+        .filter(*valid_package_filter(now))
+        .group_by(StudentPackage.student_id)
+        .subquery()
+    )
+    homeworks = (
+        db.session.query(
+            Homework.student_id.label("student_id"),
+            func.sum(case((Homework.status == HomeworkStatus.ASSIGNED, 1), else_=0)).label("assigned"),
+            func.sum(case((Homework.status == HomeworkStatus.SUBMITTED, 1), else_=0)).label("ungraded"),
+        )
+        .filter(Homework.teacher_user_id == teacher_user_id)
+        .group_by(Homework.student_id)
+        .subquery()
+    )
+    rows = (
+        db.session.query(
+            Student.id, Student.user_id, Student.full_name, Student.grade, Student.level, Student.target_exam,
+            credits.c.remaining, homeworks.c.assigned, homeworks.c.ungraded,
+        )
+        .join(Enrollment, Enrollment.student_id == Student.id)
+        .outerjoin(credits, credits.c.student_id == Student.id)
+        .outerjoin(homeworks, homeworks.c.student_id == Student.id)
+        .filter(
+            Enrollment.teacher_user_id == teacher_user_id,
+            Enrollment.status == EnrollmentStatus.ACTIVE,
+            Student.deleted_at.is_(None),
+        )
+        .order_by(Student.full_name, Student.id)
+        .all()
+    )
+    return [
+        {
+            "id": sid,
+            "user_id": user_id,
+            "full_name": full_name,
+            "grade": grade,
+            "level": level,
+            "target_exam": target_exam,
+            "remaining_credits": int(remaining or 0),
+            "assigned_homeworks": int(assigned or 0),
+            "ungraded_homeworks": int(ungraded or 0),
+        }
+        for sid, user_id, full_name, grade, level, target_exam, remaining, assigned, ungraded in rows
+    ]
+
+
+def teacher_sessions(teacher_user_id: int, *criteria, limit=None):
+    """Öğretmenin dersleri + öğrenci adı (JOIN), scheduled_start sırasıyla."""
+    q = (
+        db.session.query(LessonSession, Student.full_name)
+        .join(Student, Student.id == LessonSession.student_id)
+        .filter(LessonSession.teacher_user_id == teacher_user_id, *criteria)
+        .order_by(LessonSession.scheduled_start.asc(), LessonSession.id.asc())
+    )
+    if limit is not None:
+        q = q.limit(limit)
+    out = []
+    for s, student_name in q:
+        data = s.to_dict()
+        data["student_name"] = student_name
+        out.append(data)
+    return out
+
+
+@bp.get("/teacher-workspace")
+@require_auth
+def teacher_workspace():
+    if g.role != "TEACHER":
+        return jsonify({"message": "forbidden"}), 403
+
+    now = datetime.utcnow()
+    week_start = parse_week_start(now)
+    if isinstance(week_start, tuple):
+        return week_start
+    week_end = week_start + timedelta(days=7)
+
+    students = teacher_students(g.user_id, now)
+
+    week_sessions = teacher_sessions(
+        g.user_id,
+        LessonSession.scheduled_start >= week_start,
+        LessonSession.scheduled_start < week_end,
+    )
+
+    # öğretmenin yapacakları: saati geçmiş, henüz işaretlenmemiş PLANNED dersler
+    # (student-mark öğretmen işaretini şart koşar; öğretmen işaretlemeden ders PLANNED'dan çıkmaz)
+    needs_mark = teacher_sessions(
+        g.user_id,
+        LessonSession.teacher_marked_at.is_(None),
+        LessonSession.status == SessionStatus.PLANNED,
+        LessonSession.scheduled_start < now,
+        limit=MAX_NEEDS_MARK,
+    )
+
+    # öğretmen işaretledi, öğrenci onayı bekleniyor
+    awaiting_student = teacher_sessions(
+        g.user_id,
+        LessonSession.status == SessionStatus.PENDING_CONFIRMATION,
+        limit=MAX_NEEDS_MARK,
+    )
+
+    return jsonify({
+        "students": students,
+        "week_start": week_start,
+        "week_end": week_end,
+        "week_sessions": week_sessions,
+        "needs_mark": needs_mark,
+        "awaiting_student": awaiting_student,
+        "ungraded_homeworks_total": sum(s["ungraded_homeworks"] for s in students),
+        "generated_at": now,
+    }), 200
@@ -4,19 +4,30 @@ from app.database import db
 from app.models.package import Package, StudentPackage, PackageStatus
 from app.models.student import Student
 from app.auth.require_auth import require_auth
+from app.pagination import paginate
+from app.projection import parse_fields, apply_fields
+from app.etag import conditional
 
 bp = Blueprint("packages", __name__)
 
 
 def get_my_student_profile():
-    return Student.query.filter_by(user_id=g.user_id).first()
+    return g.principal.student
 
 
 @bp.get("/")
 @require_auth
 def list_packages():
-    items = Package.query.order_by(Package.id.desc()).all()
-    return jsonify([p.to_dict() for p in items]), 200
+    fields = parse_fields(Package)
+    if isinstance(fields, tuple):
+        return fields
+
+    def build():
+        q = apply_fields(Package.query, Package, fields)
+        items = q.order_by(Package.id.desc()).all()
+        return jsonify([p.to_dict(fields) for p in items]), 200
+
+    return conditional(Package.query, Package, build)
 
 
 @bp.post("/")
@@ -60,12 +71,16 @@ def create_package():
 @bp.get("/student-packages")
 @require_auth
 def list_student_packages():
+    fields = parse_fields(StudentPackage)
+    if isinstance(fields, tuple):
+        return fields
+
     if g.role == "STUDENT":
         me = get_my_student_profile()
         if not me:
             return jsonify({"message": "student_profile_not_found"}), 404
-        items = StudentPackage.query.filter_by(student_id=me.id).order_by(StudentPackage.id.desc()).all()
-        return jsonify([sp.to_dict() for sp in items]), 200
+        q = apply_fields(StudentPackage.query.filter_by(student_id=me.id), StudentPackage, fields)
+        return paginate(q, [StudentPackage.id], lambda sp: sp.to_dict(fields))
 
     if g.role == "ADMIN":
         student_id = request.args.get("student_id", type=int)
@@ -75,24 +90,18 @@ def list_student_packages():
             q = q.filter(StudentPackage.student_id == student_id)
         if not include_deleted:
             q = q.join(Student, StudentPackage.student_id == Student.id).filter(Student.deleted_at.is_(None))
-        items = q.order_by(StudentPackage.id.desc()).all()
-        return jsonify([sp.to_dict() for sp in items]), 200
+        q = apply_fields(q, StudentPackage, fields)
+        return paginate(q, [StudentPackage.id], lambda sp: sp.to_dict(fields))
 
     if g.role == "TEACHER":
         student_id = request.args.get("student_id", type=int)
         if not student_id:
             return jsonify({"message": "student_id required"}), 400
         # teacher sadece kendi öğrencisinin paketini görebilir
-        from app.models.enrollment import Enrollment, EnrollmentStatus
-        ok = Enrollment.query.filter_by(
-            teacher_user_id=g.user_id,
-            student_id=student_id,
-            status=EnrollmentStatus.ACTIVE,
-        ).first()
-        if not ok:
+        if not g.principal.teaches(student_id):
             return jsonify({"message": "forbidden_student"}), 403
-        items = StudentPackage.query.filter_by(student_id=student_id).order_by(StudentPackage.id.desc()).all()
-        return jsonify([sp.to_dict() for sp in items]), 200
+        q = apply_fields(StudentPackage.query.filter_by(student_id=student_id), StudentPackage, fields)
+        return paginate(q, [StudentPackage.id], lambda sp: sp.to_dict(fields))
 
     return jsonify({"message": "forbidden"}), 403
 
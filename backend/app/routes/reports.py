@@ -0,0 +1,113 @@
+# Raporlama endpoint'leri (sunucu tarafı aggregation).
+# teacher-earnings: COMPLETED dersleri öğretmen + dönem (ay/hafta) bazında tek GROUP BY ile sayar,
+# toplam dakika ve teacher_rate ile çarpılmış kazancı döner (para Decimal, diğer Numeric alanlar gibi string). SPA'nın tüm dersleri indirip saymasına gerek kalmaz.
+
+from datetime import datetime
+from flask import Blueprint, request, jsonify, g
+from sqlalchemy import func
+
+from app.database import db
+from app.models.lesson_session import LessonSession, SessionStatus
+from app.models.user import User
+from app.auth.require_auth import require_auth
+from app.routes.lesson_sessions import parse_iso_datetime
+from app.serialization import decimal_str
+
+bp = Blueprint("reports", __name__)
+
+ALLOWED_GROUP_BY = {"month", "week"}
+
+
+def month_bounds(now: datetime):
+    start = datetime(now.year, now.month, 1)
+    if now.month == 12:
+        end = datetime(now.year + 1, 1, 1)
+    else:
+        end = datetime(now.year, now.month + 1, 1)
+    return start, end
+
+
+@bp.get("/teacher-earnings")
+@require_auth
+def teacher_earnings():
+    """
+    GET /api/reports/teacher-earnings?from=&to=&group_by=month|week&teacher_user_id=
+    ADMIN: tüm öğretmenler (teacher_user_id filtresi opsiyonel)
+    TEACHER: sadece kendi kazancı
+    from/to verilmezse: bu ay. Aralık [from, to) şeklinde.
+    """
+    if g.role not in {"ADMIN", "TEACHER"}:
+        return jsonify({"message": "forbidden"}), 403
+
+    default_from, default_to = month_bounds(datetime.utcnow())
+
+    date_from = parse_iso_datetime(request.args.get("from"), "from", required=False)
+    if isinstance(date_from, tuple):
+        return date_from
+    date_to = parse_iso_datetime(request.args.get("to"), "to", required=False)
+    if isinstance(date_to, tuple):
+        return date_to
+
+    date_from = date_from or default_from
+    date_to = date_to or default_to
+    if date_from >= date_to:
+        return jsonify({"message": "from must be before to"}), 400
+
+    group_by = (request.args.get("group_by") or "month").strip().lower()
+    if group_by not in ALLOWED_GROUP_BY:
+        return jsonify({"message": "invalid group_by", "allowed": sorted(ALLOWED_GROUP_BY)}), 400
+
+    teacher_user_id = request.args.get("teacher_user_id", type=int)
+    if g.role == "TEACHER":
+        if teacher_user_id and teacher_user_id != g.user_id:
+            return jsonify({"message": "forbidden_filter"}), 403
+        teacher_user_id = g.user_id
+
+    period = func.date_trunc(group_by, LessonSession.scheduled_start).label("period")
+    lesson_count = func.count(LessonSession.id).label("lesson_count")
+    total_minutes = func.coalesce(func.sum(LessonSession.duration_min), 0).label("total_minutes")
+
+    q = (
+        db.session.query(
+            LessonSession.teacher_user_id,
+            User.full_name,
+            User.teacher_rate,
+            period,
+            lesson_count,
+            total_minutes,
+        )
+        .join(User, User.id == LessonSession.teacher_user_id)
+        .filter(
+            LessonSession.status == SessionStatus.COMPLETED,
+            LessonSession.scheduled_start >= date_from,
+            LessonSession.scheduled_start < date_to,
+        )
+    )
+    if teacher_user_id:
+        q = q.filter(LessonSession.teacher_user_id == teacher_user_id)
+
+    rows = (
+        q.group_by(LessonSession.teacher_user_id, User.full_name, User.teacher_rate, period)
+        .order_by(period, LessonSession.teacher_user_id)
+        .all()
+    )
+
+    items = []
+    for r in rows:
+        rate = r.teacher_rate  # Numeric -> Decimal; float'a çevrilmez (kuruş yuvarlama hatası olmasın)
+        items.append({
+            "teacher_user_id": r.teacher_user_id,
+            "full_name": r.full_name,
+            "period": r.period.isoformat() if hasattr(r.period, "isoformat") else r.period,
+            "lesson_count": int(r.lesson_count),
+            "total_minutes": int(r.total_minutes),
+            "teacher_rate": decimal_str(rate),
+            "total": decimal_str(rate * int(r.lesson_count)) if rate is not None else None,
+        })
+
+    return jsonify({
+        "from": date_from.isoformat(),
+        "to": date_to.isoformat(),
+        "group_by": group_by,
+        "items": items,
+    }), 200
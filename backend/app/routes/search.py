@@ -0,0 +1,135 @@
+# GET /api/search?q=türev&types=students,homeworks&limit=20
+# ADMIN: tüm kayıtlar, TEACHER: ACTIVE atandığı öğrenciler + kendi ödev / rapor / dersleri (liste endpoint'leri ile aynı kapsam).
+# Her tür için tek sorgu (GIN index, rank'e göre ilk `limit`), sonuçlar rank'e göre birleştirilir.
+# Öğrenci adı ayrıca pg_trgm similarity ile eşleşir ("ahmt yilmaz" -> "Ahmet Yılmaz").
+
+from flask import Blueprint, g, jsonify, request
+from sqlalchemy import bindparam, exists, func, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from app.auth.require_auth import require_auth
+from app.database import db
+from app.models.enrollment import Enrollment, EnrollmentStatus
+from app.models.homework import Homework
+from app.models.lesson_report import LessonReport
+from app.models.lesson_session import LessonSession
+from app.models.student import Student
+from app.search import is_supported, prefix_tsquery, ts_config, vector_column
+from app.serialization import http_datetime
+
+bp = Blueprint("search", __name__)
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+MIN_QUERY_LEN = 2
+HEADLINE_OPTIONS = "MaxFragments=1, MaxWords=15, MinWords=5, StartSel=<b>, StopSel=</b>"
+
+# tür -> (model, başlık kolonu, snippet kolonları, tarih kolonu)
+KINDS = {
+    "students": (Student, "full_name", ("weaknesses", "strengths", "target_exam"), "updated_at"),
+    "homeworks": (Homework, "title", ("description", "teacher_note", "student_note"), "created_at"),
+    "reports": (LessonReport, "topic", ("teacher_note", "next_note"), "created_at"),
+    "sessions": (LessonSession, "topic", ("teacher_mark_note", "student_note", "admin_note"), "scheduled_start"),
+}
+
+
+def parse_search_args():
+    text = (request.args.get("q") or "").strip()
+    if len(text) < MIN_QUERY_LEN:
+        return jsonify({"message": f"q must be at least {MIN_QUERY_LEN} characters"}), 400
+    tsquery_text = prefix_tsquery(text)
+    if tsquery_text is None:
+        return jsonify({"message": "q must contain letters or digits"}), 400
+
+    raw_types = request.args.get("types")
+    kinds = list(KINDS) if not raw_types else [t.strip() for t in raw_types.split(",") if t.strip()]
+    unknown = [t for t in kinds if t not in KINDS]
+    if unknown or not kinds:
+        return jsonify({"message": "invalid types", "unknown": unknown, "allowed": list(KINDS)}), 400
+
+    limit = request.args.get("limit", DEFAULT_LIMIT)
+    try:
+        limit = int(limit)
+    except Exception:
+        return jsonify({"message": "limit must be integer"}), 400
+    if limit <= 0:
+        return jsonify({"message": "limit must be > 0"}), 400
+
+    return {"text": text, "tsquery": tsquery_text, "kinds": kinds, "limit": min(limit, MAX_LIMIT)}
+
+
+def scope(q, model):
+    if g.role == "ADMIN":
+        return q.filter(Student.deleted_at.is_(None)) if model is Student else q
+    if model is Student:
+        return q.filter(
+            Student.deleted_at.is_(None),
+            exists().where(
+                Enrollment.student_id == Student.id,
+                Enrollment.teacher_user_id == g.user_id,
+                Enrollment.status == EnrollmentStatus.ACTIVE,
+            ),
+        )
+    return q.filter(model.teacher_user_id == g.user_id)
+
+
+def kind_query(kind, text, tsquery_text, limit):
+    model, title_name, snippet_names, date_name = KINDS[kind]
+    cfg = bindparam("ts_config", ts_config(), type_=REGCONFIG)
+    tsq = func.to_tsquery(cfg, tsquery_text)
+    vector = vector_column(model)
+
+    matched = vector.op("@@")(tsq)
+    rank = func.ts_rank(vector, tsq)
+    if model is Student:
+        # tsvector eşleşmesi ya da isimde trigram benzerliği (students.full_name gin_trgm_ops)
+        matched = or_(matched, Student.full_name.op("%")(text))
+        rank = func.greatest(rank, func.similarity(Student.full_name, text))
+
+    body = func.concat_ws(" ", *[getattr(model, n) for n in snippet_names])
+    snippet = func.ts_headline(cfg, body, tsq, HEADLINE_OPTIONS)
+
+    q = db.session.query(
+        model.id,
+        Student.id,
+        Student.full_name,
+        getattr(model, title_name),
+        snippet,
+        rank.label("rank"),
+        getattr(model, date_name),
+    )
+    if model is not Student:
+        q = q.join(Student, Student.id == model.student_id)
+    q = scope(q.filter(matched), model)
+    return q.order_by(rank.desc(), model.id.desc()).limit(limit)
+
+
+@bp.get("")
+@require_auth
+def search():
+    if g.role not in {"ADMIN", "TEACHER"}:
+        return jsonify({"message": "forbidden"}), 403
+    if not is_supported(db.session.connection()):
+        return jsonify({"message": "full-text search requires PostgreSQL"}), 501
+
+    args = parse_search_args()
+    if isinstance(args, tuple):
+        return args
+    text, limit = args["text"], args["limit"]
+
+    items = []
+    for kind in args["kinds"]:
+        for rid, student_id, student_name, title, snippet, rank, date in kind_query(kind, text, args["tsquery"], limit):
+            items.append({
+                "type": kind,
+                "id": rid,
+                "student_id": student_id,
+                "student_name": student_name,
+                "title": title,
+                "snippet": snippet or None,
+                "rank": round(float(rank or 0), 4),
+                "date": http_datetime(date),
+            })
+
+    items.sort(key=lambda it: it["rank"], reverse=True)
+    return jsonify({"q": text, "items": items[:limit]})
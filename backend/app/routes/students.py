@@ -1,58 +1,145 @@
 from flask import Blueprint, request, jsonify, g
+from sqlalchemy import exists, func, or_
+
 from app.database import db
 from app.models.student import Student
-from app.models.enrollment import Enrollment
 from app.models.user import User
+from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.auth.require_auth import require_auth
+from app.auth.principal import invalidate_principals
+from app.pagination import paginate
+from app.projection import parse_fields, apply_fields, column_fields
+from app.etag import conditional
 
 bp = Blueprint("students", __name__)
 
 
+def my_student_id():
+    # silinmemiş kendi profil id'si (principal'dan, sorgusuz)
+    me = g.principal.student
+    if not me or me.deleted_at is not None:
+        return None
+    return me.id
+
+
 def get_my_student_profile():
-    return Student.query.filter_by(user_id=g.user_id, deleted_at=None).first()
+    sid = my_student_id()
+    return Student.query.get(sid) if sid else None
+
+USER_FIELDS = ("email", "phones")
 
-def student_to_dict_with_user(student: Student):
-    data = student.to_dict()
+
+def student_to_dict_with_user(student: Student, fields=None):
+    data = student.to_dict(column_fields(Student, fields))
+    wanted = [f for f in USER_FIELDS if fields is None or f in fields]
+    if not wanted:
+        # user alanları istenmediyse ekstra sorgu yok
+        return data
     user = User.query.get(student.user_id)
-    data["email"] = user.email if user else None
-    data["phones"] = user.phones if user else None
+    for f in wanted:
+        data[f] = getattr(user, f) if user else None
     return data
 
 
+def like_pattern(text: str) -> str:
+    # kullanıcı girdisindeki % ve _ joker sayılmasın
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def students_query(user_fields):
+    """
+    students LEFT JOIN users tek sorgu: istenen user alanları (email/phones) satırla birlikte gelir.
+    Satırlar: user alanı istenmediyse Student, istendiyse (Student, email, phones...) Row.
+    """
+    cols = [getattr(User, f) for f in user_fields]
+    return db.session.query(Student, *cols).outerjoin(User, User.id == Student.user_id)
+
+
+def student_row_serializer(fields, user_fields):
+    student_fields = column_fields(Student, fields)
+    if not user_fields:
+        return lambda s: s.to_dict(student_fields)
+
+    def serialize(row):
+        data = row[0].to_dict(student_fields)
+        for f, v in zip(user_fields, row[1:]):
+            data[f] = v
+        return data
+    return serialize
+
+
+def apply_student_filters(q):
+    """?q= (ad / email içinde geçen, büyük-küçük harf duyarsız), ?grade= — hata varsa (jsonify, 400)."""
+    text = (request.args.get("q") or "").strip()
+    if text:
+        pattern = like_pattern(text)
+        q = q.filter(or_(Student.full_name.ilike(pattern, escape="\\"), User.email.ilike(pattern, escape="\\")))
+
+    grade_raw = request.args.get("grade")
+    if grade_raw not in (None, ""):
+        try:
+            grade = int(grade_raw)
+        except Exception:
+            return jsonify({"message": "grade must be integer"}), 400
+        q = q.filter(Student.grade == grade)
+    return q
+
+
 @bp.get("/")
 @require_auth
 def list_students():
     """
     ADMIN: tüm öğrenciler
-    TEACHER: sadece kendisine atanmış öğrenciler
+    TEACHER: sadece kendisine ACTIVE atanmış öğrenciler (PASSIVE atamalar listelenmez)
     STUDENT: sadece kendi profili (liste yerine 1 kayıt döner)
+    Filtre: ?q= (ad/email), ?grade=, ?include_deleted=1 (sadece ADMIN). Sonuç boyutundan bağımsız sabit sorgu sayısı.
     """
     include_deleted = request.args.get("include_deleted") == "1"
+    fields = parse_fields(Student, virtual=USER_FIELDS)
+    if isinstance(fields, tuple):
+        return fields
+    user_fields = [f for f in USER_FIELDS if fields is None or f in fields]
+
+    q = students_query(user_fields)
+
     if g.role == "ADMIN":
-        q = Student.query
         if not include_deleted:
             q = q.filter(Student.deleted_at.is_(None))
-        students = q.order_by(Student.id.desc()).all()
-        return jsonify([student_to_dict_with_user(s) for s in students]), 200
 
-    if g.role == "TEACHER":
-        # teacher'ın öğrencileri: enrollment üzerinden
-        student_ids = [
-            e.student_id
-            for e in Enrollment.query.filter_by(teacher_user_id=g.user_id).all()
-        ]
-        if not student_ids:
-            return jsonify([]), 200
-        students = Student.query.filter(Student.id.in_(student_ids)).filter(Student.deleted_at.is_(None)).order_by(Student.id.desc()).all()
-        return jsonify([student_to_dict_with_user(s) for s in students]), 200
+    elif g.role == "TEACHER":
+        # teacher'ın öğrencileri: ACTIVE enrollment üzerinden (principal'daki erişimle aynı), IN listesi yerine EXISTS
+        q = q.filter(Student.deleted_at.is_(None)).filter(
+            exists().where(
+                Enrollment.student_id == Student.id,
+                Enrollment.teacher_user_id == g.user_id,
+                Enrollment.status == EnrollmentStatus.ACTIVE,
+            )
+        )
 
-    if g.role == "STUDENT":
-        me = get_my_student_profile()
-        if not me:
+    elif g.role == "STUDENT":
+        me_id = my_student_id()
+        if not me_id:
             return jsonify({"message": "student_profile_not_found"}), 404
-        return jsonify([student_to_dict_with_user(me)]), 200  # liste endpoint'i ama tek kayıt
+        row = q.filter(Student.id == me_id).first()
+        if row is None:
+            return jsonify({"message": "student_profile_not_found"}), 404
+        return jsonify([student_row_serializer(fields, user_fields)(row)]), 200  # liste endpoint'i ama tek kayıt
 
-    return jsonify({"message": "forbidden"}), 403
+    else:
+        return jsonify({"message": "forbidden"}), 403
+
+    q = apply_student_filters(q)
+    if isinstance(q, tuple):
+        return q
+
+    serialize = student_row_serializer(fields, user_fields)
+    # email/phones users tablosundan geliyor -> ETag'e users.updated_at da girer
+    return conditional(
+        q, Student,
+        lambda: paginate(apply_fields(q, Student, fields, extra=["user_id"]), [Student.id], serialize),
+        extra=[func.max(User.updated_at)],
+    )
 
 
 @bp.post("/")
@@ -95,6 +182,7 @@ def create_student():
         db.session.rollback()
         return jsonify({"message": "DB error", "error": str(e)}), 400
 
+    invalidate_principals(user_id)
     return jsonify(student.to_dict()), 201
 
 
@@ -124,16 +212,16 @@ def get_student(student_id: int):
         return jsonify(student_to_dict_with_user(student)), 200
 
     if g.role == "TEACHER":
-        ok = Enrollment.query.filter_by(student_id=student_id, teacher_user_id=g.user_id).first()
-        if not ok:
+        # liste ile aynı kapsam: sadece ACTIVE atama
+        if not g.principal.teaches(student_id):
             return jsonify({"message": "forbidden"}), 403
         return jsonify(student_to_dict_with_user(student)), 200
 
     if g.role == "STUDENT":
-        me = get_my_student_profile()
-        if not me:
+        me_id = my_student_id()
+        if not me_id:
             return jsonify({"message": "student_profile_not_found"}), 404
-        if me.id != student_id:
+        if me_id != student_id:
             return jsonify({"message": "forbidden"}), 403
         return jsonify(student_to_dict_with_user(student)), 200
 
@@ -152,17 +240,16 @@ def update_student(student_id: int):
         pass
     # STUDENT sadece kendi profilini güncelleyebilir
     elif g.role == "STUDENT":
-        me = get_my_student_profile()
-        if not me:
+        me_id = my_student_id()
+        if not me_id:
             return jsonify({"message": "student_profile_not_found"}), 404
-        if me.id != student_id:
+        if me_id != student_id:
             return jsonify({"message": "forbidden"}), 403
     else:
-        # TEACHER sadece eğitim alanlarını güncelleyebilir
+        # TEACHER sadece ACTIVE atandığı öğrencinin eğitim alanlarını güncelleyebilir
         if g.role != "TEACHER":
             return jsonify({"message": "forbidden"}), 403
-        ok = Enrollment.query.filter_by(student_id=student_id, teacher_user_id=g.user_id).first()
-        if not ok:
+        if not g.principal.teaches(student_id):
             return jsonify({"message": "forbidden"}), 403
 
     data = request.get_json(silent=True) or {}
@@ -198,7 +285,10 @@ def update_student(student_id: int):
         other = Student.query.filter_by(user_id=new_user_id).first()
         if other and other.id != student.id:
             return jsonify({"message": "user_id already bound to another student"}), 409
+        rebound_user_ids = (student.user_id, new_user_id)
         student.user_id = new_user_id
+    else:
+        rebound_user_ids = ()
 
     try:
         db.session.commit()
@@ -206,4 +296,7 @@ def update_student(student_id: int):
         db.session.rollback()
         return jsonify({"message": "DB error", "error": str(e)}), 400
 
+    if rebound_user_ids:
+        invalidate_principals(*rebound_user_ids)
+
     return jsonify(student_to_dict_with_user(student)), 200
@@ -8,6 +8,8 @@ from app.models.role import Role
 from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.models.lesson_session import LessonSession
 from app.auth.require_auth import require_auth
+from app.auth.principal import invalidate_principals
+from app.pagination import paginate
 
 bp = Blueprint("users", __name__)
 
@@ -58,8 +60,7 @@ def list_users():
             return jsonify({"message": "invalid role", "role": role_key}), 400
         q = q.filter(User.role_id == role.id)
 
-    users = q.order_by(User.id.desc()).all()
-    return jsonify([user_to_dict(u) for u in users]), 200
+    return paginate(q, [User.id], user_to_dict)
 
 
 @bp.get("/<int:user_id>")
@@ -201,4 +202,7 @@ def delete_user(user_id: int):
         db.session.rollback()
         return jsonify({"message": "DB error", "error": str(ex)}), 400
 
+    # öğretmenin atamaları PASSIVE oldu -> öğrencilerinin principal'ı da değişti
+    invalidate_principals()
+
     return jsonify({"message": "user_deleted", "user_id": user_id}), 200
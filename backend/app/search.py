@@ -0,0 +1,147 @@
+# Tam metin arama altyapısı (sadece PostgreSQL; GET /api/search -> app/routes/search.py).
+# - students / homeworks / lesson_reports / lesson_sessions: search_vector (tsvector) kolonu + GIN index
+# - students.full_name: pg_trgm GIN index (yazım hatalı isim araması, similarity)
+# - search_vector modellerde deferred + internal kolon (SELECT / to_dict / ?fields= dışı); index'ler __table_args__'ta,
+#   böylece autogenerate onları silmeye çalışmaz ve create_all ile kurulan şemada da vardır.
+# - Güncelleme artımlı: ORM flush'ında aranan alanı değişen satırlar aynı transaction'da tek UPDATE ile yenilenir.
+#   ORM dışı toplu yazımlar reindex(model, ids) çağırır.
+# - Mevcut veri, SEARCH_TS_CONFIG veya DOCUMENTS değişikliği: flask search-rebuild
+# sqlite (yerel deneme) üzerinde index bakımı no-op'tur.
+
+import re
+
+from flask import current_app
+from sqlalchemy import Integer, Text, bindparam, column, event, func, literal_column, select, table, update
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.orm import Session, attributes
+
+from app.models.homework import Homework
+from app.models.lesson_report import LessonReport
+from app.models.lesson_session import LessonSession
+from app.models.student import Student
+
+# model -> ((kolon, ağırlık), ...)  A en önemli, D en az
+DOCUMENTS = {
+    Student: (("full_name", "A"), ("weaknesses", "B"), ("strengths", "B"), ("target_exam", "C"), ("level", "D")),
+    Homework: (("title", "A"), ("description", "B"), ("teacher_note", "C"), ("student_note", "C")),
+    LessonReport: (("topic", "A"), ("teacher_note", "B"), ("next_note", "B")),
+    LessonSession: (("topic", "A"), ("teacher_mark_note", "B"), ("student_note", "B"), ("admin_note", "C")),
+}
+
+MAX_TERMS = 8
+
+_tables = {}
+
+
+def ts_config():
+    return current_app.config.get("SEARCH_TS_CONFIG", "turkish")
+
+
+def is_supported(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def search_table(model):
+    """
+    UPDATE için hafif tablo: id + aranan kolonlar + search_vector.
+    Model tablosu kullanılmaz: updated_at onupdate'i tetiklenmesin (index bakımı kaydı "değiştirmez", ETag'ler oynamaz).
+    """
+    t = _tables.get(model)
+    if t is None:
+        cols = [column(name, Text) for name, _ in DOCUMENTS[model]]
+        t = _tables[model] = table(model.__tablename__, column("id", Integer), column("search_vector", TSVECTOR), *cols)
+    return t
+
+
+def vector_column(model):
+    """Sorgu tarafı: model tablosunun search_vector kolonu."""
+    return model.__table__.c.search_vector
+
+
+def document_vector(model, config):
+    """setweight(to_tsvector(cfg, coalesce(col, '')), 'A') || ... — tek ifade, UPDATE ve rebuild ortak."""
+    t = search_table(model)
+    cfg = bindparam("ts_config", config, type_=REGCONFIG)
+    vector = None
+    for name, weight in DOCUMENTS[model]:
+        # ağırlık "char" tipinde; sabit literal (varchar bind parametresi setweight ile eşleşmez)
+        part = func.setweight(func.to_tsvector(cfg, func.coalesce(t.c[name], "")), literal_column(f"'{weight}'"))
+        vector = part if vector is None else vector.op("||")(part)
+    return vector
+
+
+def prefix_tsquery(text: str):
+    """
+    Kullanıcı metni -> to_tsquery girdisi: kelimeler AND ile, her biri prefix ("türe" -> türev).
+    Operatör / tırnak karakterleri atılır; kelime yoksa None.
+    """
+    words = re.findall(r"[^\W_]+", text)[:MAX_TERMS]
+    if not words:
+        return None
+    return " & ".join(f"{w}:*" for w in words)
+
+
+def reindex(model, ids, connection):
+    ids = sorted({i for i in ids if i is not None})
+    if not ids or not is_supported(connection):
+        return 0
+    t = search_table(model)
+    stmt = (
+        update(t)
+        .where(t.c.id.in_(ids))
+        .values(search_vector=document_vector(model, ts_config()))
+    )
+    return connection.execute(stmt).rowcount
+
+
+def rebuild(session, model, batch_size: int = 1000):
+    """Tüm tabloyu id aralıkları halinde yeniden indeksler; her batch ayrı commit (uzun kilit yok)."""
+    if not is_supported(session.connection()):
+        raise RuntimeError("full-text search requires PostgreSQL")
+    t = search_table(model)
+    max_id = session.execute(select(func.max(t.c.id))).scalar() or 0
+    vector = document_vector(model, ts_config())
+
+    updated = 0
+    for start in range(0, max_id + 1, batch_size):
+        stmt = (
+            update(t)
+            .where(t.c.id >= start, t.c.id < start + batch_size)
+            .values(search_vector=vector)
+        )
+        updated += session.execute(stmt).rowcount
+        session.commit()
+    return updated
+
+
+def _changed_ids(session):
+    changed = {}
+    for obj in session.new:
+        if type(obj) in DOCUMENTS:
+            changed.setdefault(type(obj), set()).add(obj.id)
+    for obj in session.dirty:
+        model = type(obj)
+        if model not in DOCUMENTS:
+            continue
+        if any(attributes.get_history(obj, name).has_changes() for name, _ in DOCUMENTS[model]):
+            changed.setdefault(model, set()).add(obj.id)
+    return changed
+
+
+def _after_flush(session, flush_context):
+    # after_flush: new/dirty ve attribute history hâlâ flush öncesini gösterir, id'ler atanmıştır
+    changed = _changed_ids(session)
+    if not changed:
+        return
+    connection = session.connection()
+    if not is_supported(connection):
+        return
+    for model, ids in changed.items():
+        reindex(model, ids, connection)
+
+
+def init_search(app):
+    app.config.setdefault("SEARCH_TS_CONFIG", "turkish")
+    # Session sınıfına bağlanır (instrumentation'daki Engine event'leri gibi): tüm session'lar
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
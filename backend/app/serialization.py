@@ -0,0 +1,124 @@
+# Model -> dict serializer'ları.
+# Her model (ve istenen alan listesi) için kolon tipine göre bir "plan" bir kez hazırlanıp cache'lenir:
+#   Enum -> .value, Numeric (Decimal) -> str, DateTime -> HTTP date (Flask'ın varsayılan JSON formatı ile aynı)
+# Plan'dan tek bir dict literal döndüren fonksiyon derlenir; satır başına döngü / hasattr / tip kontrolü yapılmaz
+# ve JSON encoder'a sadece hazır str/int/bool gider.
+# Cache anahtarı ?fields= sırasından bağımsızdır (model kolon sırasına göre) ve cache'ler LRU ile sınırlıdır:
+# istemcinin gönderdiği farklı alan kombinasyonları worker belleğini sınırsız büyütemez.
+
+from decimal import Decimal
+from functools import lru_cache
+
+from sqlalchemy import DateTime, Enum, Numeric
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+MAX_CACHED_SERIALIZERS = 256
+
+
+def http_datetime(v):
+    """werkzeug.http.http_date ile aynı çıktı (naive datetime UTC kabul edilir), locale'den bağımsız."""
+    if v is None:
+        return None
+    return "%s, %02d %s %04d %02d:%02d:%02d GMT" % (
+        _WEEKDAYS[v.weekday()], v.day, _MONTHS[v.month - 1], v.year, v.hour, v.minute, v.second,
+    )
+
+
+def enum_value(v):
+    return getattr(v, "value", v)
+
+
+def decimal_str(v):
+    return str(v) if isinstance(v, Decimal) else v
+
+
+def converter_for(column):
+    t = column.type
+    if isinstance(t, Enum):
+        return enum_value
+    if isinstance(t, DateTime):
+        return http_datetime
+    if isinstance(t, Numeric):
+        return decimal_str
+    return None
+
+
+def canonical_fields(model, fields):
+    """fields -> model kolon sırasında tuple (None: tüm kolonlar); aynı alan kümesi tek cache anahtarı olur."""
+    if fields is None:
+        return None
+    wanted = set(fields)
+    return tuple(c.name for c in model.__table__.columns if c.name in wanted)
+
+
+@lru_cache(maxsize=MAX_CACHED_SERIALIZERS)
+def _plan(model, fields):
+    columns = {c.name: c for c in model.__table__.columns}
+    # internal kolonlar (search_vector) sadece açıkça istenirse
+    names = fields if fields is not None else [n for n, c in columns.items() if not c.info.get("internal")]
+    return tuple((name, converter_for(columns[name])) for name in names)
+
+
+def serializer_plan(model, fields=None):
+    """
+    [(kolon adı, converter | None), ...] — model + alan kümesi başına bir kez hesaplanır.
+    """
+    return _plan(model, canonical_fields(model, fields))
+
+
+def serialize_slow(obj, plan):
+    state = obj.__dict__
+    out = {}
+    for name, conv in plan:
+        # yüklü değer doğrudan instance dict'inden; expire/deferred ise normal attribute erişimi (lazy load)
+        v = state[name] if name in state else getattr(obj, name)
+        if conv is not None and v is not None:
+            v = conv(v)
+        out[name] = v
+    return out
+
+
+def compile_serializer(plan):
+    """
+    plan -> def f(obj): return {"id": d["id"], "status": _c3(d["status"]), ...}
+    Tüm kolonlar yüklüyse (normal query sonucu) tek dict literal; eksik/expired kolon varsa KeyError -> serialize_slow.
+    """
+    env = {"_slow": serialize_slow, "_plan": plan}
+    items = []
+    for i, (name, conv) in enumerate(plan):
+        if conv is None:
+            items.append(f"{name!r}: d[{name!r}]")
+        else:
+            env[f"_c{i}"] = conv
+            items.append(f"{name!r}: (None if (v := d[{name!r}]) is None else _c{i}(v))")
+    src = (
+        "def _serialize(obj):\n"
+        "    d = obj.__dict__\n"
+        "    try:\n"
+        "        return {" + ", ".join(items) + "}\n"
+        "    except KeyError:\n"
+        "        return _slow(obj, _plan)\n"
+    )
+    exec(compile(src, "<serializer>", "exec"), env)
+    return env["_serialize"]
+
+
+@lru_cache(maxsize=MAX_CACHED_SERIALIZERS)
+def _compiled(model, fields):
+    return compile_serializer(_plan(model, fields))
+
+
+@lru_cache(maxsize=MAX_CACHED_SERIALIZERS)
+def _compiled_for_request(model, fields):
+    # istemcinin sırasıyla gelen anahtar -> kanonik derlenmiş fonksiyon (satır başına sıralama yapılmasın diye)
+    return _compiled(model, canonical_fields(model, fields))
+
+
+def serializer_for(model, fields=None):
+    return _compiled_for_request(model, tuple(fields) if fields is not None else None)
+
+
+def serialize(obj, fields=None):
+    return serializer_for(type(obj), fields)(obj)
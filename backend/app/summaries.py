@@ -0,0 +1,192 @@
+# Özet tabloları (/api/admin/overview bunları okur, ders geçmişini taramaz).
+# session_monthly_stats: ay x statü başına ders sayısı / dakika.
+# - Artımlı: ORM flush'ında status / scheduled_start / duration_min değişen (ya da eklenen / silinen) derslerin
+#   eski ve yeni (ay, statü) değerlerinden fark hesaplanır ve tek upsert ile uygulanır
+#   (INSERT ... ON CONFLICT (month, status) DO UPDATE SET session_count = session_count + fark).
+#   Ay yeniden sayılmaz; sadece ilgili (ay, statü) satırları commit'e kadar kilitli kalır.
+# - ORM dışı yazımlar (bulk insert, sweeper) farkları kendileri apply_session_deltas(...) ile uygular.
+# - Tam yeniden hesap / kayma onarımı: flask summaries-rebuild (--interval ile periyodik). Postgres'te tablo
+#   kilidi (SHARE ROW EXCLUSIVE) ile yazanlarla sıralanır: yeniden sayım sırasında gelen farklar kaybolmaz.
+
+from datetime import datetime
+
+from sqlalchemy import delete, event, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, attributes
+
+from app.models.lesson_session import LessonSession
+from app.models.summary import SessionMonthlyStat
+
+SESSION_STAT_FIELDS = ("scheduled_start", "status", "duration_min")  # add_session_delta argüman sırası
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def next_month(month: datetime) -> datetime:
+    return datetime(month.year + 1, 1, 1) if month.month == 12 else datetime(month.year, month.month + 1, 1)
+
+
+def months_between(start: datetime, end: datetime):
+    """start ve end'i içeren tüm aylar (ayın ilk günü)."""
+    month, last = month_start(start), month_start(end)
+    out = []
+    while month <= last:
+        out.append(month)
+        month = next_month(month)
+    return out
+
+
+def refresh_session_months(connection, months, now=None):
+    """Verilen ayların session_monthly_stats satırlarını lesson_sessions'tan yeniden yazar (commit etmez)."""
+    months = sorted({month_start(m) for m in months if m is not None})
+    if not months:
+        return 0
+
+    now = now or datetime.utcnow()
+    stats = SessionMonthlyStat.__table__
+    if connection.dialect.name == "postgresql":
+        # fark upsert'leri (ROW EXCLUSIVE) commit'e kadar beklesin; sayım, yazanların commit'inden sonra başlar
+        connection.execute(text("LOCK TABLE session_monthly_stats IN SHARE ROW EXCLUSIVE MODE"))
+
+    for month in months:
+        rows = connection.execute(
+            select(
+                LessonSession.status,
+                func.count(LessonSession.id),
+                func.coalesce(func.sum(LessonSession.duration_min), 0),
+            )
+            .where(LessonSession.scheduled_start >= month, LessonSession.scheduled_start < next_month(month))
+            .group_by(LessonSession.status)
+        ).all()
+
+        connection.execute(delete(stats).where(stats.c.month == month))
+        if rows:
+            connection.execute(insert(stats), [
+                {
+                    "month": month,
+                    "status": getattr(status, "value", status),
+                    "session_count": count,
+                    "total_minutes": int(minutes or 0),
+                    "refreshed_at": now,
+                }
+                for status, count, minutes in rows
+            ])
+    return len(months)
+
+
+def add_session_delta(deltas, scheduled_start, status, duration_min, sign):
+    """deltas[(ay, statü)] += (sign ders, sign * dakika). Eksik değerli (ayı/statüsü olmayan) ders sayılmaz."""
+    if scheduled_start is None or status is None:
+        return
+    key = (month_start(scheduled_start), getattr(status, "value", status))
+    count, minutes = deltas.get(key, (0, 0))
+    deltas[key] = (count + sign, minutes + sign * int(duration_min or 0))
+
+
+def apply_session_deltas(connection, deltas, now=None):
+    """
+    {(ay, statü): (ders farkı, dakika farkı)} -> tek INSERT ... ON CONFLICT DO UPDATE (commit etmez).
+    Satırlar anahtar sırasıyla yazılır (eşzamanlı iki transaction aynı satırları ters sırada kilitlemesin).
+    """
+    rows = [
+        {"month": month, "status": status, "session_count": count, "total_minutes": minutes,
+         "refreshed_at": now or datetime.utcnow()}
+        for (month, status), (count, minutes) in sorted(deltas.items())
+        if count or minutes
+    ]
+    if not rows:
+        return 0
+
+    upsert = UPSERT_DIALECTS.get(connection.dialect.name)
+    if upsert is None:
+        # ON CONFLICT olmayan veritabanı: etkilenen ayları yeniden say
+        return refresh_session_months(connection, [row["month"] for row in rows], now=now)
+
+    stats = SessionMonthlyStat.__table__
+    stmt = upsert(stats)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[stats.c.month, stats.c.status],
+        set_={
+            "session_count": stats.c.session_count + stmt.excluded.session_count,
+            "total_minutes": stats.c.total_minutes + stmt.excluded.total_minutes,
+            "refreshed_at": stmt.excluded.refreshed_at,
+        },
+    )
+    connection.execute(stmt, rows)
+    return len(rows)
+
+
+def rebuild_session_stats(session, batch_months: int = 12):
+    """Tüm geçmiş: ilk dersin ayından son dersin ayına kadar, batch_months ayda bir commit."""
+    first, last = session.execute(
+        select(func.min(LessonSession.scheduled_start), func.max(LessonSession.scheduled_start))
+    ).one()
+    stats = SessionMonthlyStat.__table__
+    if first is None:
+        session.execute(delete(stats))
+        session.commit()
+        return 0
+
+    months = months_between(first, last)
+    # aralık dışında kalmış (dersleri silinmiş) aylar
+    session.execute(delete(stats).where((stats.c.month < months[0]) | (stats.c.month > months[-1])))
+    for i in range(0, len(months), batch_months):
+        refresh_session_months(session.connection(), months[i:i + batch_months])
+        session.commit()
+    return len(months)
+
+
+def _old_value(obj, name):
+    hist = attributes.get_history(obj, name)
+    if hist.deleted:
+        return hist.deleted[0]
+    return hist.unchanged[0] if hist.unchanged else None
+
+
+def _new_value(obj, name):
+    hist = attributes.get_history(obj, name)
+    if hist.added:
+        return hist.added[0]
+    return hist.unchanged[0] if hist.unchanged else None
+
+
+def _changed_deltas(session):
+    deltas = {}
+    for obj in session.new:
+        if isinstance(obj, LessonSession):
+            # INSERT yapıldı: varsayılanlar (status=PLANNED) instance'a yazılmış durumda
+            add_session_delta(deltas, obj.scheduled_start, obj.status, obj.duration_min, +1)
+    for obj in session.deleted:
+        if isinstance(obj, LessonSession):
+            add_session_delta(deltas, *(_old_value(obj, name) for name in SESSION_STAT_FIELDS), -1)
+    for obj in session.dirty:
+        if isinstance(obj, LessonSession) and any(
+            attributes.get_history(obj, name).has_changes() for name in SESSION_STAT_FIELDS
+        ):
+            add_session_delta(deltas, *(_old_value(obj, name) for name in SESSION_STAT_FIELDS), -1)
+            add_session_delta(deltas, *(_new_value(obj, name) for name in SESSION_STAT_FIELDS), +1)
+    return deltas
+
+
+def _after_flush(session, flush_context):
+    # after_flush: new/dirty/deleted ve attribute history hâlâ flush öncesini gösterir
+    deltas = _changed_deltas(session)
+    if deltas:
+        apply_session_deltas(session.connection(), deltas)
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+def init_summaries(app):
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+    # expire edilmiş attribute'a atama yapılsa da eski değer yüklensin (farkın eksi tarafı için)
+    for name in SESSION_STAT_FIELDS:
+        attr = getattr(LessonSession, name)
+        if not event.contains(attr, "set", _load_old_value):
+            event.listen(attr, "set", _load_old_value, active_history=True)
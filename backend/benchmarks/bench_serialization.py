@@ -0,0 +1,111 @@
+# LessonSession serialization benchmark: eski to_dict + Flask varsayılan JSON vs plan tabanlı serializer + FastJSONProvider.
+# Satırlar in-memory SQLite'a yazılıp query ile yüklenir (gerçek liste endpoint'indeki gibi tüm kolonlar yüklü),
+# sonra session'dan ayrılır (ölçüm sırasında lazy load / sorgu olmasın). Sadece serialization + JSON süresi ölçülür;
+# her ölçüm aynı app'te (db'ye kayıtlı) sadece app.json değiştirilerek yapılır. Çalıştırma (backend klasöründen):
+#   python -m benchmarks.bench_serialization --rows 5000 --repeat 5
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.database import db
+from app.json_provider import FastJSONProvider, orjson
+from app.models.lesson_session import LessonSession, SessionMode, SessionStatus
+from app.models.package import Package
+
+
+def legacy_to_dict(obj):
+    # Eski BaseModel.to_dict (referans); internal kolonlar (deferred search_vector) o zaman yoktu
+    out = {}
+    for c in obj.__table__.columns:
+        if c.info.get("internal"):
+            continue
+        v = getattr(obj, c.name)
+        if hasattr(v, "value"):
+            v = v.value
+        out[c.name] = v
+    return out
+
+
+def make_sessions(n: int):
+    base = datetime(2026, 1, 5, 10, 0)
+    rows = []
+    for i in range(n):
+        rows.append(dict(
+            id=i + 1,
+            student_id=(i % 50) + 1,
+            teacher_user_id=(i % 7) + 1,
+            created_by_user_id=(i % 7) + 1,
+            scheduled_start=base + timedelta(hours=i),
+            duration_min=60,
+            mode=SessionMode.ONLINE,
+            topic="Türev ve integral tekrar",
+            status=SessionStatus.COMPLETED if i % 3 == 0 else SessionStatus.PLANNED,
+            consumed=i % 3 == 0,
+            teacher_rating_to_student=4,
+            teacher_mark_note="Konu anlatımı tamamlandı, ödev verildi. " * 3,
+            teacher_marked_at=base + timedelta(hours=i, minutes=60),
+            student_note=None,
+            admin_note=None,
+            created_at=base,
+            updated_at=base,
+        ))
+    return rows
+
+
+def run(label, app, provider, rows, to_dict, repeat: int):
+    best = None
+    app.json = provider
+    for _ in range(repeat):
+        started = time.perf_counter()
+        resp = app.json.response([to_dict(r) for r in rows])
+        resp.get_data()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    rate = len(rows) / best
+    print(f"{label:<40} {best * 1000:9.1f} ms   {rate:12,.0f} rows/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db_app = Flask("bench")
+    db_app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    db.init_app(db_app)
+    ctx = db_app.app_context()
+    ctx.push()
+    # FK'lar sqlite'ta zorunlu değil; sadece lesson_sessions + packages tabloları yeter
+    db.metadata.create_all(db.engine, tables=[LessonSession.__table__, Package.__table__])
+    db.session.execute(LessonSession.__table__.insert(), make_sessions(args.rows))
+    db.session.commit()
+    rows = LessonSession.query.order_by(LessonSession.id).all()
+    db.session.expunge_all()  # ölçüm sırasında expire / lazy load olmasın (olursa DetachedInstanceError)
+
+    legacy_json = DefaultJSONProvider(db_app)
+    fast_json = FastJSONProvider(db_app)
+
+    print(f"LessonSession x {args.rows} (best of {args.repeat}), orjson={'yes' if orjson else 'no'}")
+    before = run("before: legacy to_dict + stdlib json", db_app, legacy_json, rows, legacy_to_dict, args.repeat)
+    run("compiled serializer + stdlib json", db_app, legacy_json, rows, lambda r: r.to_dict(), args.repeat)
+    after = run("after: compiled serializer + FastJSONProvider", db_app, fast_json, rows, lambda r: r.to_dict(),
+                args.repeat)
+    print(f"speedup: x{after / before:.2f}")
+
+    # çıktılar aynı mı? (Numeric alanı olan Package ile de kontrol)
+    sample = rows[:50] + [Package(id=1, name="P", lesson_count=8, price=Decimal("1500.00"), expires_in_days=60,
+                                  created_at=rows[0].created_at, updated_at=rows[0].updated_at)]
+    expected = legacy_json.loads(legacy_json.response([legacy_to_dict(r) for r in sample]).get_data())
+    got = fast_json.loads(fast_json.response([r.to_dict() for r in sample]).get_data())
+    print("output identical:", expected == got)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,3 +16,32 @@ class Config:
     JWT_ALG = os.getenv("JWT_ALG", "HS256")
     JWT_EXPIRE_MIN = int(os.getenv("JWT_EXPIRE_MIN", "43200"))  # 30 gün (dev)
 
+    # require_auth principal cache (saniye, 0 = kapalı). Worker'lar arası geçersizleme: auth_versions sayacı
+    AUTH_CACHE_TTL_SEC = float(os.getenv("AUTH_CACHE_TTL_SEC", "30"))
+
+    # İstek başına SQL sorgu bütçesi (0 = kapalı). Mode: off | warn | raise (raise sadece debug/testing'de 500 döner)
+    SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "30"))
+    SQL_QUERY_BUDGET_MODE = os.getenv("SQL_QUERY_BUDGET_MODE", "warn")
+
+    # /api/metrics için Bearer token (boş = endpoint kapalı, 403)
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+    # Public takvim (CALENDAR_ICS_URL): floating / tüm gün event'lerin dilimi (takvimde X-WR-TIMEZONE yoksa) ve cache
+    CALENDAR_TZ = os.getenv("CALENDAR_TZ", "Europe/Istanbul")
+    CALENDAR_CACHE_TTL_SEC = float(os.getenv("CALENDAR_CACHE_TTL_SEC", "300"))
+    CALENDAR_FETCH_TIMEOUT_SEC = float(os.getenv("CALENDAR_FETCH_TIMEOUT_SEC", "10"))
+    CALENDAR_RETRY_SEC = float(os.getenv("CALENDAR_RETRY_SEC", "30"))
+    CALENDAR_COLD_WAIT_SEC = float(os.getenv("CALENDAR_COLD_WAIT_SEC", "2"))
+
+    # Kişisel .ics feed penceresi (gün)
+    CALENDAR_FEED_PAST_DAYS = int(os.getenv("CALENDAR_FEED_PAST_DAYS", "30"))
+    CALENDAR_FEED_FUTURE_DAYS = int(os.getenv("CALENDAR_FEED_FUTURE_DAYS", "180"))
+
+    # Tam metin arama (/api/search): PostgreSQL text search config. Değişirse: flask search-rebuild
+    SEARCH_TS_CONFIG = os.getenv("SEARCH_TS_CONFIG", "turkish")
+
+    # Sweeper (flask sweep)
+    SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE", "500"))
+    SWEEP_OVERDUE_STATUS = os.getenv("SWEEP_OVERDUE_STATUS", "MISSED")  # MISSED | CANCELLED
+    SWEEP_OVERDUE_GRACE_HOURS = float(os.getenv("SWEEP_OVERDUE_GRACE_HOURS", "24"))
+
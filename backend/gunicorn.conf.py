@@ -0,0 +1,24 @@
+# gunicorn bu dosyayı çalışma klasöründen (/app/backend) otomatik yükler.
+# Prometheus multiprocess modu: her worker metriklerini PROMETHEUS_MULTIPROC_DIR'daki mmap dosyalarına yazar,
+# /api/metrics tüm worker'ların toplamını döner. Env, worker'lar app'i import etmeden önce (master'da) set edilmeli.
+
+import os
+import shutil
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/odak_prometheus")
+
+
+def on_starting(server):
+    # önceki çalıştırmadan kalan metrik dosyalarını temizle
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    # ölen worker'ın livesum gauge'larını (db_pool_connections_in_use) düş
+    multiprocess.mark_process_dead(worker.pid)
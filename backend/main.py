@@ -6,15 +6,25 @@ from flask_migrate import Migrate
 from config import Config
 from app.database import db
 from app.routes import register_routes
+from app.commands import register_commands
+from app.json_provider import FastJSONProvider
+from app.instrumentation import init_instrumentation
+from app.metrics import init_metrics
+from app.search import init_search
+from app.summaries import init_summaries
 
 STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
 
 app = Flask(__name__, static_folder=STATIC_DIR, static_url_path="/")
 app.config.from_object(Config)
 app.url_map.strict_slashes = False
+app.json = FastJSONProvider(app)
 
 CORS(app)
 
+# Prometheus metrikleri (/api/metrics) — pool ayarı yüzünden db.init_app'ten önce
+init_metrics(app)
+
 # DB init
 db.init_app(app)
 
@@ -27,6 +37,18 @@ from app import models  # noqa: F401
 # Routes (tüm blueprint’ler burada)
 register_routes(app)
 
+# İstek başına sorgu sayısı / DB süresi (Server-Timing + log)
+init_instrumentation(app)
+
+# Tam metin arama index bakımı (flush'ta search_vector güncellenir)
+init_search(app)
+
+# Admin özet tabloları (flush'ta etkilenen aylar yenilenir)
+init_summaries(app)
+
+# CLI komutları (flask sweep ...)
+register_commands(app)
+
 
 @app.get("/api/health")
 def health():
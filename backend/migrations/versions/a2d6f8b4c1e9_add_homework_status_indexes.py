@@ -0,0 +1,27 @@
+"""add homework status / due date indexes
+
+Revision ID: a2d6f8b4c1e9
+Revises: f4c9e1a7b2d8
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a2d6f8b4c1e9'
+down_revision = 'f4c9e1a7b2d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('homeworks', schema=None) as batch_op:
+        batch_op.create_index('ix_homeworks_student_status_due', ['student_id', 'status', 'due_date'], unique=False)
+        batch_op.create_index('ix_homeworks_teacher_status_created', ['teacher_user_id', 'status', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('homeworks', schema=None) as batch_op:
+        batch_op.drop_index('ix_homeworks_teacher_status_created')
+        batch_op.drop_index('ix_homeworks_student_status_due')
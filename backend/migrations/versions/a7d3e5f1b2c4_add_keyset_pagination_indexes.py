@@ -0,0 +1,37 @@
+"""add keyset pagination indexes
+
+Revision ID: a7d3e5f1b2c4
+Revises: 4e1a2b3c4d5e
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a7d3e5f1b2c4'
+down_revision = '4e1a2b3c4d5e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('lesson_sessions', schema=None) as batch_op:
+        batch_op.create_index('ix_lesson_sessions_scheduled_start_id', ['scheduled_start', 'id'], unique=False)
+
+    with op.batch_alter_table('homeworks', schema=None) as batch_op:
+        batch_op.create_index('ix_homeworks_created_at_id', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('lesson_reports', schema=None) as batch_op:
+        batch_op.create_index('ix_lesson_reports_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('lesson_reports', schema=None) as batch_op:
+        batch_op.drop_index('ix_lesson_reports_created_at_id')
+
+    with op.batch_alter_table('homeworks', schema=None) as batch_op:
+        batch_op.drop_index('ix_homeworks_created_at_id')
+
+    with op.batch_alter_table('lesson_sessions', schema=None) as batch_op:
+        batch_op.drop_index('ix_lesson_sessions_scheduled_start_id')
@@ -0,0 +1,25 @@
+"""add lesson_reports (student_id, created_at) index
+
+Revision ID: b5e1c3d9f7a2
+Revises: a2d6f8b4c1e9
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b5e1c3d9f7a2'
+down_revision = 'a2d6f8b4c1e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('lesson_reports', schema=None) as batch_op:
+        batch_op.create_index('ix_lesson_reports_student_created', ['student_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('lesson_reports', schema=None) as batch_op:
+        batch_op.drop_index('ix_lesson_reports_student_created')
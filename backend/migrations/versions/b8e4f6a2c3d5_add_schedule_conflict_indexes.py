@@ -0,0 +1,27 @@
+"""add schedule conflict indexes
+
+Revision ID: b8e4f6a2c3d5
+Revises: a7d3e5f1b2c4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b8e4f6a2c3d5'
+down_revision = 'a7d3e5f1b2c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('lesson_sessions', schema=None) as batch_op:
+        batch_op.create_index('ix_lesson_sessions_teacher_start', ['teacher_user_id', 'scheduled_start'], unique=False)
+        batch_op.create_index('ix_lesson_sessions_student_start', ['student_id', 'scheduled_start'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('lesson_sessions', schema=None) as batch_op:
+        batch_op.drop_index('ix_lesson_sessions_student_start')
+        batch_op.drop_index('ix_lesson_sessions_teacher_start')
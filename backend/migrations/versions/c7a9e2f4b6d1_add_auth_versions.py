@@ -0,0 +1,30 @@
+"""add auth_versions (cross-worker principal cache invalidation)
+
+Revision ID: c7a9e2f4b6d1
+Revises: b5e1c3d9f7a2
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c7a9e2f4b6d1'
+down_revision = 'b5e1c3d9f7a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'auth_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute("INSERT INTO auth_versions (id, version, updated_at) VALUES (1, 0, CURRENT_TIMESTAMP)")
+
+
+def downgrade():
+    op.drop_table('auth_versions')
@@ -0,0 +1,31 @@
+"""add sweeper indexes
+
+Revision ID: c9f5a7b3d4e6
+Revises: b8e4f6a2c3d5
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c9f5a7b3d4e6'
+down_revision = 'b8e4f6a2c3d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('lesson_sessions', schema=None) as batch_op:
+        batch_op.create_index('ix_lesson_sessions_status_start', ['status', 'scheduled_start'], unique=False)
+
+    with op.batch_alter_table('student_packages', schema=None) as batch_op:
+        batch_op.create_index('ix_student_packages_status_end_date', ['status', 'end_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('student_packages', schema=None) as batch_op:
+        batch_op.drop_index('ix_student_packages_status_end_date')
+
+    with op.batch_alter_table('lesson_sessions', schema=None) as batch_op:
+        batch_op.drop_index('ix_lesson_sessions_status_start')
@@ -0,0 +1,27 @@
+"""add calendar_feed_token to users
+
+Revision ID: d1a7c9e5f2b3
+Revises: c9f5a7b3d4e6
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd1a7c9e5f2b3'
+down_revision = 'c9f5a7b3d4e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('calendar_feed_token', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_users_calendar_feed_token'), ['calendar_feed_token'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_calendar_feed_token'))
+        batch_op.drop_column('calendar_feed_token')
@@ -0,0 +1,39 @@
+"""enforce lesson_sessions.duration_min upper bound (conflict check relies on it)
+
+Revision ID: d8b2f4a6c1e3
+Revises: c7a9e2f4b6d1
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd8b2f4a6c1e3'
+down_revision = 'c7a9e2f4b6d1'
+branch_labels = None
+depends_on = None
+
+MAX_DURATION_MIN = 600
+
+
+def upgrade():
+    # sınır dışı eski dersler varken constraint eklenemez; veriyi sessizce değiştirmek yerine dur ve listele
+    bad = op.get_bind().execute(sa.text(
+        "SELECT id, duration_min FROM lesson_sessions "
+        "WHERE duration_min < 1 OR duration_min > :max ORDER BY id LIMIT 20"
+    ), {"max": MAX_DURATION_MIN}).all()
+    if bad:
+        raise RuntimeError(
+            f"lesson_sessions.duration_min 1..{MAX_DURATION_MIN} dışında olan dersler var (ilk 20: "
+            f"{[tuple(row) for row in bad]}); bu dersleri düzeltip migration'ı tekrar çalıştırın"
+        )
+    op.create_check_constraint(
+        'ck_lesson_sessions_duration_min',
+        'lesson_sessions',
+        f'duration_min BETWEEN 1 AND {MAX_DURATION_MIN}',
+    )
+
+
+def downgrade():
+    op.drop_constraint('ck_lesson_sessions_duration_min', 'lesson_sessions', type_='check')
@@ -0,0 +1,43 @@
+"""add full-text search vectors and trigram index
+
+Revision ID: e3b8d2f6a1c7
+Revises: d1a7c9e5f2b3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = 'e3b8d2f6a1c7'
+down_revision = 'd1a7c9e5f2b3'
+branch_labels = None
+depends_on = None
+
+TABLES = ('students', 'homeworks', 'lesson_reports', 'lesson_sessions')
+
+
+def upgrade():
+    # Kolonlar boş eklenir; mevcut veri için: flask search-rebuild
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for name in TABLES:
+        with op.batch_alter_table(name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+            batch_op.create_index(f'ix_{name}_search_vector', ['search_vector'], unique=False,
+                                  postgresql_using='gin')
+
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.create_index('ix_students_full_name_trgm', ['full_name'], unique=False,
+                              postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'})
+
+
+def downgrade():
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.drop_index('ix_students_full_name_trgm')
+
+    for name in reversed(TABLES):
+        with op.batch_alter_table(name, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{name}_search_vector')
+            batch_op.drop_column('search_vector')
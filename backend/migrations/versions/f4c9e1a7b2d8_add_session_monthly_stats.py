@@ -0,0 +1,40 @@
+"""add session_monthly_stats summary table
+
+Revision ID: f4c9e1a7b2d8
+Revises: e3b8d2f6a1c7
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f4c9e1a7b2d8'
+down_revision = 'e3b8d2f6a1c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'session_monthly_stats',
+        sa.Column('month', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('session_count', sa.Integer(), nullable=False),
+        sa.Column('total_minutes', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('month', 'status'),
+    )
+
+    # mevcut dersler için ilk doldurma (sonrası artımlı; elle: flask summaries-rebuild)
+    op.execute("""
+        INSERT INTO session_monthly_stats (month, status, session_count, total_minutes, refreshed_at)
+        SELECT date_trunc('month', scheduled_start), status::text, count(*), coalesce(sum(duration_min), 0),
+               now() AT TIME ZONE 'utc'
+        FROM lesson_sessions
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade():
+    op.drop_table('session_monthly_stats')
@@ -0,0 +1,187 @@
+# CalendarCache testleri: yerel bir http.server (ICS upstream yerine) ile, veritabanı gerekmez.
+# - 200 -> 304: ETag / Last-Modified ile koşullu yenileme, 304'te parse tekrar edilmez
+# - yenileme sürerken (upstream yavaş) eski veri beklemeden döner
+# - aynı anda gelen soğuk istekler tek fetch'e indirgenir
+#   cd backend && python -m pytest tests/test_calendar_cache.py
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.calendar_cache import CalendarCache
+from app.ics import parse_calendar
+
+
+def ics(summary: str) -> str:
+    return (
+        "BEGIN:VCALENDAR\r\n"
+        "BEGIN:VEVENT\r\n"
+        "UID:lesson-1\r\n"
+        "DTSTART:20260105T090000Z\r\n"
+        "DTEND:20260105T100000Z\r\n"
+        f"SUMMARY:{summary}\r\n"
+        "END:VEVENT\r\n"
+        "END:VCALENDAR\r\n"
+    )
+
+
+class Upstream:
+    """ICS sunan yerel HTTP stand-in: istekleri sayar, gate kapalıyken cevabı bekletir."""
+
+    def __init__(self):
+        self.body = ics("Ders 1")
+        self.etag = '"v1"'
+        self.last_modified = "Mon, 05 Jan 2026 09:00:00 GMT"
+        self.use_etag = True
+        self.gate = threading.Event()
+        self.gate.set()
+        self.requests = []  # (If-None-Match, If-Modified-Since, status)
+        self._lock = threading.Lock()
+
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                upstream.gate.wait(10)
+                inm = self.headers.get("If-None-Match")
+                ims = self.headers.get("If-Modified-Since")
+                if upstream.use_etag:
+                    not_modified = inm == upstream.etag
+                else:
+                    not_modified = ims == upstream.last_modified
+                status = 304 if not_modified else 200
+                with upstream._lock:
+                    upstream.requests.append((inm, ims, status))
+
+                self.send_response(status)
+                if upstream.use_etag:
+                    self.send_header("ETag", upstream.etag)
+                self.send_header("Last-Modified", upstream.last_modified)
+                if status == 304:
+                    self.end_headers()
+                    return
+                body = upstream.body.encode("utf-8")
+                self.send_header("Content-Type", "text/calendar; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/calendar.ics"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def statuses(self):
+        with self._lock:
+            return [status for _, _, status in self.requests]
+
+    def close(self):
+        self.gate.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture()
+def upstream():
+    server = Upstream()
+    yield server
+    server.close()
+
+
+class CountingParse:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, stream):
+        self.calls += 1
+        return parse_calendar(stream)
+
+
+def summaries(snapshot):
+    return [ev.summary for ev in snapshot["data"].events]
+
+
+@pytest.mark.parametrize("use_etag", [True, False], ids=["etag", "last_modified"])
+def test_conditional_refresh_returns_304_without_reparsing(upstream, use_etag):
+    upstream.use_etag = use_etag
+    parse = CountingParse()
+    cache = CalendarCache(upstream.url, parse, ttl_sec=300)
+
+    cache.refresh()
+    first = cache.snapshot()
+    assert summaries(first) == ["Ders 1"]
+    assert first["error"] is None and first["stale"] is False
+
+    cache.refresh()
+    assert upstream.statuses() == [200, 304]
+    inm, ims, _ = upstream.requests[1]
+    if use_etag:
+        assert inm == '"v1"'
+    assert ims == upstream.last_modified
+    # 304: aynı parse sonucu, tekrar parse yok
+    assert parse.calls == 1
+    assert cache.snapshot()["data"] is first["data"]
+
+    # upstream değişti -> 200 ve yeni içerik
+    upstream.body, upstream.etag = ics("Ders 2"), '"v2"'
+    upstream.last_modified = "Tue, 06 Jan 2026 09:00:00 GMT"
+    cache.refresh()
+    assert upstream.statuses() == [200, 304, 200]
+    assert parse.calls == 2
+    assert summaries(cache.snapshot()) == ["Ders 2"]
+
+
+def test_serves_stale_data_while_refresh_is_in_flight(upstream):
+    cache = CalendarCache(upstream.url, CountingParse(), ttl_sec=300)
+    cache.refresh()
+
+    # TTL doldu, upstream yeni içeriği yavaş veriyor
+    upstream.body, upstream.etag = ics("Ders 2"), '"v2"'
+    upstream.gate.clear()
+    cache.next_refresh_at = 0.0
+
+    started = time.monotonic()
+    snapshot = cache.get()
+    assert time.monotonic() - started < 1.0
+    assert summaries(snapshot) == ["Ders 1"]
+
+    # yenileme sürerken gelen istekler de eski veriyi alır, ikinci fetch açılmaz
+    refreshing = cache._thread
+    assert refreshing is not None and refreshing.is_alive()
+    assert summaries(cache.get()) == ["Ders 1"]
+    assert cache._thread is refreshing
+
+    upstream.gate.set()
+    refreshing.join(5)
+    assert summaries(cache.get()) == ["Ders 2"]
+    assert upstream.statuses() == [200, 200]
+
+
+def test_concurrent_cold_misses_are_coalesced_into_one_fetch(upstream):
+    cache = CalendarCache(upstream.url, CountingParse(), ttl_sec=300, cold_wait_sec=5)
+    upstream.gate.clear()
+
+    clients = 10
+    barrier = threading.Barrier(clients)
+    results = [None] * clients
+
+    def worker(i):
+        barrier.wait(5)
+        results[i] = cache.get()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)  # hepsi soğuk cache'te beklesin
+    upstream.gate.set()
+    for t in threads:
+        t.join(10)
+
+    assert all(r is not None and summaries(r) == ["Ders 1"] for r in results)
+    assert upstream.statuses() == [200]
+    assert cache.fetch_count == 1